@@ -1,9 +1,156 @@
 from django.contrib import admin
-from .models import AwardConfig, SuggestedCategory, Category, SuggestedNominee, Nominee, Vote
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+from .models import (
+    AwardConfig,
+    Category,
+    FinalResult,
+    JuryToken,
+    Nominee,
+    QueuedVote,
+    RankedBallot,
+    ResultRun,
+    SuggestedCategory,
+    SuggestedNominee,
+    Vote,
+)
+from .voting import save_vote
+
+
+# =========================
+# Пагинация без COUNT(*) по большой таблице
+# =========================
+class EstimatedCountPaginator(Paginator):
+    """
+    Без фильтров число строк оценивается по диапазону id: MIN и MAX — два поиска
+    по первичному ключу, а не полный проход таблицы. Оценка не меньше настоящего числа:
+    удалённые строки внутри диапазона её завышают, и последние страницы списка могут
+    оказаться пустыми (пустая страница открывается без ошибки).
+    Пока диапазон не больше EXACT_COUNT_LIMIT, дешевле посчитать честно — число точное.
+    С фильтрами тоже считаем честно: выборка уже сужена индексом.
+    """
+
+    EXACT_COUNT_LIMIT = 10000
+
+    @cached_property
+    def count(self):
+        if self.object_list.query.where:
+            return super().count
+        # Два отдельных запроса: MIN и MAX в одном SELECT SQLite считает полным проходом
+        ids = self.object_list.model._default_manager.order_by('id').values_list('id', flat=True)
+        first, last = ids.first(), ids.last()
+        if first is None:
+            return 0
+        if last - first + 1 <= self.EXACT_COUNT_LIMIT:
+            return super().count
+        return last - first + 1
+
 
 admin.site.register(AwardConfig)
-admin.site.register(SuggestedCategory)
-admin.site.register(Category)
-admin.site.register(SuggestedNominee)
-admin.site.register(Nominee)
-admin.site.register(Vote)
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('name', 'is_main', 'voting_mode')
+    list_filter = ('is_main', 'voting_mode')
+    search_fields = ('name',)
+    ordering = ('id',)
+
+
+@admin.register(Nominee)
+class NomineeAdmin(admin.ModelAdmin):
+    list_display = ('name', 'category')
+    list_select_related = ('category',)
+    list_filter = ('category',)
+    search_fields = ('name',)
+    autocomplete_fields = ('category',)
+
+
+@admin.register(SuggestedCategory)
+class SuggestedCategoryAdmin(admin.ModelAdmin):
+    list_display = ('name', 'user', 'approved', 'created')
+    list_select_related = ('user',)
+    list_filter = ('approved',)
+    search_fields = ('name',)
+    raw_id_fields = ('user',)
+
+
+@admin.register(SuggestedNominee)
+class SuggestedNomineeAdmin(admin.ModelAdmin):
+    list_display = ('name', 'category', 'user', 'approved', 'created')
+    list_select_related = ('category', 'user')
+    list_filter = ('category', 'approved')
+    search_fields = ('name',)
+    autocomplete_fields = ('category',)
+    raw_id_fields = ('user',)
+
+
+@admin.register(Vote)
+class VoteAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'category', 'nominee', 'jury', 'created')
+    # Nominee.__str__ читает category.name — подтягиваем и её
+    list_select_related = ('user', 'category', 'nominee__category')
+    # Только по индексу category_id; фильтр по jury без своего индекса дал бы COUNT(*) по всей таблице
+    list_filter = ('category',)
+    # Точное совпадение логина: поиск по уникальному индексу auth_user, без LIKE по всей таблице
+    search_fields = ('=user__username',)
+    raw_id_fields = ('user', 'nominee')
+    # Категория голоса всегда равна категории номинанта (Vote.save) — в форме её не редактируем
+    readonly_fields = ('category',)
+    ordering = ('-id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def save_model(self, request, obj, form, change):
+        # Через voting: счётчики NomineeTally / CategoryTally меняются вместе с голосом
+        save_vote(obj)
+
+
+@admin.register(RankedBallot)
+class RankedBallotAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'category', 'ranking', 'jury', 'created')
+    list_select_related = ('user', 'category')
+    # Как у Vote: фильтр только по индексированной категории
+    list_filter = ('category',)
+    search_fields = ('=user__username',)
+    raw_id_fields = ('user',)
+    autocomplete_fields = ('category',)
+    ordering = ('-id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(QueuedVote)
+class QueuedVoteAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user_id', 'category_id', 'nominee_id', 'jury', 'created')
+    raw_id_fields = ('user', 'category', 'nominee')
+    ordering = ('id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(FinalResult)
+class FinalResultAdmin(admin.ModelAdmin):
+    list_display = ('nominee', 'category', 'jury_votes', 'user_votes', 'total_score', 'run')
+    list_select_related = ('category', 'nominee__category', 'run')
+    list_filter = ('category',)
+    raw_id_fields = ('nominee', 'run')
+    autocomplete_fields = ('category',)
+
+
+@admin.register(ResultRun)
+class ResultRunAdmin(admin.ModelAdmin):
+    list_display = ('number', 'created_at', 'created_by', 'jury_weight', 'user_weight', 'normalization')
+    list_select_related = ('created_by',)
+    raw_id_fields = ('created_by',)
+    readonly_fields = ('snapshot',)
+
+
+@admin.register(JuryToken)
+class JuryTokenAdmin(admin.ModelAdmin):
+    list_display = ('token', 'used', 'user', 'created', 'expires_at')
+    list_select_related = ('user',)
+    list_filter = ('used',)
+    search_fields = ('=token',)
+    raw_id_fields = ('user',)
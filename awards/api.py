@@ -0,0 +1,119 @@
+from itertools import groupby
+
+from django.conf import settings
+from django.db.models import Count
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from .caching import get_award_config, get_current_stage, results_published
+from .models import Category, FinalResult, Nominee
+from .routers import read_only_view
+
+
+# =========================
+# JSON API только для чтения
+# =========================
+def _json(data, status=200):
+    # Компактный JSON: без пробелов, кириллица без \u-экранирования
+    return JsonResponse(
+        data,
+        status=status,
+        json_dumps_params={'separators': (',', ':'), 'ensure_ascii': False},
+    )
+
+
+def _int_param(request, name, default):
+    try:
+        return int(request.GET.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+@require_GET
+@read_only_view
+def award(request):
+    award_config = get_award_config()
+    return _json({
+        'name': award_config.name if award_config else None,
+        'description': award_config.description if award_config else '',
+        'stage': get_current_stage(),
+    })
+
+
+@require_GET
+@read_only_view
+def categories(request):
+    rows = (
+        Category.objects
+        .annotate(nominees=Count('nominee'))
+        .order_by('id')
+        .values('id', 'name', 'description', 'is_main', 'nominees')
+    )
+    return _json({'categories': list(rows)})
+
+
+@require_GET
+@read_only_view
+def category_nominees(request, category_id):
+    """
+    Номинанты категории постранично: ?after=<id последнего номинанта>&limit=<размер страницы>.
+    Пагинация по ключу — без OFFSET и без COUNT по всей категории.
+    """
+    if not Category.objects.filter(id=category_id).exists():
+        return _json({'error': 'Категория не найдена'}, status=404)
+
+    limit = min(max(_int_param(request, 'limit', settings.API_PAGE_SIZE), 1), settings.API_MAX_PAGE_SIZE)
+    after = _int_param(request, 'after', 0)
+
+    # Берём на одну строку больше, чтобы узнать, есть ли следующая страница
+    rows = list(
+        Nominee.objects
+        .filter(category_id=category_id, id__gt=after)
+        .order_by('id')
+        .values('id', 'name', 'description')[:limit + 1]
+    )
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+
+    return _json({
+        'category': category_id,
+        'nominees': rows,
+        'next': rows[-1]['id'] if has_next else None,
+    })
+
+
+@require_GET
+@read_only_view
+def results(request):
+    """Опубликованный рейтинг номинантов по категориям; ?category=<id> — одна категория."""
+    if not results_published():
+        return _json({'published': False, 'categories': []})
+
+    rows = (
+        FinalResult.objects
+        .order_by('category_id', '-total_score', 'nominee_id')
+        .values_list('category_id', 'category__name', 'nominee_id', 'nominee__name',
+                      'jury_votes', 'user_votes', 'total_score')
+    )
+    category_id = _int_param(request, 'category', None)
+    if category_id is not None:
+        rows = rows.filter(category_id=category_id)
+
+    categories_data = []
+    for (category_id, category_name), ranking in groupby(rows, key=lambda row: row[:2]):
+        categories_data.append({
+            'id': category_id,
+            'name': category_name,
+            'ranking': [
+                {
+                    'nominee': nominee_id,
+                    'name': nominee_name,
+                    'jury_votes': jury_votes,
+                    'user_votes': user_votes,
+                    'score': round(total_score, 6),
+                }
+                for _, _, nominee_id, nominee_name, jury_votes, user_votes, total_score in ranking
+            ],
+        })
+
+    return _json({'published': True, 'categories': categories_data})
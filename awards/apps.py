@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AwardsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'awards'
+
+    def ready(self):
+        # Подключаем обработчики сигналов
+        from . import caching, tally  # noqa: F401
@@ -0,0 +1,126 @@
+import time
+from collections import namedtuple
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, SESSION_KEY, get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.signals import user_logged_in
+from django.dispatch import receiver
+from django.utils.functional import SimpleLazyObject
+
+
+BACKEND_PATH = 'awards.auth.ProfileModelBackend'
+# Сессии, созданные до появления ProfileModelBackend
+LEGACY_BACKEND_PATH = 'django.contrib.auth.backends.ModelBackend'
+
+IDENTITY_SESSION_KEY = '_awards_identity'
+
+# То, что показывают страницы (имя в шапке, отметки участия); права всегда берутся из request.user
+Identity = namedtuple('Identity', ['id', 'username', 'first_name'])
+
+
+# =========================
+# Пользователь и профиль одним запросом
+# =========================
+class ProfileModelBackend(ModelBackend):
+    """ModelBackend, который загружает пользователя вместе с UserProfile (один JOIN вместо двух запросов)."""
+
+    def get_user(self, user_id):
+        User = get_user_model()
+        try:
+            user = User._default_manager.select_related('userprofile').get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+
+# =========================
+# Кэш личности пользователя в сессии
+# =========================
+def identity_for(user):
+    return Identity(id=user.pk, username=user.username, first_name=user.first_name)
+
+
+def remember_identity(request, user):
+    """Сохраняет личность в сессии вместе с временем проверки; в сессию пишет, только если что-то изменилось."""
+    identity = identity_for(user)
+    cached = request.session.get(IDENTITY_SESSION_KEY)
+    if not _is_fresh(cached, user.pk) or cached[:-1] != list(identity):
+        request.session[IDENTITY_SESSION_KEY] = [*identity, int(time.time())]
+    return identity
+
+
+def _is_fresh(cached, user_id):
+    # Формат [id, username, first_name, время проверки]; списки старого формата считаем устаревшими
+    return (
+        isinstance(cached, list)
+        and len(cached) == len(Identity._fields) + 1
+        and str(cached[0]) == str(user_id)
+        and time.time() - cached[-1] < settings.AUTH_IDENTITY_MAX_AGE
+    )
+
+
+def get_identity(request):
+    """
+    Кто пользователь — по сессии, без запроса к auth_user. None для анонимов.
+    Личность из сессии доверенная не дольше AUTH_IDENTITY_MAX_AGE секунд: потом (и всякий раз,
+    когда представление всё равно загрузило request.user) пользователь проверяется заново —
+    auth.get_user сверяет хэш сессии (смена пароля) и is_active.
+    """
+    user_id = request.session.get(SESSION_KEY)
+    if user_id is None:
+        return None
+
+    cached = request.session.get(IDENTITY_SESSION_KEY)
+    if not hasattr(request, '_cached_user') and _is_fresh(cached, user_id):
+        return Identity(*cached[:-1])
+
+    # request.user сам обновляет или убирает личность в сессии
+    user = request.user
+    return identity_for(user) if user.is_authenticated else None
+
+
+@receiver(user_logged_in)
+def store_identity_on_login(sender, request, user, **kwargs):
+    if request is not None and hasattr(request, 'session'):
+        remember_identity(request, user)
+
+
+def _get_user(request):
+    if not hasattr(request, '_cached_user'):
+        # Сессии старого ModelBackend переводим на ProfileModelBackend, чтобы никого не разлогинить
+        if request.session.get(BACKEND_SESSION_KEY) == LEGACY_BACKEND_PATH:
+            request.session[BACKEND_SESSION_KEY] = BACKEND_PATH
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            remember_identity(request, user)
+        else:
+            # Пароль сменён, пользователь отключён или удалён — личность из сессии больше не действует
+            request.session.pop(IDENTITY_SESSION_KEY, None)
+        request._cached_user = user
+    return request._cached_user
+
+
+class SessionIdentityMiddleware:
+    """
+    Добавляет request.identity (ленивый, из сессии). Ставится после AuthenticationMiddleware.
+    request.user тоже остаётся ленивым: сессия читается из базы, только когда
+    представлению действительно нужен пользователь (отказ rate_limit обходится без неё).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user = SimpleLazyObject(lambda: _get_user(request))
+        request.auser = partial(sync_to_async(_get_user), request)
+        request.identity = SimpleLazyObject(lambda: get_identity(request))
+        return self.get_response(request)
+
+
+def identity(request):
+    """Контекстный процессор: identity в шаблонах (None у анонимов)."""
+    return {'identity': getattr(request, 'identity', None)}
@@ -0,0 +1,140 @@
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.views.decorators.http import condition
+
+from .models import AwardConfig, Category, FinalResult, Nominee
+
+
+AWARD_CONFIG_CACHE_KEY = 'awards:award_config'
+CONTENT_VERSION_CACHE_KEY = 'awards:content_version'
+
+_MISSING = object()
+
+# Копия конфигурации в памяти процесса: {'config': ..., 'expires': ...}
+_local = {}
+
+
+# =========================
+# Конфигурация премии и текущий этап из кэша
+# =========================
+def get_award_config():
+    """
+    AwardConfig без запроса к БД на каждый просмотр страницы.
+    Сначала память процесса (живёт AWARD_CONFIG_LOCAL_TTL секунд),
+    затем общий для воркеров кэш Django, и только потом БД.
+    """
+    now = time.monotonic()
+    if _local.get('expires', 0) > now:
+        return _local['config']
+
+    config = cache.get(AWARD_CONFIG_CACHE_KEY, _MISSING)
+    if config is _MISSING:
+        config = AwardConfig.objects.first()
+        cache.set(AWARD_CONFIG_CACHE_KEY, config, settings.AWARD_CONFIG_CACHE_TIMEOUT)
+
+    _local['config'] = config
+    _local['expires'] = now + settings.AWARD_CONFIG_LOCAL_TTL
+    return config
+
+
+def get_current_stage():
+    award_config = get_award_config()
+    return award_config.current_stage if award_config else None
+
+
+def results_published():
+    """Итоги видны публично (страница результатов и API) только на этапе «Результаты»."""
+    return get_current_stage() == 'results'
+
+
+def invalidate_award_config():
+    _local.clear()
+    cache.delete(AWARD_CONFIG_CACHE_KEY)
+
+
+@receiver(post_save, sender=AwardConfig)
+@receiver(post_delete, sender=AwardConfig)
+def award_config_changed(sender, **kwargs):
+    invalidate_award_config()
+    # Повторно после коммита — чтобы параллельный запрос не закэшировал старое значение
+    transaction.on_commit(invalidate_award_config)
+
+
+# =========================
+# Версия контента для кэша страниц
+# =========================
+def get_content_version():
+    """Число, которое меняется при любом изменении категорий, номинантов, результатов или этапа."""
+    version = cache.get(CONTENT_VERSION_CACHE_KEY)
+    if version is None:
+        # Кэш очищен — начинаем с текущего времени, чтобы не совпасть со старой версией
+        cache.add(CONTENT_VERSION_CACHE_KEY, time.time_ns(), None)
+        version = cache.get(CONTENT_VERSION_CACHE_KEY)
+    return version
+
+
+def bump_content_version():
+    # Не incr: новое значение не должно повторять ни одно из прежних
+    version = max(time.time_ns(), (cache.get(CONTENT_VERSION_CACHE_KEY) or 0) + 1)
+    cache.set(CONTENT_VERSION_CACHE_KEY, version, None)
+    return version
+
+
+def page_cache_context():
+    """Контекст для {% cache %} в публичных шаблонах."""
+    return {
+        "content_version": get_content_version(),
+        "page_cache_timeout": settings.AWARD_PAGE_CACHE_TIMEOUT,
+    }
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Nominee)
+@receiver(post_delete, sender=Nominee)
+@receiver(post_save, sender=FinalResult)
+@receiver(post_delete, sender=FinalResult)
+@receiver(post_save, sender=AwardConfig)
+@receiver(post_delete, sender=AwardConfig)
+def content_changed(sender, **kwargs):
+    bump_content_version()
+    # Страница, отрисованная до коммита, не должна остаться в кэше под новой версией
+    transaction.on_commit(bump_content_version)
+
+
+# =========================
+# Условные GET (ETag / Last-Modified) для публичных страниц
+# =========================
+def _anonymous_content_version(request):
+    """
+    Версия контента для анонимного запроса, None — для вошедшего пользователя:
+    его страница зависит ещё и от него самого (меню, отметки о голосах).
+    Версия читается один раз на запрос — её спрашивают и ETag, и Last-Modified.
+    """
+    if request.session.get(SESSION_KEY) is not None:
+        return None
+    if not hasattr(request, '_content_version'):
+        request._content_version = get_content_version()
+    return request._content_version
+
+
+def content_etag(request, *args, **kwargs):
+    version = _anonymous_content_version(request)
+    return None if version is None else f'"v{version}"'
+
+
+def content_last_modified(request, *args, **kwargs):
+    # Версия — время изменения в наносекундах (см. bump_content_version)
+    version = _anonymous_content_version(request)
+    return None if version is None else datetime.fromtimestamp(version / 1e9, tz=timezone.utc)
+
+
+# Ответ 304 до рендера шаблона и до любых запросов к базе, кроме чтения версии
+conditional_page = condition(etag_func=content_etag, last_modified_func=content_last_modified)
@@ -0,0 +1,55 @@
+import csv
+import json
+
+from django.conf import settings
+
+from .models import Vote
+from .routers import separate_readonly_database
+
+
+VOTE_HEADER = ['id', 'user_id', 'username', 'category_id', 'category', 'nominee_id', 'nominee', 'jury', 'created']
+VOTE_FIELDS = (
+    'id', 'user_id', 'user__username', 'category_id', 'category__name',
+    'nominee_id', 'nominee__name', 'jury', 'created',
+)
+
+
+# =========================
+# Потоковая выгрузка
+# =========================
+class Echo:
+    """Псевдофайл для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(header, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def vote_rows(chunk_size=None):
+    """
+    Все голоса одним запросом с JOIN по пользователю, категории и номинанту.
+    iterator() читает курсор порциями по chunk_size — в памяти не больше одной порции.
+    Читаем с реплики только для чтения: выгрузка идёт уже после выхода из view.
+    """
+    database = settings.READONLY_DATABASE if separate_readonly_database() else 'default'
+    queryset = Vote.objects.using(database).order_by('id').values_list(*VOTE_FIELDS)
+    for row in queryset.iterator(chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE):
+        *head, jury, created = row
+        yield [*head, int(jury), created.isoformat()]
+
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', lambda rows: csv_lines(VOTE_HEADER, rows)),
+    'ndjson': ('application/x-ndjson; charset=utf-8', lambda rows: ndjson_lines(VOTE_HEADER, rows)),
+}
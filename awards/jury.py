@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .export import csv_lines
+from .models import JuryToken
+
+
+CSV_HEADER = ['token', 'link', 'expires_at']
+
+
+# =========================
+# Пакетная выдача и очистка токенов жюри
+# =========================
+def issue_tokens(count, hours=None):
+    """Создаёт count токенов одним bulk_create; срок жизни — hours или JURY_TOKEN_TTL_HOURS."""
+    expires_at = timezone.now() + timedelta(hours=hours or settings.JURY_TOKEN_TTL_HOURS)
+    return JuryToken.objects.bulk_create(
+        [JuryToken(expires_at=expires_at) for _ in range(count)],
+        batch_size=500,
+    )
+
+
+def purge_tokens(include_used=True):
+    """Удаляет истёкшие (и использованные) токены одним DELETE. Возвращает число удалённых."""
+    condition = Q(expires_at__lte=timezone.now())
+    if include_used:
+        condition |= Q(used=True)
+    deleted, _ = JuryToken.objects.filter(condition).delete()
+    return deleted
+
+
+def token_path(token):
+    return reverse('jury_login', args=[token])
+
+
+def csv_rows(tokens, make_link):
+    """Строки CSV (заголовок + по строке на токен) для StreamingHttpResponse или файла."""
+    return csv_lines(CSV_HEADER, (
+        [token_obj.token, make_link(token_path(token_obj.token)), token_obj.expires_at.isoformat()]
+        for token_obj in tokens
+    ))
@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.core.cache import caches
+
+from .caching import get_content_version
+from .models import Category, CategoryTally, Nominee, NomineeTally
+from .scoring import award_scoring, score_nominees
+from .tally import tally_version
+
+
+# =========================
+# Живая лента счётчиков для админов
+# =========================
+def _category_totals(queryset):
+    return {
+        category_id: [jury_votes, user_votes]
+        for category_id, jury_votes, user_votes in queryset.values_list('category_id', 'jury_votes', 'user_votes')
+    }
+
+
+def _nominee_rows(queryset):
+    """[id, category_id, (name,) jury_votes, user_votes] по категориям; номинант без строки счётчика — без голосов."""
+    return [
+        [*head, jury_votes or 0, user_votes or 0]
+        for *head, jury_votes, user_votes in queryset.order_by('category_id', 'id')
+    ]
+
+
+def _scored(rows, scoring):
+    """Дописывает к строкам номинантов итоговый счёт — той же функцией, что и подсчёт результатов."""
+    scores = score_nominees([row[1] for row in rows], [row[-2] for row in rows], [row[-1] for row in rows], scoring)
+    return [[*row, round(float(score), 6)] for row, score in zip(rows, scores)]
+
+
+def _full_snapshot(scoring):
+    """Все категории и номинанты с текущими счётчиками и счётом."""
+    nominees = _nominee_rows(
+        Nominee.objects.values_list('id', 'category_id', 'name', 'tally__jury_votes', 'tally__user_votes')
+    )
+    totals = _category_totals(CategoryTally.objects.all())
+    categories = [
+        [category_id, name, *totals.get(category_id, [0, 0])]
+        for category_id, name in Category.objects.order_by('id').values_list('id', 'name')
+    ]
+    return {'categories': categories, 'nominees': _scored(nominees, scoring)}
+
+
+def _changes_since(since, scoring):
+    """
+    Категории, где счётчики менялись после версии since: их итоги и все их номинанты.
+    Счёт номинанта зависит от всей категории (суммы или лидера), поэтому категория отдаётся целиком.
+    """
+    category_ids = set(NomineeTally.objects.filter(version__gt=since).values_list('category_id', flat=True))
+    nominees = _nominee_rows(
+        Nominee.objects.filter(category_id__in=category_ids)
+        .values_list('id', 'category_id', 'tally__jury_votes', 'tally__user_votes')
+    )
+    totals = _category_totals(CategoryTally.objects.filter(category_id__in=category_ids))
+    return {
+        'categories': [[category_id, *totals.get(category_id, [0, 0])] for category_id in sorted(category_ids)],
+        'nominees': _scored(nominees, scoring),
+    }
+
+
+def live_tally(since=0):
+    """
+    Ответ ленты: при since=0 (или если клиент «впереди» — счётчики пересобраны) — полный снимок,
+    иначе только изменившиеся категории. Когда новых голосов нет, это один индексный запрос MAX(version).
+    Счёт номинантов считает сервер, панель его только показывает.
+    Ответ кэшируется по (версия контента, версия счётчиков, since) — сколько бы админов ни
+    смотрели, запросы к счётчикам выполняются один раз на каждое изменение.
+    """
+    version = tally_version()
+    content_version = get_content_version()
+    full = since <= 0 or since > version
+    if not full and since == version:
+        return {'version': version, 'content_version': content_version, 'full': False,
+                'categories': [], 'nominees': []}
+
+    cache = caches['pages']
+    cache_key = f"awards:live:{content_version}:{version}:{'full' if full else since}"
+    data = cache.get(cache_key)
+    if data is None:
+        # Веса живут в AwardConfig: их изменение меняет версию контента, а с ней и ключ кэша
+        scoring = award_scoring()
+        data = _full_snapshot(scoring) if full else _changes_since(since, scoring)
+        data.update(version=version, content_version=content_version, full=full)
+        cache.set(cache_key, data, settings.LIVE_TALLY_CACHE_TIMEOUT)
+    return data
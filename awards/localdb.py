@@ -0,0 +1,38 @@
+import os
+import sqlite3
+import threading
+
+from django.conf import settings
+
+
+_local = threading.local()
+
+
+# =========================
+# Локальные SQLite-хранилища служебного состояния
+# =========================
+def connect(name, schema=''):
+    """
+    Соединение с отдельным файлом SQLite в LOCAL_STATE_DIR — общий для всех воркеров
+    gunicorn на машине и не конкурирующий за блокировку основной базы.
+    Одно соединение на поток и хранилище; schema выполняется при первом открытии.
+    """
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(name)
+    if conn is None:
+        os.makedirs(settings.LOCAL_STATE_DIR, exist_ok=True)
+        conn = sqlite3.connect(
+            os.path.join(settings.LOCAL_STATE_DIR, f'{name}.sqlite3'),
+            timeout=5.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        if schema:
+            conn.executescript(schema)
+        connections[name] = conn
+    return conn
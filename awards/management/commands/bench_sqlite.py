@@ -0,0 +1,159 @@
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from project.database import PROFILES, WRITE_ONLY_PRAGMAS, apply_pragmas
+
+
+SCHEMA = """
+CREATE TABLE category (id INTEGER PRIMARY KEY, name TEXT NOT NULL, description TEXT NOT NULL, is_main BOOL NOT NULL);
+CREATE TABLE nominee (id INTEGER PRIMARY KEY, category_id INTEGER NOT NULL REFERENCES category(id), name TEXT NOT NULL);
+CREATE TABLE vote (
+    id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, nominee_id INTEGER NOT NULL REFERENCES nominee(id),
+    jury BOOL NOT NULL, created TEXT NOT NULL
+);
+CREATE INDEX vote_nominee ON vote(nominee_id);
+CREATE TABLE tally (nominee_id INTEGER PRIMARY KEY, user_votes INTEGER NOT NULL DEFAULT 0);
+"""
+
+# Запрос публичной страницы категорий
+READ_QUERY = "SELECT id, name, description, is_main FROM category WHERE is_main = ? ORDER BY id"
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Бенчмарк SQLite: задержка чтения списка категорий при параллельной записи голосов "
+        "для профилей из project/database.py. Работает на временной базе."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', nargs='+', default=list(PROFILES), choices=list(PROFILES))
+        parser.add_argument('--seconds', type=float, default=5.0)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=3)
+        parser.add_argument('--categories', type=int, default=30)
+        parser.add_argument('--nominees', type=int, default=10, help="Номинантов в категории")
+
+    def handle(self, *args, **options):
+        report = {
+            profile: self.run_profile(profile, options)
+            for profile in options['profiles']
+        }
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def connect(self, path, profile, readonly=False):
+        uri = f'file:{path}?mode=ro' if readonly else f'file:{path}'
+        # Таймаут как у Django по умолчанию; в профиле его уточняет busy_timeout
+        conn = sqlite3.connect(uri, uri=True, timeout=5.0, isolation_level=None, check_same_thread=False)
+        pragmas = PROFILES[profile]['pragmas']
+        if readonly:
+            pragmas = {name: value for name, value in pragmas.items() if name not in WRITE_ONLY_PRAGMAS}
+        apply_pragmas(conn, pragmas)
+        return conn
+
+    def run_profile(self, profile, options):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.sqlite3')
+            nominee_ids = self.seed(path, profile, options)
+
+            stop = threading.Event()
+            read_latencies = []
+            stats = {'writes': 0, 'write_errors': 0, 'read_errors': 0}
+            lock = threading.Lock()
+            # Как в продакшене: в WAL публичные страницы читают через отдельное соединение
+            readonly = profile != 'default'
+
+            def writer(seed):
+                rnd = random.Random(seed)
+                conn = self.connect(path, profile)
+                begin = 'BEGIN IMMEDIATE' if PROFILES[profile]['options'].get('transaction_mode') else 'BEGIN'
+                while not stop.is_set():
+                    nominee_id = rnd.choice(nominee_ids)
+                    try:
+                        conn.execute(begin)
+                        conn.execute(
+                            "INSERT INTO vote (user_id, nominee_id, jury, created) VALUES (?, ?, 0, datetime('now'))",
+                            (rnd.randrange(1_000_000), nominee_id),
+                        )
+                        conn.execute("UPDATE tally SET user_votes = user_votes + 1 WHERE nominee_id = ?", (nominee_id,))
+                        conn.execute('COMMIT')
+                        with lock:
+                            stats['writes'] += 1
+                    except sqlite3.OperationalError:
+                        if conn.in_transaction:
+                            conn.execute('ROLLBACK')
+                        with lock:
+                            stats['write_errors'] += 1
+                conn.close()
+
+            def reader(seed):
+                rnd = random.Random(seed)
+                conn = self.connect(path, profile, readonly=readonly)
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    try:
+                        conn.execute(READ_QUERY, (rnd.choice((0, 1)),)).fetchall()
+                    except sqlite3.OperationalError:
+                        with lock:
+                            stats['read_errors'] += 1
+                        continue
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        read_latencies.append(elapsed)
+                conn.close()
+
+            threads = [threading.Thread(target=writer, args=(i,)) for i in range(options['writers'])]
+            threads += [threading.Thread(target=reader, args=(1000 + i,)) for i in range(options['readers'])]
+            for thread in threads:
+                thread.start()
+            time.sleep(options['seconds'])
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        ms = 1000
+        return {
+            'reads': len(read_latencies),
+            'read_p50_ms': round(percentile(read_latencies, 0.50) * ms, 3) if read_latencies else None,
+            'read_p95_ms': round(percentile(read_latencies, 0.95) * ms, 3) if read_latencies else None,
+            'read_p99_ms': round(percentile(read_latencies, 0.99) * ms, 3) if read_latencies else None,
+            'read_max_ms': round(max(read_latencies) * ms, 3) if read_latencies else None,
+            'read_mean_ms': round(statistics.fmean(read_latencies) * ms, 3) if read_latencies else None,
+            'writes_per_second': round(stats['writes'] / options['seconds'], 1),
+            'write_errors': stats['write_errors'],
+            'read_errors': stats['read_errors'],
+        }
+
+    def seed(self, path, profile, options):
+        conn = self.connect(path, profile)
+        conn.executescript(SCHEMA)
+        conn.execute('BEGIN')
+        nominee_ids = []
+        for c in range(options['categories']):
+            cursor = conn.execute(
+                "INSERT INTO category (name, description, is_main) VALUES (?, ?, ?)",
+                (f"Категория {c}", "Описание " * 20, c % 2),
+            )
+            for n in range(options['nominees']):
+                nominee = conn.execute(
+                    "INSERT INTO nominee (category_id, name) VALUES (?, ?)", (cursor.lastrowid, f"Номинант {n}")
+                )
+                nominee_ids.append(nominee.lastrowid)
+                conn.execute("INSERT INTO tally (nominee_id) VALUES (?)", (nominee.lastrowid,))
+        conn.execute('COMMIT')
+        conn.close()
+        return nominee_ids
@@ -0,0 +1,145 @@
+import json
+import random
+import statistics
+import subprocess
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.urls import reverse
+
+from awards.metrics import QueryTimer
+from awards.models import Category, Nominee
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Бенчмарк горячих путей (vote, categories_list, count GET/POST, results_public) "
+        "на временной тестовой базе, заполненной seed_award. Печатает JSON с p50/p95, "
+        "числом SQL-запросов и временем в БД."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help="Запросов на каждый путь")
+        parser.add_argument('--count-iterations', type=int, default=5, help="Запросов к count (тяжёлый путь)")
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--voters', type=int, default=20, help="Сколько разных пользователей голосуют")
+        parser.add_argument('--output', help="Записать JSON в файл")
+        # Параметры seed_award
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--jury', type=int, default=20)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--nominees', type=int, default=10)
+        parser.add_argument('--suggestions', type=int, default=500)
+        parser.add_argument('--votes', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        # Отдельные кэши в памяти — бенчмарк не должен трогать рабочий файловый кэш
+        caches = {
+            alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'bench-{alias}'}
+            for alias in settings.CACHES
+        }
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            # Все запросы бенчмарка идут с одного адреса — ограничитель частоты им не нужен
+            with override_settings(CACHES=caches, RATE_LIMIT_ENABLED=False):
+                report = self.run(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        self.stdout.write(output)
+
+    def run(self, options):
+        call_command(
+            'seed_award', stdout=self.stderr,
+            users=options['users'], jury=options['jury'], categories=options['categories'],
+            nominees=options['nominees'], suggestions=options['suggestions'], votes=options['votes'],
+            seed=options['seed'], stage='voting',
+        )
+        rnd = random.Random(options['seed'])
+
+        voters = []
+        for user in User.objects.filter(username__startswith='seed_').order_by('?')[:options['voters']]:
+            client = Client()
+            client.force_login(user)
+            voters.append(client)
+
+        staff = User.objects.create_user('bench_admin', is_staff=True, is_superuser=True)
+        staff_client = Client()
+        staff_client.force_login(staff)
+        anonymous = Client()
+
+        nominees = list(Nominee.objects.values_list('id', 'category_id'))
+        category_id = Category.objects.values_list('id', flat=True).first()
+
+        def vote():
+            nominee_id, nominee_category_id = rnd.choice(nominees)
+            return rnd.choice(voters).post(reverse('vote', args=[nominee_category_id]), {'nominee': nominee_id})
+
+        paths = {
+            'vote': (vote, options['iterations']),
+            'vote_page': (lambda: rnd.choice(voters).get(reverse('vote', args=[category_id])), options['iterations']),
+            'categories_list': (lambda: anonymous.get(reverse('categories_list')), options['iterations']),
+            'categories_list_user': (lambda: rnd.choice(voters).get(reverse('categories_list')), options['iterations']),
+            'count_get': (lambda: staff_client.get(reverse('count')), options['count_iterations']),
+            'count_post': (lambda: staff_client.post(reverse('count')), options['count_iterations']),
+            'results_public': (lambda: anonymous.get(reverse('results_public')), options['iterations']),
+        }
+
+        timer = QueryTimer()
+        results = {}
+        for name, (request, iterations) in paths.items():
+            for _ in range(options['warmup']):
+                request()
+            latencies, queries, db_times = [], [], []
+            for _ in range(iterations):
+                timer.reset()
+                with timer.wrap_connections():
+                    started = time.perf_counter()
+                    response = request()
+                    elapsed = time.perf_counter() - started
+                if response.status_code >= 400:
+                    raise RuntimeError(f"{name}: HTTP {response.status_code}")
+                latencies.append(elapsed)
+                queries.append(timer.queries)
+                db_times.append(timer.seconds)
+            results[name] = {
+                'requests': iterations,
+                'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+                'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+                'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+                'queries_mean': round(statistics.fmean(queries), 2),
+                'queries_max': max(queries),
+                'db_ms_mean': round(statistics.fmean(db_times) * 1000, 3),
+            }
+
+        return {
+            'commit': self.git_commit(),
+            'dataset': {key: options[key] for key in ('users', 'jury', 'categories', 'nominees', 'suggestions', 'votes', 'seed')},
+            'paths': results,
+        }
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,75 @@
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count
+
+from awards.models import Category, FinalResult, JuryToken, Nominee, SuggestedCategory, SuggestedNominee, Vote
+
+
+def hot_queries():
+    """Горячие запросы приложения: (название, queryset). Значения параметров не важны для плана."""
+    return [
+        ('vote: голоса номинанта жюри/пользователей',
+         Vote.objects.filter(nominee_id=1, jury=True).values('id')),
+        ('tally: голоса по (номинант, жюри)',
+         Vote.objects.values('nominee_id', 'jury').annotate(n=Count('id')).order_by()),
+        ('vote: прежний голос пользователя в категории',
+         Vote.objects.filter(user_id=1, category_id=1).values('nominee_id', 'jury')),
+        ('suggest_nominee: уже предлагал в категории',
+         SuggestedNominee.objects.filter(category_id=1, user_id=1).values('id')[:1]),
+        ('suggest_category: число предложений пользователя',
+         SuggestedCategory.objects.filter(user_id=1).values('id')),
+        ('jury_login: токен жюри',
+         JuryToken.objects.filter(token=uuid.uuid4(), used=False)[:1]),
+        ('index: основные категории',
+         Category.objects.filter(is_main=True)),
+        ('categories_list: дополнительные категории',
+         Category.objects.filter(is_main=False)),
+        ('vote: номинанты категории',
+         Nominee.objects.filter(category_id=1)),
+        ('results_public: победитель категории',
+         FinalResult.objects.filter(category_id=1).order_by('-total_score').values('nominee__name')[:1]),
+    ]
+
+
+def full_scans(plan):
+    """Шаги плана, которые читают таблицу целиком, а не по индексу."""
+    return [
+        detail for detail in plan
+        if detail.startswith('SCAN ') and 'INDEX' not in detail and detail != 'SCAN CONSTANT ROW'
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Выполняет EXPLAIN QUERY PLAN для горячих запросов и завершается с ошибкой, "
+        "если какой-то из них читает таблицу целиком (SCAN без индекса)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError("Проверка планов поддерживает только SQLite")
+
+        failed = []
+        with connection.cursor() as cursor:
+            for name, queryset in hot_queries():
+                sql, params = queryset.query.get_compiler(connection=connection).as_sql()
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                plan = [row[3] for row in cursor.fetchall()]
+                scans = full_scans(plan)
+
+                style = self.style.ERROR if scans else self.style.SUCCESS
+                self.stdout.write(style(f"{'FAIL' if scans else 'ok'}  {name}"))
+                if scans or options['verbosity'] > 1:
+                    for detail in plan:
+                        self.stdout.write(f"      {detail}")
+                if scans:
+                    failed.append(name)
+
+        if failed:
+            raise CommandError(f"Полный просмотр таблицы в запросах: {len(failed)}")
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from awards.suggestions import category_clusters, nominee_clusters
+
+
+class Command(BaseCommand):
+    help = "Группирует похожие предложенные номинации и номинантов (регистр, ё/е, пунктуация, порядок слов)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=['categories', 'nominees', 'all'], default='all')
+        parser.add_argument('--threshold', type=float, default=None,
+                            help="Минимальное сходство по словам (по умолчанию SUGGESTION_SIMILARITY)")
+        parser.add_argument('--min-size', type=int, default=2, help="Показывать группы не меньше этого размера")
+
+    def handle(self, *args, **options):
+        threshold = options['threshold']
+        if threshold is not None and not 0 < threshold <= 1:
+            raise CommandError("--threshold: от 0 до 1")
+
+        if options['kind'] in ('categories', 'all'):
+            self.stdout.write(self.style.MIGRATE_HEADING("Номинации"))
+            self.write_clusters(category_clusters(threshold, options['min_size']))
+
+        if options['kind'] in ('nominees', 'all'):
+            self.stdout.write(self.style.MIGRATE_HEADING("Номинанты"))
+            for category, clusters in nominee_clusters(threshold, options['min_size']):
+                self.stdout.write(f"{category['name']} (#{category['id']})")
+                self.write_clusters(clusters, indent='  ')
+
+    def write_clusters(self, clusters, indent=''):
+        for cluster in clusters:
+            self.stdout.write(f"{indent}[{cluster['size']}] " + ' | '.join(name for _, name in cluster['suggestions']))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from awards.models import Category, Nominee, ResultRun
+from awards.results import compare_runs
+
+
+class Command(BaseCommand):
+    help = "Сравнивает два сохранённых подсчёта результатов (по умолчанию два последних)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('old', nargs='?', type=int, help="Номер более раннего подсчёта")
+        parser.add_argument('new', nargs='?', type=int, help="Номер более позднего подсчёта")
+
+    def handle(self, *args, **options):
+        if options['old'] and options['new']:
+            runs = {run.number: run for run in ResultRun.objects.filter(number__in=[options['old'], options['new']])}
+            missing = {options['old'], options['new']} - set(runs)
+            if missing:
+                raise CommandError(f"Нет подсчётов с номерами: {', '.join(map(str, sorted(missing)))}")
+            old_run, new_run = runs[options['old']], runs[options['new']]
+        else:
+            latest = list(ResultRun.objects.order_by('-number')[:2])
+            if len(latest) < 2:
+                raise CommandError("Для сравнения нужно хотя бы два подсчёта")
+            new_run, old_run = latest
+
+        changes = compare_runs(old_run, new_run)
+        categories = dict(Category.objects.values_list('id', 'name'))
+        nominees = dict(Nominee.objects.filter(
+            id__in={change['nominee'] for change in changes}
+        ).values_list('id', 'name'))
+
+        self.stdout.write(f"{old_run} → {new_run}: изменений {len(changes)}")
+        for change in changes:
+            old, new = change['old'], change['new']
+            self.stdout.write(
+                f"  {categories.get(change['category'], change['category'])} / "
+                f"{nominees.get(change['nominee'], change['nominee'])}: "
+                f"{self._describe(old)} → {self._describe(new)}"
+            )
+
+    def _describe(self, row):
+        if row is None:
+            return "—"
+        place, jury_votes, user_votes, total_score = row
+        return f"место {place}, жюри {jury_votes}, пользователи {user_votes}, счёт {total_score:.3f}"
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from awards.export import EXPORT_FORMATS, vote_rows
+
+
+class Command(BaseCommand):
+    help = "Потоковая выгрузка всех голосов (CSV или NDJSON) без загрузки таблицы в память"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', default='csv', choices=sorted(EXPORT_FORMATS))
+        parser.add_argument('--output', help="Записать в файл вместо stdout")
+        parser.add_argument('--chunk-size', type=int, default=None,
+                            help=f"Строк из курсора за раз (по умолчанию EXPORT_CHUNK_SIZE={settings.EXPORT_CHUNK_SIZE})")
+
+    def handle(self, *args, **options):
+        _, render_lines = EXPORT_FORMATS[options['format']]
+        lines = render_lines(vote_rows(options['chunk_size']))
+
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as f:
+                f.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,51 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError
+
+from awards.voting import flush_queued_votes
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Применяет голоса из очереди (режим VOTE_INGEST_MODE=queued)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help="Работать постоянно, разбирая очередь каждые --interval секунд",
+        )
+        parser.add_argument(
+            '--interval', type=float, default=None,
+            help="Пауза между разборами очереди, по умолчанию половина VOTE_QUEUE_MAX_DELAY",
+        )
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or settings.VOTE_QUEUE_MAX_DELAY / 2
+
+        if options['loop'] and settings.VOTE_INGEST_MODE != 'queued':
+            # Режим берётся из настроек Django (в т.ч. из .env) — без очереди фоновый процесс не нужен
+            processed = flush_queued_votes(options['batch_size'], wait=True)
+            self.stdout.write(f"VOTE_INGEST_MODE={settings.VOTE_INGEST_MODE}: очередь не используется, "
+                              f"применено оставшихся голосов: {processed}")
+            return
+
+        while True:
+            try:
+                processed = flush_queued_votes(options['batch_size'])
+            except DatabaseError as e:
+                # Занятая или недоступная база не должна останавливать цикл: голоса
+                # остаются в очереди и применятся на следующем проходе
+                if not options['loop']:
+                    raise
+                logger.warning(f"Vote queue: flush failed: {e}")
+                processed = 0
+            if processed or not options['loop']:
+                self.stdout.write(f"Применено голосов из очереди: {processed}")
+            if not options['loop']:
+                return
+            time.sleep(interval)
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from awards.jury import csv_rows, issue_tokens
+
+
+class Command(BaseCommand):
+    help = "Выпускает пачку одноразовых ссылок для жюри (один bulk_create) и печатает их CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int, help="Сколько ссылок выпустить")
+        parser.add_argument('--hours', type=int, default=None,
+                            help="Срок действия, часов (по умолчанию JURY_TOKEN_TTL_HOURS)")
+        parser.add_argument('--base-url', default=None, help="Адрес сайта для ссылок (по умолчанию SITE_URL)")
+        parser.add_argument('--output', help="Записать CSV в файл вместо stdout")
+
+    def handle(self, *args, **options):
+        if options['count'] <= 0:
+            raise CommandError("count должен быть больше нуля")
+        if options['hours'] is not None and options['hours'] <= 0:
+            raise CommandError("--hours должен быть больше нуля")
+
+        base_url = (options['base_url'] or settings.SITE_URL).rstrip('/')
+        tokens = issue_tokens(options['count'], options['hours'])
+        rows = csv_rows(tokens, lambda path: f"{base_url}{path}")
+
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as f:
+                f.writelines(rows)
+        else:
+            for row in rows:
+                self.stdout.write(row, ending='')
+        self.stderr.write(self.style.SUCCESS(f"Выпущено ссылок: {len(tokens)}"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from awards.jury import purge_tokens
+
+
+class Command(BaseCommand):
+    help = "Удаляет истёкшие и использованные токены жюри одним запросом"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-used', action='store_true',
+                            help="Удалять только истёкшие, использованные оставить")
+
+    def handle(self, *args, **options):
+        deleted = purge_tokens(include_used=not options['keep_used'])
+        self.stdout.write(self.style.SUCCESS(f"Удалено токенов: {deleted}"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from awards.tally import rebuild_tallies, tally_drift
+
+
+class Command(BaseCommand):
+    help = "Пересобирает счётчики голосов по таблице Vote или сверяет их (--check)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help="Только сверить счётчики с голосами, ничего не меняя",
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            drift = tally_drift()
+            for kind, obj_id, counted, expected in drift:
+                self.stdout.write(
+                    f"{kind} {obj_id}: в счётчике жюри/пользователи {counted[0]}/{counted[1]}, "
+                    f"по голосам {expected[0]}/{expected[1]}"
+                )
+            if drift:
+                raise CommandError(f"Расхождений в счётчиках: {len(drift)}")
+            self.stdout.write(self.style.SUCCESS("Счётчики совпадают с голосами"))
+            return
+
+        nominees, categories = rebuild_tallies()
+        self.stdout.write(self.style.SUCCESS(
+            f"Счётчики пересобраны: номинантов {nominees}, категорий {categories}"
+        ))
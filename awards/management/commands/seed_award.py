@@ -0,0 +1,164 @@
+import random
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from awards.models import (
+    AwardConfig,
+    Category,
+    Nominee,
+    SuggestedCategory,
+    SuggestedNominee,
+    UserProfile,
+    Vote,
+    normalize_name,
+)
+from awards.tally import rebuild_tallies
+
+
+USERNAME_PREFIX = 'seed_'
+BATCH_SIZE = 1000
+
+WORDS = [
+    "лучший", "пост", "года", "мем", "доска", "звезда", "открытие", "голос", "кафедра",
+    "факультет", "сообщество", "проект", "фото", "видео", "новичок", "легенда", "админ",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет базу синтетической премией: пользователи, жюри, категории, номинанты, "
+        "предложения и голоса (bulk insert). Для бенчмарков и нагрузочных проверок."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--jury', type=int, default=20, help="Сколько из пользователей — жюри")
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--nominees', type=int, default=10, help="Номинантов в каждой категории")
+        parser.add_argument('--suggestions', type=int, default=500,
+                            help="Предложенных номинаций и столько же предложенных номинантов")
+        parser.add_argument('--votes', type=int, default=10000,
+                            help="Голосов всего (не больше пользователей × категорий)")
+        parser.add_argument('--stage', default='voting', choices=[c[0] for c in AwardConfig.STAGE_CHOICES])
+        parser.add_argument('--seed', type=int, default=0, help="Зерно генератора случайных чисел")
+        parser.add_argument('--clear', action='store_true',
+                            help="Удалить ВСЕ категории (с номинантами, голосами и результатами), "
+                                 "предложения и seed-пользователей перед заполнением")
+        parser.add_argument('--force', action='store_true',
+                            help="Разрешить --clear при DEBUG=False")
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+
+        if options['jury'] > options['users']:
+            raise CommandError("Жюри не может быть больше, чем пользователей")
+        if options['clear'] and not (settings.DEBUG or options['force']):
+            # --clear стирает всю премию, а не только seed-данные: на боевой базе — только осознанно
+            raise CommandError("--clear удаляет все категории и голоса; при DEBUG=False добавьте --force")
+
+        with transaction.atomic():
+            if options['clear']:
+                self.clear()
+            elif User.objects.filter(username__startswith=USERNAME_PREFIX).exists():
+                raise CommandError("В базе уже есть seed-пользователи; запустите с --clear")
+
+            award_config = AwardConfig.objects.first() or AwardConfig()
+            award_config.current_stage = options['stage']
+            award_config.save()
+
+            users = self.create_users(options['users'], options['jury'])
+            categories = Category.objects.bulk_create([
+                Category(
+                    name=f"Категория {i + 1}: {self.phrase(rnd)}",
+                    description=self.phrase(rnd, 12),
+                    is_main=i % 3 != 2,
+                )
+                for i in range(options['categories'])
+            ])
+            nominees = Nominee.objects.bulk_create([
+                Nominee(category=category, name=f"{self.phrase(rnd, 2)} {j + 1}".capitalize(),
+                        description=self.phrase(rnd, 8))
+                for category in categories
+                for j in range(options['nominees'])
+            ], batch_size=BATCH_SIZE)
+
+            self.create_suggestions(rnd, users, categories, options['suggestions'])
+            votes = self.create_votes(rnd, users, options['jury'], categories, nominees, options['votes'])
+
+        rebuild_tallies()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Создано: пользователей {len(users)} (жюри {options['jury']}), категорий {len(categories)}, "
+            f"номинантов {len(nominees)}, предложений {options['suggestions']} × 2, голосов {votes}"
+        ))
+
+    def clear(self):
+        # Обычное удаление: post_delete уменьшает счётчики по голосу. Это медленнее одного DELETE,
+        # но счётчики остаются верными, даже если заполнение ниже упадёт (handle потом их пересобирает)
+        Vote.objects.all().delete()
+        Category.objects.all().delete()
+        SuggestedCategory.objects.all().delete()
+        User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    def phrase(self, rnd, words=3):
+        return ' '.join(rnd.choice(WORDS) for _ in range(words))
+
+    def create_users(self, count, jury):
+        # Хэш пароля считаем один раз: make_password намеренно медленный
+        password = make_password(None)
+        users = User.objects.bulk_create([
+            User(username=f"{USERNAME_PREFIX}{i}", first_name=f"Участник {i}", password=password)
+            for i in range(count)
+        ], batch_size=BATCH_SIZE)
+        # bulk_create не шлёт post_save, профили создаём сами
+        UserProfile.objects.bulk_create([
+            UserProfile(user=user, is_jury=i < jury) for i, user in enumerate(users)
+        ], batch_size=BATCH_SIZE)
+        return users
+
+    def create_suggestions(self, rnd, users, categories, count):
+        if not users or not categories:
+            return
+        # bulk_create не вызывает save(), name_key заполняем сами
+        suggested_categories = []
+        for _ in range(count):
+            name = self.phrase(rnd).capitalize()
+            suggested_categories.append(SuggestedCategory(
+                name=name, name_key=normalize_name(name), description=self.phrase(rnd, 6), user=rnd.choice(users),
+            ))
+        SuggestedCategory.objects.bulk_create(suggested_categories, batch_size=BATCH_SIZE)
+
+        suggested_nominees = []
+        for _ in range(count):
+            name = self.phrase(rnd, 2).capitalize()
+            suggested_nominees.append(SuggestedNominee(
+                category=rnd.choice(categories), name=name, name_key=normalize_name(name),
+                description=self.phrase(rnd, 6), user=rnd.choice(users),
+            ))
+        SuggestedNominee.objects.bulk_create(suggested_nominees, batch_size=BATCH_SIZE)
+
+    def create_votes(self, rnd, users, jury, categories, nominees, count):
+        if not users or not nominees:
+            return 0
+        by_category = {}
+        for nominee in nominees:
+            by_category.setdefault(nominee.category_id, []).append(nominee)
+        voting_categories = [category for category in categories if category.id in by_category]
+
+        # Случайные различные пары (пользователь, категория): не больше одного голоса в категории
+        pairs = len(users) * len(voting_categories)
+        count = min(count, pairs)
+        votes = []
+        for pair in rnd.sample(range(pairs), count):
+            user_index, category_index = divmod(pair, len(voting_categories))
+            category = voting_categories[category_index]
+            # Популярность номинантов неравномерная, как в жизни
+            nominee = rnd.choices(by_category[category.id], weights=range(len(by_category[category.id]), 0, -1))[0]
+            votes.append(Vote(user=users[user_index], category=category, nominee=nominee, jury=user_index < jury))
+
+        Vote.objects.bulk_create(votes, batch_size=BATCH_SIZE)
+        return len(votes)
@@ -0,0 +1,178 @@
+import logging
+import sqlite3
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import localdb
+
+
+logger = logging.getLogger(__name__)
+
+# Границы гистограммы времени ответа, секунды
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS request_metrics (
+    view TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (view, metric)
+);
+"""
+
+
+class QueryTimer:
+    """Считает SQL-запросы и время в БД через execute_wrapper (работает и без DEBUG)."""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.queries += 1
+
+    def reset(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def wrap_connections(self):
+        """Подключает счётчик ко всем соединениям из DATABASES (default, readonly и т.д.)."""
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(self))
+        return stack
+
+
+# =========================
+# Накопление и сброс метрик
+# =========================
+# Метрики процесса, ещё не записанные в общее хранилище: {view: {metric: value}}
+_pending = defaultdict(lambda: defaultdict(float))
+_last_flush = [time.monotonic()]
+
+
+def record(view, seconds, queries, db_seconds, response_bytes):
+    metrics = _pending[view]
+    metrics['requests'] += 1
+    metrics['seconds'] += seconds
+    metrics['queries'] += queries
+    metrics['db_seconds'] += db_seconds
+    metrics['bytes'] += response_bytes
+    for bound in LATENCY_BUCKETS:
+        if seconds <= bound:
+            metrics[f'le:{bound}'] += 1
+
+    if time.monotonic() - _last_flush[0] >= settings.METRICS_FLUSH_INTERVAL:
+        flush()
+
+
+def flush():
+    """Добавляет накопленные в процессе метрики к общим счётчикам всех воркеров."""
+    _last_flush[0] = time.monotonic()
+    if not _pending:
+        return
+    rows = [
+        (view, metric, value)
+        for view, metrics in _pending.items()
+        for metric, value in metrics.items()
+    ]
+    try:
+        conn = localdb.connect('metrics', SCHEMA)
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany(
+                "INSERT INTO request_metrics (view, metric, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (view, metric) DO UPDATE SET value = value + excluded.value",
+                rows,
+            )
+    except sqlite3.Error as e:
+        # Метрики не должны ломать обработку запросов; накопленное попробуем записать в следующий раз
+        logger.warning(f"Metrics: flush failed: {e}")
+        return
+    _pending.clear()
+
+
+def collected():
+    """Общие счётчики всех воркеров: {view: {metric: value}}."""
+    flush()
+    conn = localdb.connect('metrics', SCHEMA)
+    data = defaultdict(dict)
+    for view, metric, value in conn.execute("SELECT view, metric, value FROM request_metrics ORDER BY view"):
+        data[view][metric] = value
+    return data
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def render_prometheus(data):
+    """Текстовый формат Prometheus."""
+    lines = []
+
+    def family(name, kind, help_text, metric):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for view, metrics in data.items():
+            lines.append(f'{name}{{view="{view}"}} {_number(metrics.get(metric, 0))}')
+
+    family('awards_requests_total', 'counter', 'Requests handled, by URL name.', 'requests')
+    family('awards_db_queries_total', 'counter', 'SQL queries executed, by URL name.', 'queries')
+    family('awards_db_duration_seconds_total', 'counter', 'Time spent in the database, by URL name.', 'db_seconds')
+    family('awards_response_bytes_total', 'counter', 'Response body bytes sent, by URL name.', 'bytes')
+
+    name = 'awards_request_duration_seconds'
+    lines.append(f"# HELP {name} Request latency, by URL name.")
+    lines.append(f"# TYPE {name} histogram")
+    for view, metrics in data.items():
+        for bound in LATENCY_BUCKETS:
+            lines.append(f'{name}_bucket{{view="{view}",le="{bound}"}} {_number(metrics.get(f"le:{bound}", 0))}')
+        lines.append(f'{name}_bucket{{view="{view}",le="+Inf"}} {_number(metrics.get("requests", 0))}')
+        lines.append(f'{name}_sum{{view="{view}"}} {_number(metrics.get("seconds", 0))}')
+        lines.append(f'{name}_count{{view="{view}"}} {_number(metrics.get("requests", 0))}')
+
+    return '\n'.join(lines) + '\n'
+
+
+# =========================
+# Middleware
+# =========================
+class RequestMetricsMiddleware:
+    """
+    Для каждого запроса: время ответа, число SQL-запросов, время в БД и размер ответа
+    по имени URL. Добавляет заголовок Server-Timing.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        started = time.perf_counter()
+        with timer.wrap_connections():
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        view = (match.url_name or match.view_name) if match else 'unresolved'
+
+        if response.streaming:
+            response_bytes = int(response.get('Content-Length') or 0)
+        else:
+            response_bytes = len(response.content)
+
+        response['Server-Timing'] = (
+            f'db;dur={timer.seconds * 1000:.1f};desc="{timer.queries} queries", '
+            f'app;dur={elapsed * 1000:.1f}'
+        )
+        record(view, elapsed, timer.queries, timer.seconds, response_bytes)
+        return response
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.8 on 2026-10-17 17:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_tallies(apps, schema_editor):
+    """Заполняем счётчики по уже поданным голосам."""
+    Category = apps.get_model('awards', 'Category')
+    Nominee = apps.get_model('awards', 'Nominee')
+    NomineeTally = apps.get_model('awards', 'NomineeTally')
+    CategoryTally = apps.get_model('awards', 'CategoryTally')
+
+    rows = Nominee.objects.annotate(
+        jury_votes=Count('vote', filter=Q(vote__jury=True)),
+        user_votes=Count('vote', filter=Q(vote__jury=False)),
+    ).values('id', 'category_id', 'jury_votes', 'user_votes')
+
+    totals = {category_id: [0, 0] for category_id in Category.objects.values_list('id', flat=True)}
+    tallies = []
+    for row in rows:
+        tallies.append(NomineeTally(
+            nominee_id=row['id'], category_id=row['category_id'],
+            jury_votes=row['jury_votes'], user_votes=row['user_votes'],
+        ))
+        totals[row['category_id']][0] += row['jury_votes']
+        totals[row['category_id']][1] += row['user_votes']
+
+    NomineeTally.objects.bulk_create(tallies)
+    CategoryTally.objects.bulk_create([
+        CategoryTally(category_id=category_id, jury_votes=jury_votes, user_votes=user_votes)
+        for category_id, (jury_votes, user_votes) in totals.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awards', '0004_awardconfig_description_awardconfig_name_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryTally',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='tally', serialize=False, to='awards.category')),
+                ('jury_votes', models.PositiveIntegerField(default=0)),
+                ('user_votes', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='awardconfig',
+            name='current_stage',
+            field=models.CharField(choices=[('suggest_cat', 'Предложение номинаций'), ('finished', 'Проверка администрацией'), ('suggest_nominee', 'Предложение номинантов'), ('voting', 'Итоговое голосование'), ('results', 'Публикация результатов после награждения')], default='suggest_cat', max_length=30),
+        ),
+        migrations.CreateModel(
+            name='NomineeTally',
+            fields=[
+                ('nominee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='tally', serialize=False, to='awards.nominee')),
+                ('jury_votes', models.PositiveIntegerField(default=0)),
+                ('user_votes', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nominee_tallies', to='awards.category')),
+            ],
+        ),
+        migrations.RunPython(fill_tallies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+
+
+def fill_vote_category(apps, schema_editor):
+    """
+    Переносим категорию номинанта в голос. Если у пользователя оказалось
+    несколько голосов в одной категории, оставляем последний и пересчитываем счётчики.
+    """
+    Category = apps.get_model('awards', 'Category')
+    Nominee = apps.get_model('awards', 'Nominee')
+    Vote = apps.get_model('awards', 'Vote')
+    NomineeTally = apps.get_model('awards', 'NomineeTally')
+    CategoryTally = apps.get_model('awards', 'CategoryTally')
+
+    Vote.objects.update(
+        category_id=Subquery(Nominee.objects.filter(id=OuterRef('nominee_id')).values('category_id')[:1])
+    )
+
+    latest_ids = (
+        Vote.objects.values('user_id', 'category_id')
+        .annotate(latest_id=Max('id'), votes=Count('id'))
+        .filter(votes__gt=1)
+        .values_list('user_id', 'category_id', 'latest_id')
+    )
+    deleted = 0
+    for user_id, category_id, latest_id in latest_ids:
+        deleted += Vote.objects.filter(user_id=user_id, category_id=category_id).exclude(id=latest_id).delete()[0]
+    if not deleted:
+        return
+
+    rows = Nominee.objects.annotate(
+        jury_votes=Count('vote', filter=Q(vote__jury=True)),
+        user_votes=Count('vote', filter=Q(vote__jury=False)),
+    ).values('id', 'category_id', 'jury_votes', 'user_votes')
+
+    totals = {category_id: [0, 0] for category_id in Category.objects.values_list('id', flat=True)}
+    tallies = []
+    for row in rows:
+        tallies.append(NomineeTally(
+            nominee_id=row['id'], category_id=row['category_id'],
+            jury_votes=row['jury_votes'], user_votes=row['user_votes'],
+        ))
+        totals[row['category_id']][0] += row['jury_votes']
+        totals[row['category_id']][1] += row['user_votes']
+
+    NomineeTally.objects.all().delete()
+    CategoryTally.objects.all().delete()
+    NomineeTally.objects.bulk_create(tallies)
+    CategoryTally.objects.bulk_create([
+        CategoryTally(category_id=category_id, jury_votes=jury_votes, user_votes=user_votes)
+        for category_id, (jury_votes, user_votes) in totals.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awards', '0006_queuedvote'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='category',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='awards.category'),
+        ),
+        migrations.RunPython(fill_vote_category, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='vote',
+            name='category',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='awards.category'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='vote',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.UniqueConstraint(fields=('user', 'category'), name='unique_vote_per_category'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awards', '0007_vote_category'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('jury_weight', models.FloatField()),
+                ('user_weight', models.FloatField()),
+                ('snapshot', models.JSONField(default=list)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Подсчёт результатов',
+                'verbose_name_plural': 'Подсчёты результатов',
+                'ordering': ['-number'],
+            },
+        ),
+        migrations.AddField(
+            model_name='finalresult',
+            name='run',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='awards.resultrun'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awards', '0008_resultrun'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(condition=models.Q(('is_main', True)), fields=['id'], name='category_main_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(condition=models.Q(('is_main', False)), fields=['id'], name='category_extra_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='finalresult',
+            index=models.Index(fields=['category', '-total_score'], name='finalresult_cat_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='suggestednominee',
+            index=models.Index(fields=['category', 'user'], name='suggestednominee_cat_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['nominee', 'jury'], name='vote_nominee_jury_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:10
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Копия awards.models.normalize_name на момент миграции: миграция не должна
+# зависеть от текущего кода модели
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_name(name):
+    words = _NON_WORD.sub(' ', name.casefold().replace('ё', 'е')).split()
+    return ' '.join(sorted(set(words)))[:200]
+
+
+def fill_name_keys(apps, schema_editor):
+    """Ключи для уже поданных предложений."""
+    for model_name in ('SuggestedCategory', 'SuggestedNominee'):
+        model = apps.get_model('awards', model_name)
+        batch = []
+        for suggestion in model.objects.only('id', 'name').iterator(chunk_size=1000):
+            suggestion.name_key = normalize_name(suggestion.name)
+            batch.append(suggestion)
+            if len(batch) >= 1000:
+                model.objects.bulk_update(batch, ['name_key'])
+                batch = []
+        model.objects.bulk_update(batch, ['name_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awards', '0009_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='suggestedcategory',
+            name='name_key',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='suggestednominee',
+            name='name_key',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(fill_name_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='suggestedcategory',
+            index=models.Index(fields=['name_key'], name='suggestedcategory_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='suggestednominee',
+            index=models.Index(fields=['category', 'name_key'], name='suggestednominee_key_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awards', '0010_suggestion_name_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='nomineetally',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='nomineetally',
+            index=models.Index(fields=['version'], name='nomineetally_version_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awards', '0011_nomineetally_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='awardconfig',
+            name='jury_weight',
+            field=models.FloatField(default=0.3, verbose_name='Вес голосов жюри'),
+        ),
+        migrations.AddField(
+            model_name='awardconfig',
+            name='normalization',
+            field=models.CharField(choices=[('share', 'Доля от всех голосов категории'), ('leader', 'Относительно лидера категории')], default='share', max_length=20, verbose_name='Нормировка голосов'),
+        ),
+        migrations.AddField(
+            model_name='awardconfig',
+            name='user_weight',
+            field=models.FloatField(default=0.7, verbose_name='Вес голосов пользователей'),
+        ),
+        migrations.AddField(
+            model_name='resultrun',
+            name='normalization',
+            field=models.CharField(default='share', max_length=20),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awards', '0012_award_scoring'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='voting_mode',
+            field=models.CharField(choices=[('plurality', 'Один выбор'), ('irv', 'Ранжирование: мгновенный второй тур (IRV)'), ('schulze', 'Ранжирование: метод Шульце')], default='plurality', max_length=20, verbose_name='Способ голосования'),
+        ),
+        migrations.CreateModel(
+            name='RankedBallot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ranking', models.JSONField(default=list)),
+                ('jury', models.BooleanField(default=False)),
+                ('created', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='awards.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Ранжированный бюллетень',
+                'verbose_name_plural': 'Ранжированные бюллетени',
+                'constraints': [models.UniqueConstraint(fields=('user', 'category'), name='unique_ranked_ballot_per_category')],
+            },
+        ),
+    ]
@@ -1,3 +1,4 @@
+import re
 import uuid
 from datetime import timedelta
 
@@ -5,6 +6,7 @@ from django.utils import timezone
 from django.db import models
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -47,9 +49,23 @@ class AwardConfig(models.Model):
     ]
     current_stage = models.CharField(max_length=30, choices=STAGE_CHOICES, default='suggest_cat')
 
+    # Подсчёт: итоговый счёт = jury_weight × (голоса жюри) + user_weight × (голоса пользователей),
+    # голоса нормированы внутри категории
+    NORMALIZATION_CHOICES = [
+        ('share', 'Доля от всех голосов категории'),
+        ('leader', 'Относительно лидера категории'),
+    ]
+    jury_weight = models.FloatField("Вес голосов жюри", default=0.3)
+    user_weight = models.FloatField("Вес голосов пользователей", default=0.7)
+    normalization = models.CharField("Нормировка голосов", max_length=20, choices=NORMALIZATION_CHOICES, default='share')
+
     def __str__(self):
         return f"{self.name} ({self.get_current_stage_display()})"
 
+    def clean(self):
+        if self.jury_weight < 0 or self.user_weight < 0:
+            raise ValidationError("Веса не могут быть отрицательными")
+
     def get_current_stage_display(self):
         return dict(self.STAGE_CHOICES).get(self.current_stage, 'Неизвестно')
 
@@ -62,19 +78,64 @@ class Category(models.Model):
     description = models.TextField("Описание", blank=True)
     is_main = models.BooleanField(default=True)  # True = основная, False = дополнительная
 
+    VOTING_MODE_CHOICES = [
+        ('plurality', 'Один выбор'),
+        ('irv', 'Ранжирование: мгновенный второй тур (IRV)'),
+        ('schulze', 'Ранжирование: метод Шульце'),
+    ]
+    voting_mode = models.CharField("Способ голосования", max_length=20, choices=VOTING_MODE_CHOICES, default='plurality')
+
     def __str__(self):
         return self.name
 
+    @property
+    def is_ranked(self):
+        return self.voting_mode != 'plurality'
+
     class Meta:
         verbose_name = "Категория"
         verbose_name_plural = "Категории"
+        indexes = [
+            # Основные / дополнительные категории на главной и в списке. Django сравнивает
+            # булево поле без «= 1» (WHERE is_main / WHERE NOT is_main), поэтому обычный
+            # индекс по is_main SQLite не использует — нужны частичные с тем же условием
+            models.Index(fields=['id'], condition=models.Q(is_main=True), name='category_main_idx'),
+            models.Index(fields=['id'], condition=models.Q(is_main=False), name='category_extra_idx'),
+        ]
+
+
+# =========================
+# Нормализованный ключ названия для поиска дублей
+# =========================
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_name(name):
+    """
+    Ключ для сравнения предложений: регистр, ё/е, пунктуация и порядок слов не важны.
+    «Лучший мем года!» и «мем года, лучший» → «года лучший мем».
+    """
+    words = _NON_WORD.sub(' ', name.casefold().replace('ё', 'е')).split()
+    return ' '.join(sorted(set(words)))[:200]
+
+
+class NameKeyMixin:
+    """Пересчитывает name_key при каждом сохранении (в том числе с update_fields=['name'])."""
+
+    def save(self, *args, **kwargs):
+        self.name_key = normalize_name(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'name_key'}
+        super().save(*args, **kwargs)
 
 
 # =========================
 # Предложенные категории пользователями
 # =========================
-class SuggestedCategory(models.Model):
+class SuggestedCategory(NameKeyMixin, models.Model):
     name = models.CharField("Название номинации", max_length=200)
+    name_key = models.CharField(max_length=200, blank=True, editable=False)
     description = models.TextField("Описание", blank=True)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     approved = models.BooleanField(default=False)
@@ -86,6 +147,9 @@ class SuggestedCategory(models.Model):
     class Meta:
         verbose_name = "Предложенная номинация"
         verbose_name_plural = "Предложенные номинации"
+        indexes = [
+            models.Index(fields=['name_key'], name='suggestedcategory_key_idx'),
+        ]
 
 
 # =========================
@@ -107,9 +171,10 @@ class Nominee(models.Model):
 # =========================
 # Предложенные номинанты пользователями
 # =========================
-class SuggestedNominee(models.Model):
+class SuggestedNominee(NameKeyMixin, models.Model):
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
     name = models.CharField("Имя номинанта", max_length=200)
+    name_key = models.CharField(max_length=200, blank=True, editable=False)
     description = models.TextField("Описание", blank=True)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     approved = models.BooleanField(default=False)
@@ -121,6 +186,12 @@ class SuggestedNominee(models.Model):
     class Meta:
         verbose_name = "Предложенный номинант"
         verbose_name_plural = "Предложенные номинанты"
+        indexes = [
+            # Проверка «уже предлагал в этой категории»
+            models.Index(fields=['category', 'user'], name='suggestednominee_cat_user_idx'),
+            # Группировка дублей внутри категории
+            models.Index(fields=['category', 'name_key'], name='suggestednominee_key_idx'),
+        ]
 
 
 # =========================
@@ -128,6 +199,8 @@ class SuggestedNominee(models.Model):
 # =========================
 class Vote(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Категория номинанта, продублирована ради уникальности (user, category) и поиска без JOIN
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
     nominee = models.ForeignKey(Nominee, on_delete=models.CASCADE)
     jury = models.BooleanField(default=False)
     created = models.DateTimeField(auto_now_add=True)
@@ -135,18 +208,129 @@ class Vote(models.Model):
     def __str__(self):
         return f"Голос: {self.user.username} → {self.nominee.name} ({'Жюри' if self.jury else 'Пользователь'})"
 
+    def clean(self):
+        # Категория всегда берётся у номинанта; один голос на категорию проверяем уже по ней
+        if self.nominee_id is None or self.user_id is None:
+            return
+        self.category_id = self.nominee.category_id
+        if Vote.objects.filter(user_id=self.user_id, category_id=self.category_id).exclude(pk=self.pk).exists():
+            raise ValidationError("У этого пользователя уже есть голос в категории номинанта")
+
+    def save(self, *args, **kwargs):
+        # Представления пишут голоса через bulk_create с уже верной категорией;
+        # любое другое сохранение (админка, shell) не может разойтись с номинантом
+        self.category_id = self.nominee.category_id
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Голос"
         verbose_name_plural = "Голоса"
-        unique_together = ('user', 'nominee')
+        constraints = [
+            # Один голос пользователя в категории; покрывает и прежнее (user, nominee)
+            models.UniqueConstraint(fields=['user', 'category'], name='unique_vote_per_category'),
+        ]
+        indexes = [
+            # Подсчёт голосов номинанта отдельно для жюри и пользователей
+            models.Index(fields=['nominee', 'jury'], name='vote_nominee_jury_idx'),
+        ]
+
+
+# =========================
+# Ранжированные бюллетени (категории с voting_mode irv / schulze)
+# =========================
+class RankedBallot(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    # id номинантов от первого места к последнему; неранжированные не указываются
+    ranking = models.JSONField(default=list)
+    jury = models.BooleanField(default=False)
+    created = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Бюллетень: {self.user_id} → {self.ranking}"
+
+    class Meta:
+        verbose_name = "Ранжированный бюллетень"
+        verbose_name_plural = "Ранжированные бюллетени"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category'], name='unique_ranked_ballot_per_category'),
+        ]
+
+
+# =========================
+# Очередь голосов (режим отложенной записи)
+# =========================
+class QueuedVote(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    nominee = models.ForeignKey(Nominee, on_delete=models.CASCADE)
+    jury = models.BooleanField(default=False)
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"В очереди: {self.user_id} → {self.nominee_id}"
+
+    class Meta:
+        verbose_name = "Голос в очереди"
+        verbose_name_plural = "Голоса в очереди"
+
+
+# =========================
+# Счётчики голосов (денормализованные)
+# =========================
+class NomineeTally(models.Model):
+    nominee = models.OneToOneField(Nominee, on_delete=models.CASCADE, primary_key=True, related_name='tally')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='nominee_tallies')
+    jury_votes = models.PositiveIntegerField(default=0)
+    user_votes = models.PositiveIntegerField(default=0)
+    # Номер изменения: растёт с каждым коммитом голосов, для ленты «что изменилось с версии N»
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.nominee_id}: жюри {self.jury_votes}, пользователи {self.user_votes}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['version'], name='nomineetally_version_idx'),
+        ]
+
+
+class CategoryTally(models.Model):
+    category = models.OneToOneField(Category, on_delete=models.CASCADE, primary_key=True, related_name='tally')
+    jury_votes = models.PositiveIntegerField(default=0)
+    user_votes = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.category_id}: жюри {self.jury_votes}, пользователи {self.user_votes}"
 
 
 # =========================
 # Итоговые результаты
 # =========================
+class ResultRun(models.Model):
+    """Одно сохранение результатов. snapshot хранит все строки запуска для сравнения запусков."""
+    number = models.PositiveIntegerField(unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    jury_weight = models.FloatField()
+    user_weight = models.FloatField()
+    normalization = models.CharField(max_length=20, default='share')
+    # [[category_id, nominee_id, jury_votes, user_votes, total_score], ...]
+    snapshot = models.JSONField(default=list)
+
+    def __str__(self):
+        return f"Подсчёт №{self.number} от {self.created_at:%d.%m.%Y %H:%M}"
+
+    class Meta:
+        verbose_name = "Подсчёт результатов"
+        verbose_name_plural = "Подсчёты результатов"
+        ordering = ['-number']
+
+
 class FinalResult(models.Model):
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
     nominee = models.ForeignKey(Nominee, on_delete=models.CASCADE)
+    run = models.ForeignKey(ResultRun, on_delete=models.SET_NULL, null=True, blank=True)
     jury_votes = models.PositiveIntegerField(default=0)
     user_votes = models.PositiveIntegerField(default=0)
     total_score = models.FloatField(default=0.0)
@@ -154,13 +338,17 @@ class FinalResult(models.Model):
 
     class Meta:
         unique_together = ('category', 'nominee')
+        indexes = [
+            # Победитель категории: лучший результат без сортировки всей категории
+            models.Index(fields=['category', '-total_score'], name='finalresult_cat_score_idx'),
+        ]
 
 
 # =========================
 # Одноразовые токены для жюри
 # =========================
 def default_expire():
-    return timezone.now() + timedelta(days=1)
+    return timezone.now() + timedelta(hours=settings.JURY_TOKEN_TTL_HOURS)
 
 
 class JuryToken(models.Model):
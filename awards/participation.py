@@ -0,0 +1,52 @@
+from .models import RankedBallot, SuggestedNominee, Vote
+
+
+PARTICIPATION_SESSION_KEY = '_awards_participation'
+
+
+# =========================
+# Где пользователь уже голосовал и предлагал номинантов
+# =========================
+def get_participation(request):
+    """
+    {'voted': [category_id, ...], 'suggested': [category_id, ...]} для вошедшего пользователя,
+    None — для анонима. Считается двумя запросами один раз и дальше живёт в сессии;
+    голосование и предложение номинанта обновляют сессию сами (mark_voted / mark_suggested).
+    """
+    identity = getattr(request, 'identity', None)
+    if not identity:
+        return None
+
+    data = request.session.get(PARTICIPATION_SESSION_KEY)
+    if data is None or data.get('user') != identity.id:
+        data = {
+            'user': identity.id,
+            # Обычные голоса и ранжированные бюллетени — одним UNION
+            'voted': sorted(
+                Vote.objects.filter(user_id=identity.id).values_list('category_id', flat=True)
+                .union(RankedBallot.objects.filter(user_id=identity.id).values_list('category_id', flat=True))
+            ),
+            'suggested': sorted(set(
+                SuggestedNominee.objects.filter(user_id=identity.id).values_list('category_id', flat=True)
+            )),
+        }
+        request.session[PARTICIPATION_SESSION_KEY] = data
+    return data
+
+
+def _mark(request, kind, category_ids):
+    data = request.session.get(PARTICIPATION_SESSION_KEY)
+    if data is None:
+        # Ещё не считали — посчитаем при первом показе, уже с новым голосом
+        return
+    data[kind] = sorted(set(data[kind]) | set(category_ids))
+    # Новое значение по ключу — иначе сессия не заметит изменения внутри словаря
+    request.session[PARTICIPATION_SESSION_KEY] = data
+
+
+def mark_voted(request, category_ids):
+    _mark(request, 'voted', category_ids)
+
+
+def mark_suggested(request, category_id):
+    _mark(request, 'suggested', [category_id])
@@ -0,0 +1,201 @@
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from .models import RankedBallot
+
+
+# =========================
+# Компактное представление бюллетеней
+# =========================
+def encode_ballots(ballots, candidates):
+    """
+    ballots — пары (ranking, weight): ranking — id номинантов от первого места,
+    weight — вес бюллетеня. candidates — id номинантов категории.
+    Одинаковые бюллетени складываются в один с суммарным весом, номинанты заменяются
+    индексами 0..n-1. Возвращает (матрица U × n с -1 в пустых местах, веса U).
+    """
+    index = {candidate: i for i, candidate in enumerate(candidates)}
+    buckets = Counter()
+    for ranking, weight in ballots:
+        encoded, seen = [], set()
+        for candidate in ranking:
+            i = index.get(candidate)
+            # Номинант удалён или указан дважды — пропускаем, остальной порядок сохраняем
+            if i is not None and i not in seen:
+                encoded.append(i)
+                seen.add(i)
+        if encoded:
+            buckets[tuple(encoded)] += weight
+
+    matrix = np.full((len(buckets), len(candidates)), -1, dtype=np.int32)
+    for row, encoded in enumerate(buckets):
+        matrix[row, :len(encoded)] = encoded
+    return matrix, np.fromiter(buckets.values(), dtype=float, count=len(buckets))
+
+
+# =========================
+# Мгновенный второй тур (IRV)
+# =========================
+def instant_runoff(matrix, weights, n):
+    """
+    Раунды IRV по сгруппированным бюллетеням: в каждом раунде голос бюллетеня уходит
+    первому ещё не выбывшему номинанту; номинант с наименьшим числом голосов выбывает
+    (при равенстве — с меньшим числом голосов в прошлом раунде, затем с большим индексом).
+    Возвращает (порядок мест — индексы от победителя, раунды — массивы голосов).
+    """
+    eliminated = np.zeros(n, dtype=bool)
+    ranked = matrix >= 0
+    rows = np.arange(len(matrix))
+    out = []
+    rounds = []
+    previous = np.zeros(n)
+
+    while (~eliminated).sum() > 1:
+        # Первый в бюллетене номинант, который ещё участвует
+        active = ranked & ~eliminated[np.where(ranked, matrix, 0)]
+        has_vote = active.any(axis=1)
+        first = matrix[rows, active.argmax(axis=1)]
+        tally = np.bincount(first[has_vote], weights=weights[has_vote], minlength=n)
+        if not tally.any():
+            break
+        rounds.append(tally)
+
+        remaining = np.flatnonzero(~eliminated)
+        leader = remaining[np.argmax(tally[remaining])]
+        if tally[leader] * 2 > tally[remaining].sum():
+            break
+
+        loser = min(remaining, key=lambda i: (tally[i], previous[i], -i))
+        eliminated[loser] = True
+        out.append(int(loser))
+        previous = tally
+
+    # Оставшиеся — по голосам последнего раунда, выбывшие — в обратном порядке выбывания
+    last = rounds[-1] if rounds else np.zeros(n)
+    remaining = sorted(np.flatnonzero(~eliminated).tolist(), key=lambda i: (-last[i], i))
+    return [*remaining, *reversed(out)], rounds
+
+
+# =========================
+# Метод Шульце
+# =========================
+def pairwise_preferences(matrix, weights, n, chunk=4096):
+    """
+    d[i, j] — суммарный вес бюллетеней, где i стоит выше j. Неранжированные номинанты
+    считаются ниже всех ранжированных и равными между собой. Считается порциями по chunk
+    бюллетеней, чтобы массив U × n × n не разрастался.
+    """
+    d = np.zeros((n, n))
+    for start in range(0, len(matrix), chunk):
+        block = matrix[start:start + chunk]
+        # Место каждого номинанта в бюллетене; неранжированным — n
+        positions = np.full((len(block), n), n, dtype=np.int32)
+        rows, places = np.nonzero(block >= 0)
+        positions[rows, block[rows, places]] = places
+        prefers = positions[:, :, None] < positions[:, None, :]
+        d += np.einsum('u,uij->ij', weights[start:start + chunk], prefers)
+    return d
+
+
+def schulze(matrix, weights, n):
+    """
+    Сильнейшие пути по попарной матрице (Флойд — Уоршелл, векторизованный по k).
+    Возвращает (порядок мест — индексы от победителя, матрица сильнейших путей).
+    """
+    d = pairwise_preferences(matrix, weights, n)
+    p = np.where(d > d.T, d, 0.0)
+    np.fill_diagonal(p, 0.0)
+    for k in range(n):
+        p = np.maximum(p, np.minimum(p[:, k:k + 1], p[k:k + 1, :]))
+        np.fill_diagonal(p, 0.0)
+
+    wins = (p > p.T).sum(axis=1)
+    order = sorted(range(n), key=lambda i: (-wins[i], i))
+    return order, p
+
+
+# =========================
+# Подсчёт ранжированных категорий
+# =========================
+def ballot_weights(ballots, scoring):
+    """
+    Вес бюллетеня: все бюллетени жюри вместе весят jury_weight, пользователей — user_weight,
+    как и в обычном подсчёте. Если одной из групп нет, вторая считается по числу бюллетеней.
+    """
+    jury_count = sum(1 for _, jury in ballots if jury)
+    user_count = len(ballots) - jury_count
+    if not jury_count or not user_count:
+        return [1.0] * len(ballots)
+    return [
+        scoring.jury_weight / jury_count if jury else scoring.user_weight / user_count
+        for _, jury in ballots
+    ]
+
+
+def first_preferences(rankings, candidates):
+    """Число первых мест у каждого номинанта (для колонок jury_votes / user_votes)."""
+    matrix, counts = encode_ballots(((ranking, 1) for ranking in rankings), candidates)
+    if not len(matrix):
+        return np.zeros(len(candidates))
+    return np.bincount(matrix[:, 0], weights=counts, minlength=len(candidates))
+
+
+def ranked_results(categories, nominees_by_category, scoring):
+    """
+    Результаты категорий с ранжированием: {category_id: {'method', 'results', 'rounds'}}.
+    Бюллетени всех таких категорий читаются одним запросом.
+    results — как в compute_results: jury_votes / user_votes — первые места,
+    total_score — 1 у победителя и меньше по местам, чтобы победителем считался первый.
+    """
+    categories = [category for category in categories if category.is_ranked]
+    if not categories:
+        return {}
+
+    ballots = defaultdict(list)
+    for category_id, ranking, jury in (
+        RankedBallot.objects
+        .filter(category__in=categories)
+        .values_list('category_id', 'ranking', 'jury')
+        .iterator(chunk_size=5000)
+    ):
+        ballots[category_id].append((ranking, jury))
+
+    tallied = {}
+    for category in categories:
+        nominees = nominees_by_category.get(category.id, [])
+        candidates = [nominee.id for nominee in nominees]
+        n = len(nominees)
+        category_ballots = ballots.get(category.id, [])
+        weights = ballot_weights(category_ballots, scoring)
+        matrix, bucket_weights = encode_ballots(
+            ((ranking, weight) for (ranking, _), weight in zip(category_ballots, weights)), candidates,
+        )
+        first_jury = first_preferences((ranking for ranking, jury in category_ballots if jury), candidates)
+        first_user = first_preferences((ranking for ranking, jury in category_ballots if not jury), candidates)
+
+        rounds = []
+        if not n:
+            order = []
+        elif category.voting_mode == 'irv':
+            order, rounds = instant_runoff(matrix, bucket_weights, n)
+        else:
+            order, _ = schulze(matrix, bucket_weights, n)
+
+        tallied[category.id] = {
+            'method': category.get_voting_mode_display(),
+            'rounds': [
+                [(nominees[i].name, round(float(votes), 4)) for i, votes in enumerate(tally) if votes]
+                for tally in rounds
+            ],
+            'results': [
+                {
+                    'nominee': nominees[i],
+                    'jury_votes': int(first_jury[i]),
+                    'user_votes': int(first_user[i]),
+                    'total_score': 1 - place / n,
+                }
+                for place, i in enumerate(order)
+            ],
+        }
+    return tallied
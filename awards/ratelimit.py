@@ -0,0 +1,120 @@
+import hashlib
+import logging
+import math
+import random
+import sqlite3
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from . import localdb
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    allowed INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS buckets_updated ON buckets (updated);
+"""
+
+# Одним выражением: пополнить ведро за прошедшее время (не выше burst), взять жетон, если он есть.
+# В UPDATE SQLite все выражения SET считаются от старых значений строки.
+TAKE_TOKEN = """
+INSERT INTO buckets (key, tokens, updated, allowed) VALUES (:key, :burst - 1, :now, 1)
+ON CONFLICT (key) DO UPDATE SET
+    allowed = MIN(:burst, tokens + (:now - updated) * :rate) >= 1,
+    tokens = MIN(:burst, tokens + (:now - updated) * :rate)
+             - (MIN(:burst, tokens + (:now - updated) * :rate) >= 1),
+    updated = :now
+RETURNING allowed, tokens
+"""
+
+# Ведро, которое не трогали дольше этого, заведомо полное — строку можно удалить
+STALE_AFTER = 24 * 3600
+
+
+# =========================
+# Ограничение частоты запросов (token bucket)
+# =========================
+def client_ip(request):
+    header = settings.RATE_LIMIT_IP_HEADER
+    if header and request.META.get(header):
+        # Последний адрес в цепочке добавил наш прокси — ему и верим
+        return request.META[header].split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def take_token(key, tokens, seconds):
+    """
+    Берёт жетон из ведра key ёмкостью tokens, которое пополняется на tokens за seconds.
+    Возвращает None, если жетон взят, иначе — через сколько секунд он появится.
+    Состояние общее для всех воркеров (SQLite в LOCAL_STATE_DIR).
+    """
+    rate = tokens / seconds
+    try:
+        conn = localdb.connect('ratelimit', SCHEMA)
+        allowed, left = conn.execute(
+            TAKE_TOKEN, {'key': key, 'burst': tokens, 'rate': rate, 'now': time.time()},
+        ).fetchone()
+        if random.random() < 0.001:
+            conn.execute("DELETE FROM buckets WHERE updated < ?", (time.time() - STALE_AFTER,))
+    except sqlite3.Error as e:
+        # Ограничитель не должен ронять сайт: при сбое хранилища пропускаем запрос
+        logger.warning(f"Rate limit: store unavailable: {e}")
+        return None
+    return None if allowed else (1 - left) / rate
+
+
+def session_fingerprint(request):
+    """
+    Ключ второго ведра — хэш cookie сессии, без загрузки сессии из базы.
+    Лимит действует на сессию, а не на учётную запись: у пользователя, вошедшего
+    с нескольких устройств, ведро на каждом своё. Новые сессии (повторный вход,
+    подделанная cookie) упираются в лимит по IP, который проверяется первым.
+    """
+    session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not session_key:
+        return None
+    return hashlib.sha256(session_key.encode()).hexdigest()[:32]
+
+
+def _retry_after(request, endpoint, limits):
+    # Сначала IP, затем сессия по cookie — ни то, ни другое не обращается к базе приложения
+    if 'ip' in limits:
+        retry_after = take_token(f"{endpoint}:ip:{client_ip(request)}", *limits['ip'])
+        if retry_after is not None:
+            return retry_after
+    if 'session' in limits:
+        fingerprint = session_fingerprint(request)
+        if fingerprint is not None:
+            return take_token(f"{endpoint}:session:{fingerprint}", *limits['session'])
+    return None
+
+
+def rate_limit(endpoint, methods=('POST',)):
+    """
+    Декоратор: лимиты RATE_LIMITS[endpoint] = {'ip': (жетонов, за секунд), 'session': (...)}.
+    Ставится поверх login_required — отказ (429) отдаётся до загрузки сессии и пользователя,
+    без единого запроса к базе приложения.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            limits = settings.RATE_LIMITS.get(endpoint)
+            if settings.RATE_LIMIT_ENABLED and limits and request.method in methods:
+                retry_after = _retry_after(request, endpoint, limits)
+                if retry_after is not None:
+                    logger.info(f"Rate limit: {endpoint} rejected for {client_ip(request)}")
+                    response = HttpResponse("Слишком много запросов. Попробуйте чуть позже.", status=429)
+                    response['Retry-After'] = str(math.ceil(retry_after))
+                    return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,105 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+
+from .caching import bump_content_version
+from .models import FinalResult, ResultRun
+from .scoring import award_scoring
+
+
+# Сколько раз пробовать сохранить запуск, если его номер занял параллельный подсчёт
+SAVE_ATTEMPTS = 3
+
+
+# =========================
+# Сохранение результатов подсчёта
+# =========================
+def save_results(results_data, user=None, scoring=None):
+    """
+    Сохраняет результаты одним запуском: новая запись ResultRun со снимком всех строк,
+    одно INSERT ... ON CONFLICT (category, nominee) DO UPDATE по FinalResult
+    и удаление строк номинантов, которых больше нет в подсчёте.
+    scoring — параметры, с которыми посчитаны results_data (по умолчанию из AwardConfig).
+    """
+    scoring = scoring or award_scoring()
+    snapshot = [
+        [cat_data['category'].id, r['nominee'].id, r['jury_votes'], r['user_votes'], r['total_score']]
+        for cat_data in results_data
+        for r in cat_data['results']
+    ]
+
+    for attempt in range(SAVE_ATTEMPTS):
+        try:
+            return _save_run(snapshot, user, scoring)
+        except IntegrityError:
+            # Номер запуска занял параллельный подсчёт — берём следующий
+            if attempt == SAVE_ATTEMPTS - 1:
+                raise
+
+
+def _save_run(snapshot, user, scoring):
+    with transaction.atomic():
+        # В профиле production транзакция IMMEDIATE: MAX(number) читается уже под блокировкой
+        # писателя. В остальных профилях совпавший номер отклонит уникальный индекс — повтор в save_results
+        number = (ResultRun.objects.aggregate(last=Max('number'))['last'] or 0) + 1
+        run = ResultRun.objects.create(
+            number=number,
+            created_by=user,
+            jury_weight=scoring.jury_weight,
+            user_weight=scoring.user_weight,
+            normalization=scoring.normalization,
+            snapshot=snapshot,
+        )
+
+        FinalResult.objects.bulk_create(
+            [
+                FinalResult(
+                    category_id=category_id,
+                    nominee_id=nominee_id,
+                    jury_votes=jury_votes,
+                    user_votes=user_votes,
+                    total_score=total_score,
+                    run=run,
+                )
+                for category_id, nominee_id, jury_votes, user_votes, total_score in snapshot
+            ],
+            update_conflicts=True,
+            unique_fields=['category', 'nominee'],
+            update_fields=['jury_votes', 'user_votes', 'total_score', 'run'],
+        )
+        # Всё, что не попало в этот запуск, — номинанты, удалённые или перенесённые после прошлого
+        FinalResult.objects.exclude(run=run).delete()
+
+        # bulk_create не шлёт сигналы — сбрасываем кэш публичных страниц сами
+        transaction.on_commit(bump_content_version)
+
+    return run
+
+
+# =========================
+# Сравнение запусков
+# =========================
+def _ranked(snapshot):
+    """{(category_id, nominee_id): (место, jury_votes, user_votes, total_score)}"""
+    by_category = {}
+    for category_id, nominee_id, jury_votes, user_votes, total_score in snapshot:
+        by_category.setdefault(category_id, []).append((nominee_id, jury_votes, user_votes, total_score))
+
+    ranked = {}
+    for category_id, rows in by_category.items():
+        rows.sort(key=lambda row: row[3], reverse=True)
+        for place, (nominee_id, jury_votes, user_votes, total_score) in enumerate(rows, start=1):
+            ranked[(category_id, nominee_id)] = (place, jury_votes, user_votes, total_score)
+    return ranked
+
+
+def compare_runs(old_run, new_run):
+    """
+    Строки, которые отличаются между двумя запусками:
+    [{'category': id, 'nominee': id, 'old': (место, жюри, пользователи, счёт) или None, 'new': ...}, ...]
+    """
+    old, new = _ranked(old_run.snapshot), _ranked(new_run.snapshot)
+    changes = []
+    for key in sorted(set(old) | set(new)):
+        if old.get(key) != new.get(key):
+            changes.append({'category': key[0], 'nominee': key[1], 'old': old.get(key), 'new': new.get(key)})
+    return changes
@@ -0,0 +1,53 @@
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+
+_read_only = ContextVar('awards_read_only', default=False)
+
+
+# =========================
+# Соединение только для чтения для публичных страниц
+# =========================
+def read_only_view(view_func):
+    """Все чтения внутри представления идут через соединение только для чтения."""
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return view_func(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+    return wrapper
+
+
+def separate_readonly_database():
+    """
+    Есть ли отдельное соединение только для чтения. Под тестами алиас зеркалит default
+    (TEST.MIRROR) и получает тот же settings_dict — читать надо через default, внутри
+    транзакции теста; то же для базы в памяти, которую второе соединение не увидит.
+    """
+    alias = settings.READONLY_DATABASE
+    if alias not in settings.DATABASES:
+        return False
+    name = connections[alias].settings_dict['NAME']
+    return name != connections['default'].settings_dict['NAME'] and ':memory:' not in name and 'mode=memory' not in name
+
+
+class ReadOnlyRouter:
+    def db_for_read(self, model, **hints):
+        if _read_only.get() and separate_readonly_database():
+            return settings.READONLY_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Обе базы — один и тот же файл
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
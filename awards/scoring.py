@@ -0,0 +1,72 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .caching import get_award_config
+from .models import AwardConfig
+
+
+# Параметры подсчёта: веса и режим нормировки (см. AwardConfig)
+Scoring = namedtuple('Scoring', ['jury_weight', 'user_weight', 'normalization'])
+
+
+def award_scoring(award_config=None):
+    """Параметры подсчёта из конфигурации премии; без конфигурации — значения полей по умолчанию."""
+    award_config = award_config or get_award_config()
+    if award_config is None:
+        field = AwardConfig._meta.get_field
+        return Scoring(field('jury_weight').default, field('user_weight').default, field('normalization').default)
+    return Scoring(award_config.jury_weight, award_config.user_weight, award_config.normalization)
+
+
+# =========================
+# Матрица категория × номинант и счёт всех категорий сразу
+# =========================
+def vote_matrices(category_ids, jury_votes, user_votes):
+    """
+    Раскладывает построчные данные номинантов (упорядоченные по категории) в матрицы
+    категория × номинант, дополненные нулями до самой большой категории.
+    Возвращает (rows, cols, jury, user): rows/cols — место каждого номинанта в матрицах.
+    """
+    category_ids = np.asarray(category_ids)
+    _, rows, per_category = np.unique(category_ids, return_inverse=True, return_counts=True)
+    # Позиция внутри категории: номер строки минус начало её категории
+    starts = np.concatenate(([0], np.cumsum(per_category)[:-1]))
+    cols = np.arange(len(category_ids)) - starts[rows]
+
+    shape = (len(per_category), per_category.max() if len(per_category) else 0)
+    jury = np.zeros(shape)
+    user = np.zeros(shape)
+    jury[rows, cols] = jury_votes
+    user[rows, cols] = user_votes
+    return rows, cols, jury, user
+
+
+def normalize(matrix, mode):
+    """share — доля от суммы голосов категории, leader — доля от голосов лидера категории."""
+    if mode == 'leader':
+        denominator = matrix.max(axis=1, keepdims=True)
+    else:
+        denominator = matrix.sum(axis=1, keepdims=True)
+    # Категория без голосов даёт нули, а не деление на ноль
+    return np.divide(matrix, denominator, out=np.zeros_like(matrix), where=denominator > 0)
+
+
+def score_nominees(category_ids, jury_votes, user_votes, scoring):
+    """
+    Итоговый счёт каждого номинанта: массив в том же порядке, что и входные строки.
+    Строки должны идти по возрастанию category_id.
+    """
+    if not len(category_ids):
+        return np.zeros(0)
+    rows, cols, jury, user = vote_matrices(category_ids, jury_votes, user_votes)
+    scores = (
+        scoring.jury_weight * normalize(jury, scoring.normalization)
+        + scoring.user_weight * normalize(user, scoring.normalization)
+    )
+    return scores[rows, cols]
+
+
+def ranking_order(category_ids, scores):
+    """Индексы строк: по категориям, внутри категории — по убыванию счёта (при равенстве — по порядку строк)."""
+    return np.lexsort((np.arange(len(scores)), -scores, np.asarray(category_ids)))
@@ -0,0 +1,106 @@
+import math
+from collections import Counter, defaultdict
+from itertools import groupby
+
+from django.conf import settings
+
+from .models import Category, SuggestedCategory, SuggestedNominee
+
+
+# =========================
+# Кластеризация похожих предложений
+# =========================
+def _jaccard(a, b):
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+def cluster_keys(keys, threshold):
+    """
+    Группирует различные name_key по сходству Жаккара множеств слов (лидерная кластеризация):
+    ключи идут от коротких к длинным, каждый присоединяется к самому похожему лидеру
+    со сходством >= threshold, а если такого нет — сам становится лидером новой группы.
+    Все члены группы похожи на её лидера, поэтому группы не растягиваются цепочкой
+    через промежуточные ключи, как при склейке любых похожих пар.
+    Кандидаты в лидеры ищутся фильтрацией по префиксу: слова ключа упорядочены от редких
+    к частым, и у двух похожих ключей обязательно совпадает хотя бы одно слово из коротких
+    префиксов — по инвертированному индексу префиксов лидеров, без сравнения всех пар.
+    Возвращает список групп (списков ключей), лидер — первый в группе.
+    """
+    token_sets = [frozenset(key.split()) for key in keys]
+    frequency = Counter(token for tokens in token_sets for token in tokens)
+
+    # От коротких ключей к длинным: тогда уже проиндексированные лидеры не длиннее текущего
+    order = sorted(range(len(keys)), key=lambda i: len(token_sets[i]))
+    prefix_index = defaultdict(list)
+    groups = {}
+    for i in order:
+        tokens = token_sets[i]
+        size = len(tokens)
+        prefix = sorted(tokens, key=lambda token: (frequency[token], token))[:size - math.ceil(threshold * size) + 1]
+
+        best, best_similarity = None, threshold
+        checked = set()
+        for token in prefix:
+            for j in prefix_index[token]:
+                if j in checked:
+                    continue
+                checked.add(j)
+                # Слишком короткий кандидат не может набрать нужное сходство
+                if len(token_sets[j]) < threshold * size:
+                    continue
+                similarity = _jaccard(tokens, token_sets[j])
+                # При равном сходстве — лидер, появившийся раньше
+                if similarity > best_similarity or (similarity == best_similarity and (best is None or j < best)):
+                    best, best_similarity = j, similarity
+
+        if best is not None:
+            groups[best].append(keys[i])
+        else:
+            groups[i] = [keys[i]]
+            for token in prefix:
+                prefix_index[token].append(i)
+
+    return list(groups.values())
+
+
+def _clusters(rows, threshold, min_size):
+    """
+    rows — (id, name, name_key), упорядоченные по name_key (так их отдаёт индекс).
+    Сначала точные совпадения ключей, затем похожие ключи склеиваются cluster_keys.
+    """
+    by_key = {key: [(row[0], row[1]) for row in group] for key, group in groupby(rows, key=lambda row: row[2])}
+    clusters = []
+    for keys in cluster_keys(list(by_key), threshold):
+        suggestions = [suggestion for key in keys for suggestion in by_key[key]]
+        if len(suggestions) >= min_size:
+            clusters.append({
+                'size': len(suggestions),
+                'keys': sorted(keys),
+                'suggestions': sorted(suggestions),
+            })
+    clusters.sort(key=lambda cluster: (-cluster['size'], cluster['keys'][0]))
+    return clusters
+
+
+def category_clusters(threshold=None, min_size=2):
+    """Группы похожих предложенных номинаций."""
+    rows = SuggestedCategory.objects.order_by('name_key', 'id').values_list('id', 'name', 'name_key')
+    return _clusters(rows.iterator(), threshold or settings.SUGGESTION_SIMILARITY, min_size)
+
+
+def nominee_clusters(threshold=None, min_size=2):
+    """Группы похожих предложенных номинантов внутри каждой категории: [(категория, группы)]."""
+    threshold = threshold or settings.SUGGESTION_SIMILARITY
+    rows = (
+        SuggestedNominee.objects
+        .order_by('category_id', 'name_key', 'id')
+        .values_list('category_id', 'id', 'name', 'name_key')
+    )
+    names = dict(Category.objects.values_list('id', 'name'))
+    result = []
+    for category_id, group in groupby(rows.iterator(), key=lambda row: row[0]):
+        clusters = _clusters((row[1:] for row in group), threshold, min_size)
+        if clusters:
+            result.append(({'id': category_id, 'name': names.get(category_id)}, clusters))
+    return result
@@ -0,0 +1,211 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Category, CategoryTally, Nominee, NomineeTally, Vote
+from .ranked import ranked_results
+from .scoring import award_scoring, ranking_order, score_nominees
+
+
+# =========================
+# Подсчёт голосов одним агрегирующим запросом
+# =========================
+def nominee_counts():
+    """
+    Номинанты с голосами жюри и пользователей.
+    Один GROUP BY по номинантам вместо двух COUNT на каждого номинанта.
+    """
+    return (
+        Nominee.objects
+        .annotate(
+            jury_votes=Count('vote', filter=Q(vote__jury=True)),
+            user_votes=Count('vote', filter=Q(vote__jury=False)),
+        )
+        .order_by('category_id', 'id')
+    )
+
+
+def counted_nominees():
+    """
+    Номинанты с голосами из таблицы счётчиков — без сканирования Vote.
+    Номинант без строки счётчика считается номинантом без голосов.
+    """
+    for nominee in Nominee.objects.select_related('tally').order_by('category_id', 'id'):
+        tally = getattr(nominee, 'tally', None)
+        nominee.jury_votes = tally.jury_votes if tally else 0
+        nominee.user_votes = tally.user_votes if tally else 0
+        yield nominee
+
+
+def compute_results(scoring=None, from_counters=True):
+    """
+    Результаты по всем категориям: [{'category': ..., 'results': [...]}, ...].
+    Номинанты читаются одним запросом, счёт всех категорий считается разом в NumPy
+    (см. awards.scoring). scoring — веса и нормировка, по умолчанию из AwardConfig.
+    from_counters=False — пересчёт напрямую по таблице голосов.
+    Категории с ранжированием считаются по бюллетеням (IRV или Шульце, см. awards.ranked);
+    у них в cat_data есть ещё 'method' и 'rounds'.
+    """
+    scoring = scoring or award_scoring()
+    categories = list(Category.objects.all())
+    nominees = list(counted_nominees() if from_counters else nominee_counts())
+
+    category_ids = [n.category_id for n in nominees]
+    scores = score_nominees(
+        category_ids,
+        [n.jury_votes for n in nominees],
+        [n.user_votes for n in nominees],
+        scoring,
+    )
+
+    by_category = defaultdict(list)
+    for i in ranking_order(category_ids, scores):
+        nominee = nominees[i]
+        by_category[nominee.category_id].append({
+            'nominee': nominee,
+            'jury_votes': nominee.jury_votes,
+            'user_votes': nominee.user_votes,
+            'total_score': float(scores[i]),
+        })
+
+    nominees_by_category = defaultdict(list)
+    for nominee in nominees:
+        nominees_by_category[nominee.category_id].append(nominee)
+    ranked = ranked_results(categories, nominees_by_category, scoring)
+
+    results_data = []
+    for category in categories:
+        cat_data = ranked.get(category.id, {'results': by_category.get(category.id, [])})
+        category_results = cat_data['results']
+        for result in category_results:
+            # Категория уже загружена — не даём шаблону сходить за ней ещё раз
+            result['nominee'].category = category
+        results_data.append(dict(cat_data, category=category))
+
+    return results_data
+
+
+# =========================
+# Инкрементальное обновление счётчиков
+# =========================
+def tally_version():
+    """Последний номер изменения счётчиков (MAX по индексу)."""
+    return NomineeTally.objects.aggregate(last=Max('version'))['last'] or 0
+
+
+def _bump(nominee_id, category_id, jury, delta, version):
+    field = 'jury_votes' if jury else 'user_votes'
+    for model, lookup, extra in ((NomineeTally, {'nominee_id': nominee_id}, {'version': version}),
+                                 (CategoryTally, {'category_id': category_id}, {})):
+        updated = model.objects.filter(**lookup).update(**{field: F(field) + delta}, **extra)
+        if not updated and delta > 0:
+            # Строки ещё нет — создаём (гонку двух воркеров гасит ignore_conflicts)
+            row = dict(lookup, category_id=category_id) if model is NomineeTally else lookup
+            model.objects.bulk_create([model(**row)], ignore_conflicts=True)
+            model.objects.filter(**lookup).update(**{field: F(field) + delta}, **extra)
+
+
+def record_vote_changes(changes):
+    """
+    Переносит голоса в счётчиках. changes — пары (old, new), где old и new —
+    кортежи (nominee_id, category_id, jury) или None, если голоса до/после не было.
+    Изменения по одному номинанту схлопываются в одно UPDATE.
+    Вызывать внутри транзакции голосов, после записи в Vote: транзакция уже держит
+    блокировку записи SQLite, поэтому номера версий идут строго по порядку коммитов.
+    """
+    deltas = Counter()
+    for old, new in changes:
+        if old == new:
+            continue
+        if old is not None:
+            deltas[old] -= 1
+        if new is not None:
+            deltas[new] += 1
+    changed = {key: delta for key, delta in deltas.items() if delta}
+    if not changed:
+        return
+    version = tally_version() + 1
+    for (nominee_id, category_id, jury), delta in changed.items():
+        _bump(nominee_id, category_id, jury, delta, version)
+
+
+def record_vote_change(old, new):
+    record_vote_changes([(old, new)])
+
+
+@receiver(post_delete, sender=Vote)
+def forget_deleted_vote(sender, instance, **kwargs):
+    # Удаление голоса через админку тоже должно уменьшать счётчики
+    record_vote_change((instance.nominee_id, instance.category_id, instance.jury), None)
+
+
+# =========================
+# Пересборка и сверка счётчиков
+# =========================
+def expected_tallies():
+    """Счётчики, посчитанные заново по таблице Vote: {nominee_id: (category_id, jury, user)}."""
+    return {
+        row['id']: (row['category_id'], row['jury_votes'], row['user_votes'])
+        for row in nominee_counts().values('id', 'category_id', 'jury_votes', 'user_votes')
+    }
+
+
+def rebuild_tallies():
+    """Пересобирает счётчики с нуля по таблице Vote."""
+    expected = expected_tallies()
+    category_totals = {category_id: [0, 0] for category_id in Category.objects.values_list('id', flat=True)}
+    for category_id, jury_votes, user_votes in expected.values():
+        category_totals[category_id][0] += jury_votes
+        category_totals[category_id][1] += user_votes
+
+    with transaction.atomic():
+        # Сначала запись (берём блокировку), потом номер версии — как в record_vote_changes
+        CategoryTally.objects.all().delete()
+        # Все строки получают новую версию: ленты у клиентов пересинхронизируются целиком
+        version = tally_version() + 1
+        NomineeTally.objects.all().delete()
+        NomineeTally.objects.bulk_create([
+            NomineeTally(nominee_id=nominee_id, category_id=category_id,
+                         jury_votes=jury_votes, user_votes=user_votes, version=version)
+            for nominee_id, (category_id, jury_votes, user_votes) in expected.items()
+        ])
+        CategoryTally.objects.bulk_create([
+            CategoryTally(category_id=category_id, jury_votes=jury_votes, user_votes=user_votes)
+            for category_id, (jury_votes, user_votes) in category_totals.items()
+        ])
+    return len(expected), len(category_totals)
+
+
+def tally_drift():
+    """
+    Расхождения между счётчиками и таблицей Vote.
+    Список кортежей (вид, id, (жюри, пользователи) в счётчике, (жюри, пользователи) по голосам).
+    """
+    expected = expected_tallies()
+    drift = []
+
+    stored = {
+        row['nominee_id']: (row['jury_votes'], row['user_votes'])
+        for row in NomineeTally.objects.values('nominee_id', 'jury_votes', 'user_votes')
+    }
+    category_totals = defaultdict(lambda: (0, 0))
+    for nominee_id, (category_id, jury_votes, user_votes) in expected.items():
+        counted = stored.get(nominee_id, (0, 0))
+        if counted != (jury_votes, user_votes):
+            drift.append(('nominee', nominee_id, counted, (jury_votes, user_votes)))
+        total = category_totals[category_id]
+        category_totals[category_id] = (total[0] + jury_votes, total[1] + user_votes)
+
+    stored_categories = {
+        row['category_id']: (row['jury_votes'], row['user_votes'])
+        for row in CategoryTally.objects.values('category_id', 'jury_votes', 'user_votes')
+    }
+    for category_id in set(category_totals) | set(stored_categories):
+        counted = stored_categories.get(category_id, (0, 0))
+        if counted != category_totals[category_id]:
+            drift.append(('category', category_id, counted, category_totals[category_id]))
+
+    return drift
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+
+from awards.admin import EstimatedCountPaginator, VoteAdmin
+from awards.models import Category, Nominee, Vote
+from awards.tests.utils import AwardsTestCase
+
+
+# =========================
+# Оценка числа голосов в списке админки
+# =========================
+class EstimatedCountPaginatorTests(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        category = Category.objects.create(name="Мем года")
+        nominee = Nominee.objects.create(category=category, name="Первый")
+        self.votes = [
+            Vote.objects.create(user=User.objects.create_user(f'voter{i}'), category=category, nominee=nominee)
+            for i in range(6)
+        ]
+        # Удалённые с начала и из середины диапазона id
+        Vote.objects.filter(id__in=[self.votes[0].id, self.votes[2].id, self.votes[3].id]).delete()
+
+    def count(self, queryset=None):
+        return EstimatedCountPaginator(Vote.objects.order_by('-id') if queryset is None else queryset, 2).count
+
+    def test_small_range_counted_exactly(self):
+        self.assertEqual(self.count(), 3)
+
+    def test_large_range_estimated_from_id_bounds(self):
+        with mock.patch.object(EstimatedCountPaginator, 'EXACT_COUNT_LIMIT', 0), self.assertNumQueries(2):
+            estimate = self.count()
+
+        # Строка до первого id не учитывается; дыра посередине завышает оценку, но не занижает её
+        self.assertEqual(estimate, self.votes[-1].id - self.votes[1].id + 1)
+        self.assertEqual(estimate, 5)
+        self.assertGreaterEqual(estimate, Vote.objects.count())
+
+    def test_empty_table_and_filters(self):
+        self.assertEqual(self.count(Vote.objects.filter(jury=True).order_by('-id')), 0)
+        Vote.objects.all().delete()
+        self.assertEqual(self.count(), 0)
+
+    def test_trailing_empty_page_opens(self):
+        self.client.force_login(User.objects.create_superuser('admin', password='x'))
+
+        with mock.patch.object(EstimatedCountPaginator, 'EXACT_COUNT_LIMIT', 0), \
+                mock.patch.object(VoteAdmin, 'list_per_page', 2):
+            # Оценка 5 строк — три страницы, хотя настоящих строк хватает на две
+            response = self.client.get('/admin/awards/vote/', {'p': 3})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['cl'].result_list), [])
@@ -0,0 +1,81 @@
+from django.test import override_settings
+from django.urls import reverse
+
+from awards.models import AwardConfig, Category, FinalResult, Nominee
+from awards.tests.utils import AwardsTestCase
+
+
+# =========================
+# Публикация результатов
+# =========================
+class ResultsPublishedTests(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.config = AwardConfig.objects.create(current_stage='finished')
+        category = Category.objects.create(name="Мем года")
+        winner = Nominee.objects.create(category=category, name="Победитель")
+        FinalResult.objects.create(category=category, nominee=winner, user_votes=3, total_score=1.0)
+
+    def test_page_and_api_hidden_before_results_stage(self):
+        response = self.client.get(reverse('api_results'))
+        self.assertEqual(response.json(), {'published': False, 'categories': []})
+
+        response = self.client.get(reverse('results_public'))
+        self.assertNotContains(response, "Победитель")
+        self.assertContains(response, "Результаты пока не опубликованы.")
+
+    def test_page_and_api_shown_on_results_stage(self):
+        self.config.current_stage = 'results'
+        self.config.save()
+
+        data = self.client.get(reverse('api_results')).json()
+        self.assertTrue(data['published'])
+        self.assertEqual(data['categories'][0]['ranking'][0]['name'], "Победитель")
+
+        self.assertContains(self.client.get(reverse('results_public')), "Победитель")
+
+
+# =========================
+# Номинанты категории постранично
+# =========================
+@override_settings(API_PAGE_SIZE=2, API_MAX_PAGE_SIZE=3)
+class NomineePagesTests(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name="Мем года")
+        self.ids = [Nominee.objects.create(category=self.category, name=f"Номинант {i}").id for i in range(4)]
+        other = Category.objects.create(name="Пост года")
+        Nominee.objects.create(category=other, name="Чужой")
+        self.url = reverse('api_category_nominees', args=[self.category.id])
+
+    def page(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        return [row['id'] for row in data['nominees']], data['next']
+
+    def test_pages_cover_category_without_gaps_or_overlap(self):
+        first, after = self.page()
+        second, last = self.page(after=after)
+
+        self.assertEqual(first, self.ids[:2])
+        self.assertEqual(after, self.ids[1])
+        # Последняя страница ровно заполнена: next уже нет, хотя строк столько же, сколько limit
+        self.assertEqual(second, self.ids[2:])
+        self.assertIsNone(last)
+
+    def test_page_after_last_nominee_is_empty(self):
+        self.assertEqual(self.page(after=self.ids[-1]), ([], None))
+
+    def test_invalid_after_and_limit_fall_back(self):
+        self.assertEqual(self.page(after='abc', limit='x'), (self.ids[:2], self.ids[1]))
+        self.assertEqual(self.page(after=-5), (self.ids[:2], self.ids[1]))
+
+    def test_limit_clamped(self):
+        self.assertEqual(self.page(limit=0), (self.ids[:1], self.ids[0]))
+        self.assertEqual(self.page(limit=100), (self.ids[:3], self.ids[2]))
+
+    def test_unknown_category(self):
+        response = self.client.get(reverse('api_category_nominees', args=[self.category.id + 100]))
+
+        self.assertEqual(response.status_code, 404)
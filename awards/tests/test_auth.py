@@ -0,0 +1,84 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from awards.auth import IDENTITY_SESSION_KEY, ProfileModelBackend
+from awards.tests.utils import AwardsTestCase
+
+
+# =========================
+# Пользователь и профиль одним запросом
+# =========================
+class ProfileModelBackendTests(AwardsTestCase):
+    def test_user_and_profile_in_one_query(self):
+        user = User.objects.create_user('judge')
+
+        with self.assertNumQueries(1):
+            loaded = ProfileModelBackend().get_user(user.id)
+            self.assertFalse(loaded.userprofile.is_jury)
+
+    def test_inactive_user_not_loaded(self):
+        user = User.objects.create_user('judge', is_active=False)
+
+        self.assertIsNone(ProfileModelBackend().get_user(user.id))
+
+
+# =========================
+# Личность пользователя из сессии
+# =========================
+class IdentityTests(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('voter', first_name="Анна", password='x')
+        self.client.force_login(self.user)
+
+    def identity(self):
+        identity = self.client.get('/').context['identity']
+        # Ленивый объект: сравниваем то, что внутри
+        return tuple(identity) if identity else None
+
+    def test_cached_identity_needs_no_user_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.identity(), (self.user.id, 'voter', "Анна"))
+
+        self.assertFalse([q for q in queries.captured_queries if 'auth_user' in q['sql']])
+
+    def test_logout_clears_identity(self):
+        self.client.post('/auth/logout/')
+
+        self.assertIsNone(self.identity())
+
+    def test_switching_user_replaces_identity(self):
+        other = User.objects.create_user('judge', first_name="Борис")
+
+        self.client.force_login(other)
+
+        self.assertEqual(self.identity(), (other.id, 'judge', "Борис"))
+
+    def test_old_session_format_rebuilt(self):
+        session = self.client.session
+        session[IDENTITY_SESSION_KEY] = [self.user.id, 'voter', "Старое имя", False, False]
+        session.save()
+
+        self.assertEqual(self.identity(), (self.user.id, 'voter', "Анна"))
+
+    @override_settings(AUTH_IDENTITY_MAX_AGE=0)
+    def test_password_change_drops_identity_on_recheck(self):
+        self.user.set_password('changed')
+        self.user.save()
+
+        self.assertIsNone(self.identity())
+
+    @override_settings(AUTH_IDENTITY_MAX_AGE=0)
+    def test_deactivated_user_drops_identity_on_recheck(self):
+        User.objects.filter(id=self.user.id).update(is_active=False, first_name="Другое имя")
+
+        self.assertIsNone(self.identity())
+        self.assertNotIn(IDENTITY_SESSION_KEY, self.client.session)
+
+    @override_settings(AUTH_IDENTITY_MAX_AGE=0)
+    def test_renamed_user_refreshed_on_recheck(self):
+        User.objects.filter(id=self.user.id).update(first_name="Аня")
+
+        self.assertEqual(self.identity(), (self.user.id, 'voter', "Аня"))
@@ -0,0 +1,91 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from awards.models import AwardConfig, Category, Nominee, Vote
+from awards.tally import tally_drift
+from awards.tests.utils import AwardsTestCase
+from awards.voting import cast_vote, submit_ballot
+
+
+class BallotTestCase(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.config = AwardConfig.objects.create(current_stage='voting')
+        self.categories = [Category.objects.create(name=f"Категория {i}") for i in range(3)]
+        self.nominees = [
+            [Nominee.objects.create(category=category, name=f"{category.name}: {j}") for j in range(2)]
+            for category in self.categories
+        ]
+        self.ranked = Category.objects.create(name="Кафедра года", voting_mode='irv')
+        self.ranked_nominee = Nominee.objects.create(category=self.ranked, name="Кафедра")
+        self.user = User.objects.create_user('voter')
+
+    def votes(self):
+        return dict(Vote.objects.filter(user=self.user).values_list('category_id', 'nominee_id'))
+
+
+# =========================
+# Запись бюллетеня
+# =========================
+class SubmitBallotTests(BallotTestCase):
+    def test_writes_every_category(self):
+        first, second = self.nominees[0]
+        other = self.nominees[1][0]
+        cast_vote(self.user, first, False)
+
+        submit_ballot(self.user, {first.category_id: second.id, other.category_id: other.id}, False)
+
+        self.assertEqual(self.votes(), {first.category_id: second.id, other.category_id: other.id})
+        self.assertEqual(tally_drift(), [])
+
+
+# =========================
+# Страница бюллетеня
+# =========================
+class BallotViewTests(BallotTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def post(self, choices):
+        return self.client.post('/ballot/', {f'category_{category.id}': nominee.id for category, nominee in choices})
+
+    def test_form_excludes_ranked_categories(self):
+        response = self.client.get('/ballot/')
+
+        self.assertContains(response, f'name="category_{self.categories[0].id}"')
+        self.assertNotContains(response, f'name="category_{self.ranked.id}"')
+        self.assertContains(response, f'/vote/{self.ranked.id}/ranked/')
+
+    def test_nominees_validated_in_one_query(self):
+        choices = [(category, nominees[1]) for category, nominees in zip(self.categories, self.nominees)]
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.post(choices)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(self.votes()), 3)
+        nominee_queries = [q for q in captured.captured_queries if 'FROM "awards_nominee"' in q['sql']]
+        self.assertEqual(len(nominee_queries), 1)
+
+    def test_nominee_from_other_category_rejected(self):
+        response = self.post([(self.categories[0], self.nominees[0][0]), (self.categories[1], self.nominees[2][0])])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.votes(), {})
+
+    def test_ranked_category_rejected(self):
+        response = self.post([(self.categories[0], self.nominees[0][0]), (self.ranked, self.ranked_nominee)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.votes(), {})
+
+    def test_closed_outside_voting_stage(self):
+        self.config.current_stage = 'finished'
+        self.config.save()
+
+        response = self.post([(self.categories[0], self.nominees[0][0])])
+
+        self.assertContains(response, "Этап голосования закрыт.")
+        self.assertEqual(self.votes(), {})
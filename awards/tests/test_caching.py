@@ -0,0 +1,43 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from awards.models import AwardConfig, Category
+from awards.tests.utils import AwardsTestCase
+
+
+# =========================
+# Условные GET публичных страниц
+# =========================
+class ConditionalGetTests(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        AwardConfig.objects.create(current_stage='voting')
+        Category.objects.create(name="Мем года")
+        self.url = reverse('categories_list')
+
+    def test_matching_etag_returns_304_without_queries(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_content_change_invalidates_etag(self):
+        etag = self.client.get(self.url)['ETag']
+
+        Category.objects.create(name="Пост года")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertContains(response, "Пост года")
+
+    def test_logged_in_user_gets_no_etag(self):
+        self.client.force_login(User.objects.create_user('voter'))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
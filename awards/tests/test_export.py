@@ -0,0 +1,108 @@
+import csv
+import json
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models.query import QuerySet
+from django.test import override_settings
+
+from awards.export import VOTE_HEADER, vote_rows
+from awards.models import Category, Nominee, Vote
+from awards.tests.utils import AwardsTestCase
+
+
+class ExportTestCase(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name="Мем года")
+        self.nominee = Nominee.objects.create(category=self.category, name="Кот, «в шляпе»")
+        self.votes = []
+        for i in range(5):
+            user = User.objects.create_user(f'voter{i}')
+            self.votes.append(Vote.objects.create(user=user, category=self.category, nominee=self.nominee, jury=i == 0))
+
+    def export(self, fmt):
+        response = self.client.get(f'/export/votes.{fmt}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+
+# =========================
+# Строки выгрузки
+# =========================
+class VoteRowsTests(ExportTestCase):
+    def test_rows_in_id_order_with_one_query(self):
+        with self.assertNumQueries(1):
+            rows = list(vote_rows(chunk_size=2))
+
+        self.assertEqual([row[0] for row in rows], [vote.id for vote in self.votes])
+        first = self.votes[0]
+        self.assertEqual(rows[0], [
+            first.id, first.user_id, 'voter0', self.category.id, "Мем года",
+            self.nominee.id, "Кот, «в шляпе»", 1, first.created.isoformat(),
+        ])
+
+    @override_settings(EXPORT_CHUNK_SIZE=3)
+    def test_chunked_iterator_on_readonly_alias(self):
+        with mock.patch('awards.export.separate_readonly_database', return_value=True), \
+                mock.patch.object(QuerySet, 'iterator', autospec=True, return_value=iter([])) as iterator:
+            list(vote_rows())
+
+        queryset, = iterator.call_args.args
+        self.assertEqual(queryset.db, 'readonly')
+        self.assertEqual(iterator.call_args.kwargs, {'chunk_size': 3})
+
+    def test_default_database_when_alias_mirrors_it(self):
+        with mock.patch.object(QuerySet, 'iterator', autospec=True, return_value=iter([])) as iterator:
+            list(vote_rows())
+
+        self.assertEqual(iterator.call_args.args[0].db, 'default')
+
+
+# =========================
+# Форматы и доступ
+# =========================
+class ExportViewTests(ExportTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+
+    def test_csv(self):
+        response, body = self.export('csv')
+
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="votes.csv"')
+        rows = list(csv.reader(StringIO(body)))
+        self.assertEqual(rows[0], VOTE_HEADER)
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1][6], "Кот, «в шляпе»")
+        self.assertEqual([row[7] for row in rows[1:]], ['1', '0', '0', '0', '0'])
+
+    def test_ndjson(self):
+        response, body = self.export('ndjson')
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        lines = body.splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertIn("«в шляпе»", lines[0])
+        record = json.loads(lines[0])
+        self.assertEqual(list(record), VOTE_HEADER)
+        self.assertEqual((record['username'], record['jury']), ('voter0', 1))
+
+    def test_command_matches_view(self):
+        _, body = self.export('ndjson')
+        out = StringIO()
+
+        call_command('export_votes', '--format', 'ndjson', stdout=out)
+
+        self.assertEqual(out.getvalue(), body)
+
+    def test_staff_only(self):
+        self.client.logout()
+        self.assertEqual(self.client.get('/export/votes.csv').status_code, 302)
+
+        self.client.force_login(User.objects.create_user('voter'))
+        self.assertEqual(self.client.get('/export/votes.csv').status_code, 302)
@@ -0,0 +1,123 @@
+import csv
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from awards.jury import issue_tokens, purge_tokens
+from awards.models import JuryToken
+from awards.tests.utils import AwardsTestCase
+
+
+def parse_csv(text):
+    return list(csv.reader(StringIO(text)))
+
+
+# =========================
+# Выдача и срок жизни токенов
+# =========================
+@override_settings(JURY_TOKEN_TTL_HOURS=2)
+class IssueTokensTests(AwardsTestCase):
+    def test_batch_in_one_insert_with_default_ttl(self):
+        with self.assertNumQueries(1):
+            tokens = issue_tokens(3)
+
+        self.assertEqual(JuryToken.objects.count(), 3)
+        self.assertEqual(len({token_obj.token for token_obj in tokens}), 3)
+        for token_obj in JuryToken.objects.all():
+            self.assertAlmostEqual(token_obj.expires_at, timezone.now() + timedelta(hours=2),
+                                   delta=timedelta(minutes=1))
+
+    def test_hours_override_ttl(self):
+        token_obj, = issue_tokens(1, hours=48)
+
+        self.assertAlmostEqual(token_obj.expires_at, timezone.now() + timedelta(hours=48), delta=timedelta(minutes=1))
+
+    def test_single_token_uses_ttl(self):
+        token_obj = JuryToken.objects.create()
+
+        self.assertAlmostEqual(token_obj.expires_at, timezone.now() + timedelta(hours=2), delta=timedelta(minutes=1))
+
+    def test_expired_token_rejected_at_login(self):
+        token_obj = JuryToken.objects.create(expires_at=timezone.now() - timedelta(seconds=1))
+
+        response = self.client.get(f'/jury-login/{token_obj.token}/')
+
+        self.assertFalse(token_obj.is_valid())
+        self.assertEqual(response.status_code, 400)
+
+
+# =========================
+# Очистка токенов
+# =========================
+class PurgeTokensTests(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.expired = JuryToken.objects.create(expires_at=now - timedelta(hours=1))
+        self.used = JuryToken.objects.create(expires_at=now + timedelta(hours=1), used=True)
+        self.valid = JuryToken.objects.create(expires_at=now + timedelta(hours=1))
+
+    def remaining(self):
+        return set(JuryToken.objects.values_list('id', flat=True))
+
+    def test_expired_and_used_deleted(self):
+        self.assertEqual(purge_tokens(), 2)
+        self.assertEqual(self.remaining(), {self.valid.id})
+
+    def test_keep_used(self):
+        out = StringIO()
+
+        call_command('purge_jury_tokens', '--keep-used', stdout=out)
+
+        self.assertEqual(self.remaining(), {self.used.id, self.valid.id})
+        self.assertIn("Удалено токенов: 1", out.getvalue())
+
+
+# =========================
+# CSV со ссылками: страница админа и команда
+# =========================
+@override_settings(JURY_TOKEN_MAX_BATCH=10)
+class TokensCsvTests(AwardsTestCase):
+    url = '/generate-jury-tokens.csv'
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+
+    def test_streamed_csv(self):
+        response = self.client.post(self.url, {'count': 3, 'hours': 5})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="jury_tokens_3.csv"')
+        rows = parse_csv(b''.join(response.streaming_content).decode())
+        self.assertEqual(rows[0], ['token', 'link', 'expires_at'])
+        tokens = {str(token): token_obj for token, token_obj in JuryToken.objects.in_bulk(field_name='token').items()}
+        self.assertEqual(len(rows[1:]), 3)
+        for token, link, expires_at in rows[1:]:
+            self.assertEqual(link, f'http://testserver/jury-login/{token}/')
+            self.assertEqual(expires_at, tokens[token].expires_at.isoformat())
+
+    def test_invalid_count_and_hours(self):
+        for data in ({'count': 'x'}, {'count': 0}, {'count': 11}, {'count': 1, 'hours': -1}):
+            with self.subTest(data):
+                self.assertEqual(self.client.post(self.url, data).status_code, 400)
+        self.assertFalse(JuryToken.objects.exists())
+
+    def test_staff_only(self):
+        self.client.force_login(User.objects.create_user('voter'))
+
+        self.assertEqual(self.client.post(self.url, {'count': 1}).status_code, 302)
+        self.assertFalse(JuryToken.objects.exists())
+
+    def test_command_prints_links_for_site_url(self):
+        out = StringIO()
+
+        call_command('issue_jury_tokens', 2, '--base-url', 'https://example.org/', stdout=out, stderr=StringIO())
+
+        rows = parse_csv(out.getvalue())
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(all(link == f'https://example.org/jury-login/{token}/' for token, link, _ in rows[1:]))
@@ -0,0 +1,107 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+
+from awards.caching import get_content_version
+from awards.live import live_tally
+from awards.models import AwardConfig, Category, Nominee
+from awards.tally import tally_version
+from awards.tests.utils import AwardsTestCase
+from awards.voting import cast_vote
+
+
+# =========================
+# Живая лента счётчиков
+# =========================
+class LiveTallyTests(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.config = AwardConfig.objects.create(
+            current_stage='voting', jury_weight=0.3, user_weight=0.7, normalization='share',
+        )
+        self.category = Category.objects.create(name="Мем года")
+        self.first, self.second = (
+            Nominee.objects.create(category=self.category, name=name) for name in ("Первый", "Второй")
+        )
+        self.other_category = Category.objects.create(name="Пост года")
+        self.other = Nominee.objects.create(category=self.other_category, name="Третий")
+
+        self.jury = User.objects.create_user('judge')
+        cast_vote(self.jury, self.first, True)
+        for i, nominee in enumerate((self.first, self.second, self.second, self.second, self.other)):
+            cast_vote(User.objects.create_user(f'voter{i}'), nominee, False)
+
+    def test_full_snapshot_with_server_scores(self):
+        data = live_tally()
+
+        self.assertTrue(data['full'])
+        self.assertEqual(data['version'], tally_version())
+        self.assertEqual(data['categories'], [
+            [self.category.id, "Мем года", 1, 4],
+            [self.other_category.id, "Пост года", 0, 1],
+        ])
+        # share: 0.3 × доля жюри + 0.7 × доля пользователей в категории
+        self.assertEqual(data['nominees'], [
+            [self.first.id, self.category.id, "Первый", 1, 1, 0.475],
+            [self.second.id, self.category.id, "Второй", 0, 3, 0.525],
+            [self.other.id, self.other_category.id, "Третий", 0, 1, 0.7],
+        ])
+
+    def test_leader_mode_scores(self):
+        self.config.normalization = 'leader'
+        self.config.save()
+
+        scores = {row[0]: row[-1] for row in live_tally()['nominees']}
+
+        self.assertEqual(scores[self.first.id], round(0.3 + 0.7 / 3, 6))
+        self.assertEqual(scores[self.second.id], 0.7)
+
+    def test_changes_since_send_whole_changed_category(self):
+        since = live_tally()['version']
+
+        cast_vote(User.objects.create_user('late'), self.first, False)
+        data = live_tally(since)
+
+        self.assertFalse(data['full'])
+        self.assertEqual(data['version'], since + 1)
+        self.assertEqual(data['categories'], [[self.category.id, 1, 5]])
+        # Голос за первого меняет и счёт второго: доля считается от всей категории
+        self.assertEqual(data['nominees'], [
+            [self.first.id, self.category.id, 1, 2, 0.58],
+            [self.second.id, self.category.id, 0, 3, 0.42],
+        ])
+
+    def test_no_changes_is_one_query(self):
+        version = live_tally()['version']
+
+        with self.assertNumQueries(1):
+            data = live_tally(version)
+
+        self.assertEqual((data['full'], data['categories'], data['nominees']), (False, [], []))
+
+    def test_client_ahead_gets_full_snapshot(self):
+        self.assertTrue(live_tally(tally_version() + 10)['full'])
+
+    def test_cached_by_content_and_tally_version(self):
+        data = live_tally()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(live_tally(), data)
+
+        cache_key = f"awards:live:{get_content_version()}:{data['version']}:full"
+        self.assertEqual(caches['pages'].get(cache_key), data)
+
+        # Новый номинант меняет версию контента — снимок строится заново, уже с ним
+        Nominee.objects.create(category=self.other_category, name="Четвёртый")
+        names = [row[2] for row in live_tally()['nominees']]
+        self.assertIn("Четвёртый", names)
+
+
+class LiveTallyFeedTests(AwardsTestCase):
+    def test_staff_only_and_since_validated(self):
+        self.assertEqual(self.client.get('/live/tally.json').status_code, 302)
+
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        self.assertEqual(self.client.get('/live/tally.json', {'since': 'x'}).status_code, 400)
+
+        data = self.client.get('/live/tally.json').json()
+        self.assertEqual((data['full'], data['categories'], data['nominees']), (True, [], []))
@@ -0,0 +1,124 @@
+import os
+import re
+import sqlite3
+from contextlib import closing
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from awards import metrics
+from awards.models import Category
+from awards.tests.utils import AwardsTestCase
+
+
+@override_settings(METRICS_FLUSH_INTERVAL=3600)
+class MetricsTestCase(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        # Накопленное другими тестами не должно попасть в хранилище этого теста
+        metrics._pending.clear()
+        self.addCleanup(metrics._pending.clear)
+
+    def stored(self):
+        """Общие счётчики, прочитанные отдельным соединением — как их видит другой воркер."""
+        path = os.path.join(settings.LOCAL_STATE_DIR, 'metrics.sqlite3')
+        if not os.path.exists(path):
+            return {}
+        with closing(sqlite3.connect(path)) as conn:
+            return {(view, metric): value for view, metric, value in conn.execute(
+                "SELECT view, metric, value FROM request_metrics")}
+
+
+# =========================
+# Счётчик запросов и сброс в общее хранилище
+# =========================
+class QueryTimerTests(MetricsTestCase):
+    def test_counts_queries_and_time(self):
+        timer = metrics.QueryTimer()
+
+        with timer.wrap_connections():
+            Category.objects.count()
+            Category.objects.exists()
+
+        self.assertEqual(timer.queries, 2)
+        self.assertGreater(timer.seconds, 0)
+
+
+class FlushTests(MetricsTestCase):
+    def test_pending_metrics_added_to_shared_file(self):
+        metrics.record('index', 0.02, 3, 0.004, 100)
+        metrics.record('index', 0.2, 1, 0.001, 50)
+        # Интервал сброса не прошёл — в общем файле ещё ничего нет
+        self.assertEqual(self.stored(), {})
+
+        metrics.flush()
+        metrics.record('index', 0.02, 2, 0.001, 10)
+        metrics.flush()
+
+        stored = self.stored()
+        self.assertEqual(stored[('index', 'requests')], 3)
+        self.assertEqual(stored[('index', 'queries')], 6)
+        self.assertEqual(stored[('index', 'bytes')], 160)
+        self.assertEqual(stored[('index', 'le:0.025')], 2)
+        self.assertEqual(stored[('index', 'le:0.25')], 3)
+        self.assertEqual(metrics._pending, {})
+
+    @override_settings(METRICS_FLUSH_INTERVAL=0)
+    def test_record_flushes_when_interval_passed(self):
+        metrics.record('index', 0.01, 1, 0.001, 10)
+
+        self.assertEqual(self.stored()[('index', 'requests')], 1)
+
+
+# =========================
+# Формат Prometheus
+# =========================
+class RenderPrometheusTests(MetricsTestCase):
+    def test_counters_and_histogram(self):
+        data = {'index': {'requests': 2, 'queries': 5, 'db_seconds': 0.25, 'bytes': 300,
+                          'seconds': 0.5, 'le:0.005': 0, 'le:0.25': 1, 'le:0.5': 2}}
+
+        lines = metrics.render_prometheus(data).splitlines()
+
+        self.assertIn('# TYPE awards_requests_total counter', lines)
+        self.assertIn('awards_requests_total{view="index"} 2', lines)
+        self.assertIn('awards_db_queries_total{view="index"} 5', lines)
+        self.assertIn('awards_db_duration_seconds_total{view="index"} 0.25', lines)
+        self.assertIn('# TYPE awards_request_duration_seconds histogram', lines)
+        self.assertIn('awards_request_duration_seconds_bucket{view="index",le="0.005"} 0', lines)
+        self.assertIn('awards_request_duration_seconds_bucket{view="index",le="0.25"} 1', lines)
+        # Границы без наблюдений выводятся нулями, +Inf равен числу запросов
+        self.assertIn('awards_request_duration_seconds_bucket{view="index",le="0.1"} 0', lines)
+        self.assertIn('awards_request_duration_seconds_bucket{view="index",le="+Inf"} 2', lines)
+        self.assertIn('awards_request_duration_seconds_sum{view="index"} 0.5', lines)
+        self.assertIn('awards_request_duration_seconds_count{view="index"} 2', lines)
+
+
+# =========================
+# Middleware и страница метрик
+# =========================
+class RequestMetricsTests(MetricsTestCase):
+    def test_server_timing_header(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/')
+
+        match = re.fullmatch(r'db;dur=[\d.]+;desc="(\d+) queries", app;dur=[\d.]+', response['Server-Timing'])
+        self.assertIsNotNone(match)
+        self.assertEqual(int(match.group(1)), len(queries))
+
+    def test_endpoint_for_staff_only(self):
+        self.assertEqual(self.client.get('/metrics/').status_code, 302)
+
+        self.client.force_login(User.objects.create_user('voter'))
+        self.assertEqual(self.client.get('/metrics/').status_code, 302)
+
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        self.client.get('/')
+        response = self.client.get('/metrics/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn('awards_requests_total{view="index"} 1', response.content.decode().splitlines())
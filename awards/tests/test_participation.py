@@ -0,0 +1,75 @@
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import RequestFactory
+
+from awards.auth import identity_for
+from awards.models import Category, Nominee, RankedBallot, SuggestedNominee, Vote
+from awards.participation import PARTICIPATION_SESSION_KEY, get_participation, mark_suggested, mark_voted
+from awards.tests.utils import AwardsTestCase
+
+
+# =========================
+# Отметки участия в сессии
+# =========================
+class ParticipationTests(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('voter')
+        self.plain, self.ranked, self.suggested = (
+            Category.objects.create(name=name, voting_mode=mode)
+            for name, mode in (("Мем года", 'plurality'), ("Кафедра года", 'schulze'), ("Пост года", 'plurality'))
+        )
+        nominee = Nominee.objects.create(category=self.plain, name="Первый")
+        Vote.objects.create(user=self.user, category=self.plain, nominee=nominee)
+        RankedBallot.objects.create(user=self.user, category=self.ranked, ranking=[])
+        SuggestedNominee.objects.create(user=self.user, category=self.suggested, name="Новый")
+        self.request = self.make_request(self.user)
+
+    def make_request(self, user):
+        request = RequestFactory().get('/')
+        request.session = SessionStore()
+        request.identity = identity_for(user) if user else None
+        return request
+
+    def test_recompute_includes_ranked_ballots(self):
+        with self.assertNumQueries(2):
+            data = get_participation(self.request)
+
+        self.assertEqual(data, {
+            'user': self.user.id,
+            'voted': sorted([self.plain.id, self.ranked.id]),
+            'suggested': [self.suggested.id],
+        })
+
+    def test_cached_in_session(self):
+        get_participation(self.request)
+
+        with self.assertNumQueries(0):
+            data = get_participation(self.request)
+
+        self.assertEqual(self.request.session[PARTICIPATION_SESSION_KEY], data)
+
+    def test_marks_update_cached_data_only(self):
+        other = Category.objects.create(name="Фото года")
+        mark_voted(self.request, [other.id])
+        # До первого показа отмечать нечего: посчитается из базы
+        self.assertNotIn(PARTICIPATION_SESSION_KEY, self.request.session)
+
+        get_participation(self.request)
+        mark_voted(self.request, [other.id, self.plain.id])
+        mark_suggested(self.request, other.id)
+
+        data = get_participation(self.request)
+        self.assertEqual(data['voted'], sorted([self.plain.id, self.ranked.id, other.id]))
+        self.assertEqual(data['suggested'], sorted([self.suggested.id, other.id]))
+
+    def test_other_user_recomputed(self):
+        get_participation(self.request)
+        other = User.objects.create_user('judge')
+        request = self.make_request(other)
+        request.session = self.request.session
+
+        self.assertEqual(get_participation(request), {'user': other.id, 'voted': [], 'suggested': []})
+
+    def test_anonymous(self):
+        self.assertIsNone(get_participation(self.make_request(None)))
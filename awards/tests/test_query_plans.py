@@ -0,0 +1,31 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from awards.management.commands.check_query_plans import full_scans, hot_queries
+from awards.tests.utils import AwardsTestCase
+
+
+# =========================
+# Планы горячих запросов
+# =========================
+class QueryPlansTests(AwardsTestCase):
+    def test_hot_queries_use_indexes(self):
+        out = StringIO()
+
+        # CommandError, если хоть один запрос читает таблицу целиком
+        call_command('check_query_plans', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len([line for line in lines if line.startswith('ok')]), len(hot_queries()))
+        self.assertFalse([line for line in lines if 'FAIL' in line])
+
+    def test_full_scans_detected(self):
+        plan = [
+            'SCAN awards_vote',
+            'SCAN awards_vote USING COVERING INDEX vote_nominee_jury_idx',
+            'SEARCH awards_nominee USING INTEGER PRIMARY KEY (rowid=?)',
+            'SCAN CONSTANT ROW',
+        ]
+
+        self.assertEqual(full_scans(plan), ['SCAN awards_vote'])
@@ -0,0 +1,125 @@
+from django.contrib.auth.models import User
+
+from awards.models import Category, Nominee, RankedBallot
+from awards.ranked import encode_ballots, instant_runoff, pairwise_preferences, schulze
+from awards.tally import compute_results
+from awards.tests.utils import AwardsTestCase
+
+
+def election(profile, candidates):
+    """profile — пары (число бюллетеней, строка мест вида 'ACB'); кандидаты — буквы."""
+    ballots = [([candidates.index(c) for c in ranking], count) for count, ranking in profile]
+    matrix, weights = encode_ballots(ballots, list(range(len(candidates))))
+    return matrix, weights, len(candidates)
+
+
+def letters(order, candidates):
+    return ''.join(candidates[i] for i in order)
+
+
+# =========================
+# Кодирование бюллетеней
+# =========================
+class EncodeBallotsTests(AwardsTestCase):
+    def test_identical_ballots_share_a_bucket(self):
+        matrix, weights = encode_ballots([([10, 20], 1), ([10, 20], 2), ([20], 1)], [10, 20, 30])
+
+        self.assertEqual(matrix.tolist(), [[0, 1, -1], [1, -1, -1]])
+        self.assertEqual(weights.tolist(), [3, 1])
+
+    def test_unknown_and_repeated_nominees_are_dropped(self):
+        matrix, weights = encode_ballots([([99, 20, 20, 10], 1), ([99], 1)], [10, 20])
+
+        self.assertEqual(matrix.tolist(), [[1, 0]])
+        self.assertEqual(weights.tolist(), [1])
+
+
+# =========================
+# Мгновенный второй тур
+# =========================
+class InstantRunoffTests(AwardsTestCase):
+    def test_tennessee_capital(self):
+        # Мемфис лидирует по первым местам, но проигрывает: побеждает Ноксвилл
+        candidates = 'MNCK'
+        order, rounds = instant_runoff(*election([(42, 'MNCK'), (26, 'NCKM'), (15, 'CKNM'), (17, 'KCNM')], candidates))
+
+        self.assertEqual(letters(order, candidates), 'KMNC')
+        self.assertEqual([tally.tolist() for tally in rounds], [
+            [42, 26, 15, 17],
+            [42, 26, 0, 32],
+            [42, 0, 0, 58],
+        ])
+
+    def test_first_round_majority_stops(self):
+        order, rounds = instant_runoff(*election([(6, 'AB'), (3, 'BA'), (2, 'CB')], 'ABC'))
+
+        self.assertEqual(letters(order, 'ABC'), 'ABC')
+        self.assertEqual(len(rounds), 1)
+
+    def test_exhausted_ballots_leave_the_count(self):
+        # После выбывания C его бюллетени без второго места больше не учитываются
+        order, rounds = instant_runoff(*election([(4, 'A'), (3, 'B'), (2, 'C')], 'ABC'))
+
+        self.assertEqual(letters(order, 'ABC'), 'ABC')
+        self.assertEqual(rounds[-1].tolist(), [4, 3, 0])
+
+    def test_no_ballots(self):
+        order, rounds = instant_runoff(*election([], 'AB'))
+
+        self.assertEqual(order, [0, 1])
+        self.assertEqual(rounds, [])
+
+
+# =========================
+# Метод Шульце
+# =========================
+class SchulzeTests(AwardsTestCase):
+    # Классический пример с 45 избирателями и пятью кандидатами
+    PROFILE = [
+        (5, 'ACBED'), (5, 'ADECB'), (8, 'BEDAC'), (3, 'CABED'),
+        (7, 'CAEBD'), (2, 'CBADE'), (7, 'DCEBA'), (8, 'EBADC'),
+    ]
+
+    def test_pairwise_preferences(self):
+        d = pairwise_preferences(*election(self.PROFILE, 'ABCDE'))
+
+        self.assertEqual(d.tolist(), [
+            [0, 20, 26, 30, 22],
+            [25, 0, 16, 33, 18],
+            [19, 29, 0, 17, 24],
+            [15, 12, 28, 0, 14],
+            [23, 27, 21, 31, 0],
+        ])
+
+    def test_strongest_paths_and_winner(self):
+        order, p = schulze(*election(self.PROFILE, 'ABCDE'))
+
+        self.assertEqual(letters(order, 'ABCDE'), 'EACBD')
+        self.assertEqual(p[4].tolist(), [25, 28, 28, 31, 0])
+        self.assertEqual(p[0].tolist(), [0, 28, 28, 30, 24])
+
+    def test_unranked_nominees_are_below_ranked(self):
+        order, _ = schulze(*election([(3, 'B'), (2, 'CA')], 'ABC'))
+
+        self.assertEqual(letters(order, 'ABC'), 'BCA')
+
+
+# =========================
+# Подсчёт ранжированных категорий в compute_results
+# =========================
+class RankedResultsTests(AwardsTestCase):
+    def test_irv_category_in_results(self):
+        category = Category.objects.create(name="Кафедра года", voting_mode='irv')
+        m, n, c, k = (Nominee.objects.create(category=category, name=name) for name in 'MNCK')
+        for i, (count, ranking) in enumerate([(4, (m, n, c, k)), (3, (n, c, k, m)), (1, (c, k, n, m)), (2, (k, c, n, m))]):
+            for j in range(count):
+                user = User.objects.create_user(f'voter{i}_{j}')
+                RankedBallot.objects.create(user=user, category=category, ranking=[nominee.id for nominee in ranking])
+
+        cat_data = compute_results()[0]
+
+        self.assertEqual(cat_data['method'], category.get_voting_mode_display())
+        self.assertEqual([r['nominee'].name for r in cat_data['results']], ['N', 'M', 'K', 'C'])
+        self.assertEqual(cat_data['results'][0]['total_score'], 1)
+        self.assertEqual([r['user_votes'] for r in cat_data['results']], [3, 4, 2, 1])
+        self.assertEqual(len(cat_data['rounds']), 3)
@@ -0,0 +1,64 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from awards.models import Category, Nominee, Vote
+from awards.tests.utils import AwardsTestCase
+
+
+# =========================
+# Ограничение частоты POST-запросов
+# =========================
+@override_settings(RATE_LIMIT_ENABLED=True)
+class RateLimitTests(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name="Мем года")
+        self.nominee = Nominee.objects.create(category=self.category, name="Первый")
+        self.user = User.objects.create_user('voter')
+        self.client.force_login(self.user)
+        self.url = f'/vote/{self.category.id}/'
+
+    def vote(self, client=None):
+        return (client or self.client).post(self.url, {'nominee': self.nominee.id})
+
+    @override_settings(RATE_LIMITS={'vote': {'ip': (2, 60)}})
+    def test_ip_limit_returns_429_with_retry_after(self):
+        self.assertEqual([self.vote().status_code for _ in range(2)], [302, 302])
+
+        response = self.vote()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        # GET не ограничивается
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    @override_settings(RATE_LIMITS={'vote': {'ip': (100, 60), 'session': (1, 60)}})
+    def test_session_limit(self):
+        self.assertEqual(self.vote().status_code, 302)
+        self.assertEqual(self.vote().status_code, 429)
+
+        other = Client()
+        other.force_login(User.objects.create_user('neighbour'))
+        self.assertEqual(self.vote(other).status_code, 302)
+
+        # Лимит на сессию, а не на учётную запись: второй вход того же пользователя — новое ведро
+        second_device = Client()
+        second_device.force_login(self.user)
+        self.assertEqual(self.vote(second_device).status_code, 302)
+
+    @override_settings(RATE_LIMITS={'vote': {'ip': (1, 60), 'session': (1, 60)}})
+    def test_rejection_runs_no_queries(self):
+        self.vote()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.vote()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(queries.captured_queries, [])
+        self.assertEqual(Vote.objects.count(), 1)
+
+    @override_settings(RATE_LIMIT_ENABLED=False, RATE_LIMITS={'vote': {'ip': (1, 60)}})
+    def test_disabled(self):
+        self.assertEqual([self.vote().status_code for _ in range(3)], [302, 302, 302])
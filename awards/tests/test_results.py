@@ -0,0 +1,89 @@
+from unittest import mock
+
+from django.db import IntegrityError
+
+from awards.models import Category, FinalResult, Nominee, ResultRun
+from awards.results import compare_runs, save_results
+from awards.tests.utils import AwardsTestCase
+
+
+class ResultsTestCase(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name="Мем года")
+        self.first, self.second, self.third = (
+            Nominee.objects.create(category=self.category, name=name) for name in ("Первый", "Второй", "Третий")
+        )
+
+    def results(self, *rows):
+        """rows — (номинант, jury_votes, user_votes, total_score)"""
+        return [{
+            'category': self.category,
+            'results': [
+                {'nominee': nominee, 'jury_votes': jury, 'user_votes': user, 'total_score': score}
+                for nominee, jury, user, score in rows
+            ],
+        }]
+
+    def stored(self):
+        return dict(FinalResult.objects.values_list('nominee_id', 'total_score'))
+
+
+# =========================
+# Сохранение запусков подсчёта
+# =========================
+class SaveResultsTests(ResultsTestCase):
+    def test_runs_numbered_in_order(self):
+        runs = [save_results(self.results((self.first, 0, 1, 1.0))) for _ in range(3)]
+
+        self.assertEqual([run.number for run in runs], [1, 2, 3])
+        self.assertEqual(list(ResultRun.objects.values_list('number', flat=True)), [3, 2, 1])
+
+    def test_rows_updated_in_place_and_stale_rows_deleted(self):
+        save_results(self.results((self.first, 1, 2, 0.6), (self.second, 0, 1, 0.4), (self.third, 0, 0, 0.0)))
+        first_row = FinalResult.objects.get(nominee=self.first).id
+
+        run = save_results(self.results((self.first, 1, 3, 0.7), (self.second, 0, 1, 0.3)))
+
+        self.assertEqual(self.stored(), {self.first.id: 0.7, self.second.id: 0.3})
+        self.assertEqual(FinalResult.objects.get(nominee=self.first).id, first_row)
+        self.assertEqual(set(FinalResult.objects.values_list('run', flat=True)), {run.id})
+        self.assertEqual(run.snapshot, [
+            [self.category.id, self.first.id, 1, 3, 0.7],
+            [self.category.id, self.second.id, 0, 1, 0.3],
+        ])
+
+    def test_taken_number_retried(self):
+        run = ResultRun(number=1, jury_weight=0.3, user_weight=0.7)
+        with mock.patch('awards.results._save_run', side_effect=[IntegrityError, run]) as save_run:
+            self.assertIs(save_results(self.results()), run)
+
+        self.assertEqual(save_run.call_count, 2)
+
+    def test_gives_up_after_attempts(self):
+        with mock.patch('awards.results._save_run', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                save_results(self.results())
+
+
+# =========================
+# Сравнение запусков
+# =========================
+class CompareRunsTests(ResultsTestCase):
+    def test_only_changed_rows_reported(self):
+        old = save_results(self.results((self.first, 1, 2, 0.6), (self.second, 0, 1, 0.4), (self.third, 0, 0, 0.0)))
+        new = save_results(self.results((self.first, 1, 2, 0.6), (self.second, 1, 1, 0.2), (self.third, 0, 2, 0.3)))
+
+        self.assertEqual(compare_runs(old, new), [
+            {'category': self.category.id, 'nominee': self.second.id, 'old': (2, 0, 1, 0.4), 'new': (3, 1, 1, 0.2)},
+            {'category': self.category.id, 'nominee': self.third.id, 'old': (3, 0, 0, 0.0), 'new': (2, 0, 2, 0.3)},
+        ])
+
+    def test_added_and_removed_nominees(self):
+        old = save_results(self.results((self.first, 0, 1, 1.0)))
+        new = save_results(self.results((self.second, 0, 1, 1.0)))
+
+        self.assertEqual(compare_runs(old, new), [
+            {'category': self.category.id, 'nominee': self.first.id, 'old': (1, 0, 1, 1.0), 'new': None},
+            {'category': self.category.id, 'nominee': self.second.id, 'old': None, 'new': (1, 0, 1, 1.0)},
+        ])
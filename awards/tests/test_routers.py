@@ -0,0 +1,17 @@
+from django.urls import reverse
+
+from awards.models import AwardConfig, Category
+from awards.tests.utils import AwardsTestCase
+
+
+# =========================
+# Публичные страницы через соединение только для чтения
+# =========================
+class PublicPagesTests(AwardsTestCase):
+    def test_read_only_views_render_inside_test_transaction(self):
+        AwardConfig.objects.create(current_stage='results')
+        Category.objects.create(name="Мем года")
+
+        for name in ('index', 'categories_list', 'results_public', 'api_categories', 'api_results'):
+            with self.subTest(name):
+                self.assertEqual(self.client.get(reverse(name)).status_code, 200)
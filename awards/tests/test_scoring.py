@@ -0,0 +1,103 @@
+import random
+
+import numpy as np
+from django.contrib.auth.models import User
+
+from awards.models import AwardConfig, Category, Nominee
+from awards.scoring import Scoring, award_scoring, ranking_order, score_nominees
+from awards.tally import compute_results
+from awards.tests.utils import AwardsTestCase
+from awards.voting import cast_vote
+
+
+def baseline_scores(category_ids, jury_votes, user_votes, jury_weight=0.3, user_weight=0.7):
+    """Прежний подсчёт в цикле по категориям: доля голосов категории × вес."""
+    scores = []
+    for category_id, jury, user in zip(category_ids, jury_votes, user_votes):
+        total_jury = sum(j for c, j in zip(category_ids, jury_votes) if c == category_id)
+        total_user = sum(u for c, u in zip(category_ids, user_votes) if c == category_id)
+        score = 0.0
+        if total_jury > 0:
+            score += jury / total_jury * jury_weight
+        if total_user > 0:
+            score += user / total_user * user_weight
+        scores.append(score)
+    return scores
+
+
+# =========================
+# Формула счёта
+# =========================
+class ScoreNomineesTests(AwardsTestCase):
+    def test_share_matches_baseline_formula(self):
+        rnd = random.Random(7)
+        category_ids, jury_votes, user_votes = [], [], []
+        # Категории разного размера, в том числе без голосов жюри и совсем без голосов
+        for category_id, size in enumerate((1, 2, 5, 3, 4)):
+            for _ in range(size):
+                category_ids.append(category_id)
+                jury_votes.append(0 if category_id in (1, 3) else rnd.randint(0, 5))
+                user_votes.append(0 if category_id == 3 else rnd.randint(0, 50))
+
+        scores = score_nominees(category_ids, jury_votes, user_votes, Scoring(0.3, 0.7, 'share'))
+
+        np.testing.assert_allclose(scores, baseline_scores(category_ids, jury_votes, user_votes))
+
+    def test_leader_mode(self):
+        scores = score_nominees([1, 1, 1], [2, 1, 0], [4, 8, 2], Scoring(0.5, 0.5, 'leader'))
+
+        np.testing.assert_allclose(scores, [0.5 * 1 + 0.5 * 0.5, 0.5 * 0.5 + 0.5 * 1, 0.5 * 0 + 0.5 * 0.25])
+
+    def test_empty_category_scores_zero(self):
+        for mode in ('share', 'leader'):
+            with self.subTest(mode):
+                scores = score_nominees([1, 1, 2], [0, 0, 1], [0, 0, 1], Scoring(0.3, 0.7, mode))
+
+                np.testing.assert_allclose(scores, [0, 0, 1])
+                self.assertFalse(np.isnan(scores).any())
+
+    def test_no_nominees(self):
+        self.assertEqual(score_nominees([], [], [], Scoring(0.3, 0.7, 'share')).tolist(), [])
+
+    def test_ties_keep_row_order_within_category(self):
+        category_ids = [1, 1, 1, 2, 2]
+        scores = np.array([0.2, 0.4, 0.4, 0.5, 0.5])
+
+        self.assertEqual(ranking_order(category_ids, scores).tolist(), [1, 2, 0, 3, 4])
+
+
+# =========================
+# Веса из AwardConfig
+# =========================
+class AwardScoringTests(AwardsTestCase):
+    def test_defaults_without_config(self):
+        self.assertEqual(award_scoring(), Scoring(0.3, 0.7, 'share'))
+
+    def test_weights_from_config(self):
+        AwardConfig.objects.create(jury_weight=0.5, user_weight=0.5, normalization='leader')
+
+        self.assertEqual(award_scoring(), Scoring(0.5, 0.5, 'leader'))
+
+    def test_compute_results_uses_config(self):
+        config = AwardConfig.objects.create(jury_weight=1.0, user_weight=0.0)
+        category = Category.objects.create(name="Мем года")
+        Category.objects.create(name="Пустая")
+        jury_pick, crowd_pick = (Nominee.objects.create(category=category, name=name) for name in ("Жюри", "Народ"))
+        judge = User.objects.create_user('judge')
+        cast_vote(judge, jury_pick, True)
+        for i in range(3):
+            cast_vote(User.objects.create_user(f'voter{i}'), crowd_pick, False)
+
+        results = compute_results()
+        self.assertEqual([r['nominee'].name for r in results[0]['results']], ["Жюри", "Народ"])
+        self.assertEqual([r['total_score'] for r in results[0]['results']], [1.0, 0.0])
+        self.assertEqual(results[1]['results'], [])
+
+        config.jury_weight, config.user_weight = 0.3, 0.7
+        config.save()
+        results = compute_results()
+        self.assertEqual([r['nominee'].name for r in results[0]['results']], ["Народ", "Жюри"])
+        self.assertEqual(
+            [r['total_score'] for r in results[0]['results']],
+            [r['total_score'] for r in compute_results(from_counters=False)[0]['results']],
+        )
@@ -0,0 +1,36 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+
+from awards.models import Category, Vote
+from awards.tally import tally_drift
+from awards.tests.utils import AwardsTestCase
+
+
+# =========================
+# Синтетическая премия
+# =========================
+class SeedAwardTests(AwardsTestCase):
+    def seed(self, **options):
+        options = {'users': 20, 'jury': 2, 'categories': 3, 'nominees': 3, 'suggestions': 2, 'votes': 30, **options}
+        call_command('seed_award', stdout=StringIO(), **options)
+
+    def test_clear_and_reseed_keep_tallies_consistent(self):
+        self.seed()
+        self.assertEqual(tally_drift(), [])
+
+        self.seed(votes=10, clear=True, force=True)
+
+        self.assertEqual(Category.objects.count(), 3)
+        self.assertEqual(Vote.objects.count(), 10)
+        self.assertEqual(User.objects.filter(username__startswith='seed_').count(), 20)
+        self.assertEqual(tally_drift(), [])
+
+    def test_clear_refused_without_force_outside_debug(self):
+        self.seed()
+
+        with self.assertRaises(CommandError):
+            self.seed(clear=True)
+
+        self.assertEqual(Vote.objects.count(), 30)
@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+
+from awards.models import SuggestedCategory, normalize_name
+from awards.suggestions import category_clusters, cluster_keys
+from awards.tests.utils import AwardsTestCase
+
+
+def grouped(groups):
+    return sorted(sorted(group) for group in groups)
+
+
+# =========================
+# Ключи и кластеры предложений
+# =========================
+class NormalizeNameTests(AwardsTestCase):
+    def test_case_punctuation_word_order_and_yo(self):
+        self.assertEqual(normalize_name("Лучший мем года!"), "года лучший мем")
+        self.assertEqual(normalize_name("мем  года, ЛУЧШИЙ"), "года лучший мем")
+        self.assertEqual(normalize_name("Ёлка"), normalize_name("елка"))
+
+
+class ClusterKeysTests(AwardsTestCase):
+    def test_similar_keys_grouped(self):
+        keys = ["года лучший мем", "года лучший мем фото", "видео кафедра"]
+
+        self.assertEqual(grouped(cluster_keys(keys, 0.6)), [
+            ["видео кафедра"],
+            ["года лучший мем", "года лучший мем фото"],
+        ])
+
+    def test_clusters_do_not_chain(self):
+        # «b c d e» похож на «a b c d» (0.6), но не на лидера «a b c» (0.4)
+        keys = ["a b c", "a b c d", "b c d e"]
+
+        self.assertEqual(grouped(cluster_keys(keys, 0.6)), [["a b c", "a b c d"], ["b c d e"]])
+
+    def test_key_joins_most_similar_leader(self):
+        # «a b c d e f» проходит порог с обоими лидерами: 0.5 с «a b e f g h» и 0.67 с «a b c d»
+        keys = ["a b c d", "a b e f g h", "a b c d e f"]
+
+        self.assertEqual(grouped(cluster_keys(keys, 0.5)), [["a b c d", "a b c d e f"], ["a b e f g h"]])
+
+    def test_threshold_one_groups_only_equal_sets(self):
+        self.assertEqual(grouped(cluster_keys(["a b", "a b c"], 1.0)), [["a b"], ["a b c"]])
+
+
+class CategoryClustersTests(AwardsTestCase):
+    def test_duplicates_found_across_spelling(self):
+        user = User.objects.create_user('suggester')
+        for name in ("Лучший мем года", "мем года, лучший!", "Лучший мем года фото", "Видео кафедры"):
+            SuggestedCategory.objects.create(name=name, user=user)
+
+        clusters = category_clusters(threshold=0.6)
+
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual(clusters[0]['size'], 3)
+        self.assertEqual(clusters[0]['keys'], ["года лучший мем", "года лучший мем фото"])
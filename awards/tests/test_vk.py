@@ -0,0 +1,139 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth.models import User
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.test import RequestFactory, override_settings
+
+from awards import views, vk
+from awards.tests.utils import AwardsTestCase
+
+
+# =========================
+# Локальная замена VK: OAuth и API на одном http.server
+# =========================
+class FakeVKHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.server.requests.append((url.path, params))
+
+        if url.path == '/access_token':
+            status = self.server.exchange_status
+            if params.get('code') == 'good':
+                body = {'access_token': 'token-1', 'user_id': 42}
+            else:
+                body = {'error': 'invalid_grant', 'error_description': 'Code is invalid or expired.'}
+        elif url.path == '/method/users.get' and params.get('access_token') == 'token-1':
+            status = 200
+            body = {'response': [{'id': 42, 'first_name': 'Иван', 'last_name': 'Петров'}]}
+        else:
+            status = 200
+            body = {'error': {'error_msg': 'User authorization failed'}}
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class VKStandInTestCase(AwardsTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeVKHandler)
+        cls.server.requests = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.vk_settings = override_settings(
+            VK_OAUTH_URL=base, VK_API_URL=base, VK_CLIENT_ID='app', VK_APP_SECRET='secret',
+            VK_REDIRECT_URI='http://testserver/oauth/complete/vk-oauth2/', VK_RETRY_BACKOFF=0,
+        )
+        cls.vk_settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.vk_settings.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        # Сессия собирается из настроек — пересоздаём её под адрес замены
+        vk._session = None
+        self.addCleanup(setattr, vk, '_session', None)
+        self.server.requests.clear()
+        self.server.exchange_status = 200
+
+    def paths(self):
+        return [path for path, _ in self.server.requests]
+
+
+# =========================
+# Клиент VK
+# =========================
+class VKClientTests(VKStandInTestCase):
+    def test_exchange_and_users_get(self):
+        user = vk.fetch_user_by_code('good')
+
+        self.assertEqual(user['id'], 42)
+        self.assertEqual(self.paths(), ['/access_token', '/method/users.get'])
+        self.assertEqual(self.server.requests[0][1]['client_secret'], 'secret')
+        self.assertEqual(self.server.requests[1][1]['access_token'], 'token-1')
+
+    def test_rejected_code_raises_vk_error(self):
+        with self.assertRaises(vk.VKError):
+            vk.exchange_code('expired')
+
+    def test_exchange_is_not_retried_on_5xx(self):
+        self.server.exchange_status = 502
+
+        with self.assertRaises(Exception):
+            vk.exchange_code('good')
+        self.assertEqual(self.paths(), ['/access_token'])
+
+
+# =========================
+# Вход через VK: синхронное и асинхронное представления
+# =========================
+class VKLoginViewTests(VKStandInTestCase):
+    def post_code(self, code):
+        return self.client.post(
+            '/oauth/complete/vk-oauth2/', data=json.dumps({'code': code}), content_type='application/json',
+        )
+
+    def test_sync_view_logs_user_in(self):
+        response = self.post_code('good')
+
+        self.assertEqual(response.json(), {'success': True, 'redirect': '/'})
+        user = User.objects.get(username='vk_42')
+        self.assertEqual((user.first_name, user.last_name), ('Иван', 'Петров'))
+        self.assertEqual(int(self.client.session[SESSION_KEY]), user.id)
+
+    def test_sync_view_reports_rejected_code(self):
+        response = self.post_code('expired')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(User.objects.filter(username='vk_42').exists())
+
+    def test_async_view_logs_user_in(self):
+        request = RequestFactory().post(
+            '/oauth/complete/vk-oauth2/', data=json.dumps({'code': 'good'}), content_type='application/json',
+        )
+        SessionMiddleware(lambda request: None).process_request(request)
+
+        response = async_to_sync(views.vk_oauth_complete_async)(request)
+
+        self.assertEqual(json.loads(response.content), {'success': True, 'redirect': '/'})
+        self.assertEqual(int(request.session[SESSION_KEY]), User.objects.get(username='vk_42').id)
+        self.assertEqual(self.paths(), ['/access_token', '/method/users.get'])
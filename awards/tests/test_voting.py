@@ -0,0 +1,135 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import override_settings
+
+from awards.models import Category, CategoryTally, Nominee, NomineeTally, QueuedVote, Vote
+from awards.tally import tally_drift
+from awards.tests.utils import AwardsTestCase
+from awards.voting import cast_vote, flush_queued_votes, submit_vote
+
+
+class VotingTestCase(AwardsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name="Мем года")
+        self.first, self.second = (
+            Nominee.objects.create(category=self.category, name=name) for name in ("Первый", "Второй")
+        )
+        self.other_category = Category.objects.create(name="Пост года", is_main=False)
+        self.other = Nominee.objects.create(category=self.other_category, name="Третий")
+        self.user = User.objects.create_user('voter')
+        self.jury = User.objects.create_user('judge')
+        self.jury.userprofile.is_jury = True
+        self.jury.userprofile.save()
+
+    def counts(self, nominee):
+        tally = NomineeTally.objects.filter(nominee=nominee).first()
+        return (tally.jury_votes, tally.user_votes) if tally else (0, 0)
+
+
+# =========================
+# Голоса и счётчики
+# =========================
+class CastVoteTests(VotingTestCase):
+    def test_revote_moves_counters(self):
+        cast_vote(self.user, self.first, False)
+        cast_vote(self.user, self.second, False)
+
+        self.assertEqual(Vote.objects.get(user=self.user).nominee, self.second)
+        self.assertEqual(self.counts(self.first), (0, 0))
+        self.assertEqual(self.counts(self.second), (0, 1))
+        self.assertEqual(tally_drift(), [])
+
+    def test_jury_and_users_counted_separately(self):
+        cast_vote(self.user, self.first, False)
+        cast_vote(self.jury, self.first, True)
+
+        self.assertEqual(self.counts(self.first), (1, 1))
+        category_tally = CategoryTally.objects.get(category=self.category)
+        self.assertEqual((category_tally.jury_votes, category_tally.user_votes), (1, 1))
+        self.assertEqual(tally_drift(), [])
+
+    def test_vote_category_follows_nominee(self):
+        vote = Vote(user=self.user, category=self.category, nominee=self.other)
+        vote.save()
+
+        self.assertEqual(vote.category_id, self.other_category.id)
+
+
+# =========================
+# Голоса через админку
+# =========================
+class VoteAdminTests(VotingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser('admin', password='x'))
+
+    def test_admin_edit_and_delete_keep_counters(self):
+        cast_vote(self.user, self.first, False)
+        vote = Vote.objects.get(user=self.user)
+
+        self.client.post(f'/admin/awards/vote/{vote.id}/change/', {'user': self.user.id, 'nominee': self.second.id})
+        self.assertEqual(self.counts(self.second), (0, 1))
+        self.assertEqual(tally_drift(), [])
+
+        self.client.post(f'/admin/awards/vote/{vote.id}/delete/', {'post': 'yes'})
+        self.assertFalse(Vote.objects.exists())
+        self.assertEqual(tally_drift(), [])
+
+    def test_admin_rejects_second_vote_in_category(self):
+        cast_vote(self.user, self.first, False)
+
+        response = self.client.post('/admin/awards/vote/add/', {'user': self.user.id, 'nominee': self.second.id})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Vote.objects.count(), 1)
+
+
+# =========================
+# Очередь голосов
+# =========================
+@override_settings(VOTE_INGEST_MODE='queued', VOTE_QUEUE_MAX_DELAY=3600)
+class QueuedVoteTests(VotingTestCase):
+    def test_last_queued_vote_wins(self):
+        submit_vote(self.user, self.first, False)
+        submit_vote(self.user, self.second, False)
+        submit_vote(self.jury, self.first, True)
+        self.assertFalse(Vote.objects.exists())
+
+        self.assertEqual(flush_queued_votes(batch_size=2), 3)
+
+        self.assertEqual(Vote.objects.get(user=self.user).nominee, self.second)
+        self.assertEqual(Vote.objects.get(user=self.jury).nominee, self.first)
+        self.assertFalse(QueuedVote.objects.exists())
+        self.assertEqual(self.counts(self.second), (0, 1))
+        self.assertEqual(tally_drift(), [])
+
+    def test_count_applies_queued_votes(self):
+        submit_vote(self.user, self.first, False)
+        self.client.force_login(User.objects.create_superuser('admin', password='x'))
+
+        response = self.client.get('/count/')
+
+        self.assertFalse(QueuedVote.objects.exists())
+        first = next(r for r in response.context['results_data'][0]['results'] if r['nominee'] == self.first)
+        self.assertEqual(first['user_votes'], 1)
+
+    def test_flusher_loop_survives_database_errors(self):
+        class Stop(Exception):
+            pass
+
+        flush = mock.patch('awards.management.commands.flush_votes.flush_queued_votes',
+                           side_effect=[OperationalError("database is locked"), 2])
+        sleep = mock.patch('awards.management.commands.flush_votes.time.sleep', side_effect=[None, Stop])
+        out = StringIO()
+
+        with flush as flushed, sleep, self.assertLogs('awards.management.commands.flush_votes', 'WARNING'):
+            with self.assertRaises(Stop):
+                call_command('flush_votes', '--loop', stdout=out)
+
+        self.assertEqual(flushed.call_count, 2)
+        self.assertIn("Применено голосов из очереди: 2", out.getvalue())
@@ -0,0 +1,46 @@
+import os
+import tempfile
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from awards import localdb
+from awards.caching import invalidate_award_config
+
+
+# Кэши в памяти: файловый кэш из настроек переживает запуски и хранит чужую конфигурацию премии
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'awards-tests'},
+    'pages': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'awards-tests-pages'},
+}
+
+
+def _close_local_state():
+    for conn in getattr(localdb._local, 'connections', {}).values():
+        conn.close()
+    localdb._local.connections = {}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class AwardsTestCase(TestCase):
+    """
+    Тест с чистым служебным состоянием: пустые кэши, своя LOCAL_STATE_DIR
+    (ведра rate limit, метрики) и свой файл блокировки очереди голосов.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for cache in caches.all():
+            cache.clear()
+        invalidate_award_config()
+
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        state = override_settings(
+            LOCAL_STATE_DIR=state_dir.name,
+            VOTE_QUEUE_LOCK_FILE=os.path.join(state_dir.name, 'vote_queue.lock'),
+        )
+        state.enable()
+        self.addCleanup(state.disable)
+        _close_local_state()
+        self.addCleanup(_close_local_state)
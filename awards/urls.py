@@ -1,6 +1,7 @@
-from django.urls import path
+from django.conf import settings
+from django.urls import path, re_path
 from django.contrib import admin
-from awards import views
+from awards import api, views
 
 urlpatterns = [
     # Админка
@@ -11,7 +12,12 @@ urlpatterns = [
 
     # VK авторизация
     path('auth/login/', views.vk_login_page, name='login'),
-    path('oauth/complete/vk-oauth2/', views.vk_oauth_complete, name='vk_oauth_complete'),
+    path(
+        'oauth/complete/vk-oauth2/',
+        # Под ASGI (project/asgi.py) — асинхронный вариант
+        views.vk_oauth_complete_async if settings.VK_LOGIN_ASYNC else views.vk_oauth_complete,
+        name='vk_oauth_complete',
+    ),
     path('auth/logout/', views.vk_logout, name='logout'),
 
     # Ссылки на этапы премии
@@ -19,6 +25,8 @@ urlpatterns = [
     path('categories/', views.categories_list, name='categories_list'),
     path('suggest-nominee/<int:category_id>/', views.suggest_nominee, name='suggest_nominee'),
     path('vote/<int:category_id>/', views.vote, name='vote'),
+    path('vote/<int:category_id>/ranked/', views.rank_vote, name='rank_vote'),
+    path('ballot/', views.ballot, name='ballot'),
 
     # Страница завершения этапа
     path('stage-finished/', views.stage_finished, name='stage_finished'),
@@ -32,7 +40,21 @@ urlpatterns = [
     # Генерация одноразовой ссылки для жюри
     path('generate-jury-token/', views.generate_jury_token, name='generate_jury_token'),
     path('generate-jury-token-ajax/', views.generate_jury_token_ajax, name='generate_jury_token_ajax'),
+    path('generate-jury-tokens.csv', views.generate_jury_tokens_csv, name='generate_jury_tokens_csv'),
+    path('live/', views.live_dashboard, name='live_dashboard'),
+    path('live/tally.json', views.live_tally_feed, name='live_tally_feed'),
+    path('suggestion-clusters/', views.suggestion_clusters, name='suggestion_clusters'),
+    re_path(r'^export/votes\.(?P<fmt>csv|ndjson)$', views.export_votes, name='export_votes'),
 
     # Авторизация жюри по одноразовому токену
     path('jury-login/<uuid:token>/', views.jury_login, name='jury_login'),
+
+    # Метрики запросов для Prometheus (только админ)
+    path('metrics/', views.metrics, name='metrics'),
+
+    # JSON API только для чтения
+    path('api/award/', api.award, name='api_award'),
+    path('api/categories/', api.categories, name='api_categories'),
+    path('api/categories/<int:category_id>/nominees/', api.category_nominees, name='api_category_nominees'),
+    path('api/results/', api.results, name='api_results'),
 ]
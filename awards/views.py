@@ -3,44 +3,64 @@ import logging
 import uuid
 
 import requests
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, get_backends, logout
 from django.contrib.auth.models import User
-from django.http import JsonResponse, HttpResponseForbidden, HttpResponseBadRequest, HttpResponse
+from django.db.models import OuterRef, Prefetch, Subquery
+from django.http import JsonResponse, HttpResponseForbidden, HttpResponseBadRequest, HttpResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.views.decorators.http import require_GET, require_POST
 
 from .models import (
-    AwardConfig,
     SuggestedCategory,
     Category,
     SuggestedNominee,
     Nominee,
-    Vote,
     JuryToken,
     FinalResult,
-    UserProfile
+    RankedBallot,
+    ResultRun,
+    UserProfile,
+    Vote,
 )
+from . import auth, vk
+from .caching import conditional_page, get_award_config, get_current_stage, page_cache_context, results_published
+from .export import EXPORT_FORMATS, vote_rows
 from .forms import SuggestedCategoryForm, SuggestedNomineeForm
+from .jury import csv_rows, issue_tokens
+from .live import live_tally
+from .metrics import collected, render_prometheus
+from .participation import get_participation, mark_suggested, mark_voted
+from .ratelimit import rate_limit
+from .results import save_results
+from .scoring import award_scoring
+from .routers import read_only_view
+from .suggestions import category_clusters, nominee_clusters
+from .tally import compute_results
+from .voting import flush_queued_votes, submit_ballot, submit_ranked_ballot, submit_vote
 
 
 # =========================
 # Главная страница
 # =========================
+@conditional_page
+@read_only_view
 def index(request):
-    award_config = AwardConfig.objects.first()
-    current_stage = award_config.current_stage if award_config else None
+    award_config = get_award_config()
+    current_stage = get_current_stage()
 
-    # Основные категории
+    # Основные категории (запрос ленивый — при попадании в кэш страницы не выполняется)
     main_categories = Category.objects.filter(is_main=True)
 
     return render(request, "index.html", {
         "award_config": award_config,
         "current_stage": current_stage,
-        "main_categories": main_categories
+        "main_categories": main_categories,
+        **page_cache_context(),
     })
 
 
@@ -67,130 +87,139 @@ def vk_logout(request):
 logger = logging.getLogger(__name__)
 
 
+def _vk_exchange_page(request):
+    """GET-редирект с VK: страница для клиентского обмена кода"""
+    code = request.GET.get("code")
+    if code:
+        logger.info("VK Auth: GET redirect with code, showing client-side exchange page")
+        return render(request, "registration/vk_exchange.html", {
+            "code": code,
+            "csrf_token": request.META.get("CSRF_COOKIE", ""),
+            "VK_APP_ID": settings.VK_CLIENT_ID,
+        })
+    logger.info("VK Auth: GET request to oauth endpoint, redirecting to login")
+    return redirect("login")
+
+
+def _read_auth_code(request):
+    """Код авторизации и redirect_uri из JSON или формы"""
+    if request.content_type == 'application/json':
+        data = json.loads(request.body)
+    else:
+        data = request.POST
+    return data.get('code'), data.get('redirect_uri')
+
+
+def _login_vk_user(request, vk_user):
+    """Создаёт или обновляет пользователя по данным VK и логинит его"""
+    user_id = vk_user['id']
+    first_name = vk_user.get('first_name', '')
+    last_name = vk_user.get('last_name', '')
+
+    # Получаем или создаём пользователя
+    user, created = User.objects.get_or_create(
+        username=f"vk_{user_id}",
+        defaults={
+            "first_name": first_name,
+            "last_name": last_name,
+        }
+    )
+
+    # Обновляем имя, если оно изменилось
+    if not created and (user.first_name != first_name or user.last_name != last_name):
+        user.first_name = first_name
+        user.last_name = last_name
+        user.save()
+
+    # Если профиль отсутствует, создаём
+    if not hasattr(user, "userprofile"):
+        UserProfile.objects.create(user=user)
+
+    # Логиним пользователя
+    login(request, user, backend=auth.BACKEND_PATH)
+    logger.info(f"VK Auth: User {user.username} logged in successfully")
+
+    # Проверяем токен жюри
+    _check_jury_token(request, user)
+
+
+def _vk_error_response(e):
+    if isinstance(e, vk.VKError):
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
+    if isinstance(e, requests.RequestException):
+        logger.error(f"VK Auth: Request error: {str(e)}")
+        return JsonResponse({
+            "success": False,
+            "error": f"Ошибка при обращении к API VK: {str(e)}"
+        }, status=500)
+    logger.error(f"VK Auth: Unexpected error: {str(e)}")
+    return JsonResponse({
+        "success": False,
+        "error": f"Внутренняя ошибка сервера: {str(e)}"
+    }, status=500)
+
+
 @csrf_exempt
 def vk_oauth_complete(request):
     """Обработка редиректа с VK после OAuth"""
-    
+
     # Обработка GET запроса с кодом - показываем страницу для клиентского обмена
     if request.method == "GET":
-        code = request.GET.get("code")
-        if code:
-            logger.info("VK Auth: GET redirect with code, showing client-side exchange page")
-            return render(request, "registration/vk_exchange.html", {
-                "code": code,
-                "csrf_token": request.META.get("CSRF_COOKIE", ""),
-                "VK_APP_ID": settings.VK_CLIENT_ID,
-            })
-        else:
-            logger.info("VK Auth: GET request to oauth endpoint, redirecting to login")
-            return redirect("login")
-    
+        return _vk_exchange_page(request)
+
     # Обработка POST запроса с кодом авторизации
     if request.method != "POST":
         return JsonResponse({"success": False, "error": "Invalid request method"}, status=405)
-    
+
     try:
-        # Получаем данные из запроса
-        if request.content_type == 'application/json':
-            data = json.loads(request.body)
-        else:
-            data = request.POST
-            
-        code = data.get('code')
-        redirect_uri = data.get('redirect_uri')
-        
+        code, redirect_uri = _read_auth_code(request)
         if not code:
             return JsonResponse({"success": False, "error": "Отсутствует код авторизации"}, status=400)
-        
-        # Обмениваем код на access token
-        token_url = 'https://oauth.vk.com/access_token'
-        params = {
-            'client_id': settings.VK_CLIENT_ID,
-            'client_secret': settings.VK_APP_SECRET,
-            'redirect_uri': redirect_uri or settings.VK_REDIRECT_URI,
-            'code': code
-        }
-        
-        response = requests.get(token_url, params=params)
-        response.raise_for_status()
-        token_data = response.json()
-        
-        if 'error' in token_data:
-            logger.error(f"VK Auth: Error exchanging code: {token_data.get('error_description', 'Unknown error')}")
-            return JsonResponse({
-                "success": False,
-                "error": token_data.get('error_description', 'Ошибка при обмене кода авторизации')
-            }, status=400)
-        
-        # Получаем информацию о пользователе
-        user_info_url = 'https://api.vk.com/method/users.get'
-        params = {
-            'access_token': token_data['access_token'],
-            'fields': 'first_name,last_name',
-            'v': '5.131'
-        }
-        
-        user_response = requests.get(user_info_url, params=params)
-        user_response.raise_for_status()
-        user_data = user_response.json()
-        
-        if 'error' in user_data or 'response' not in user_data or not user_data['response']:
-            logger.error(f"VK Auth: Error getting user info: {user_data.get('error', {}).get('error_msg', 'Unknown error')}")
-            return JsonResponse({
-                "success": False,
-                "error": "Не удалось получить данные пользователя из VK"
-            }, status=400)
-        
-        vk_user = user_data['response'][0]
-        user_id = vk_user['id']
-        first_name = vk_user.get('first_name', '')
-        last_name = vk_user.get('last_name', '')
-        
-        # Получаем или создаём пользователя
-        user, created = User.objects.get_or_create(
-            username=f"vk_{user_id}",
-            defaults={
-                "first_name": first_name,
-                "last_name": last_name,
-            }
-        )
-        
-        # Обновляем имя, если оно изменилось
-        if not created and (user.first_name != first_name or user.last_name != last_name):
-            user.first_name = first_name
-            user.last_name = last_name
-            user.save()
-        
-        # Если профиль отсутствует, создаём
-        if not hasattr(user, "userprofile"):
-            UserProfile.objects.create(user=user)
-        
-        # Логиним пользователя
-        login(request, user, backend='django.contrib.auth.backends.ModelBackend')
-        logger.info(f"VK Auth: User {user.username} logged in successfully")
-        
-        # Проверяем токен жюри
-        self._check_jury_token(request, user)
-        
+
+        # Обмениваем код на access token и получаем информацию о пользователе
+        vk_user = vk.fetch_user_by_code(code, redirect_uri)
+        _login_vk_user(request, vk_user)
+
         return JsonResponse({
             "success": True,
             "redirect": "/"
         })
-        
-    except requests.RequestException as e:
-        logger.error(f"VK Auth: Request error: {str(e)}")
-        return JsonResponse({
-            "success": False,
-            "error": f"Ошибка при обращении к API VK: {str(e)}"
-        }, status=500)
+
     except Exception as e:
-        logger.error(f"VK Auth: Unexpected error: {str(e)}")
+        return _vk_error_response(e)
+
+
+@csrf_exempt
+async def vk_oauth_complete_async(request):
+    """
+    То же, что vk_oauth_complete, для ASGI: пока ждём ответа VK,
+    воркер обслуживает другие запросы.
+    """
+    if request.method == "GET":
+        return await sync_to_async(_vk_exchange_page)(request)
+
+    if request.method != "POST":
+        return JsonResponse({"success": False, "error": "Invalid request method"}, status=405)
+
+    try:
+        code, redirect_uri = _read_auth_code(request)
+        if not code:
+            return JsonResponse({"success": False, "error": "Отсутствует код авторизации"}, status=400)
+
+        # HTTP-запросы к VK — в отдельном потоке, не занимая поток работы с БД
+        vk_user = await sync_to_async(vk.fetch_user_by_code, thread_sensitive=False)(code, redirect_uri)
+        await sync_to_async(_login_vk_user)(request, vk_user)
+
         return JsonResponse({
-            "success": False,
-            "error": f"Внутренняя ошибка сервера: {str(e)}"
-        }, status=500)
+            "success": True,
+            "redirect": "/"
+        })
+
+    except Exception as e:
+        return _vk_error_response(e)
 
-def _check_jury_token(self, request, user):
+
+def _check_jury_token(request, user):
     """Проверка и обработка токена жюри"""
     jury_token_str = request.session.get('jury_token')
     if not jury_token_str:
@@ -251,16 +280,17 @@ def vkid_login(request):
     if not hasattr(user, "userprofile"):
         UserProfile.objects.create(user=user)
 
-    login(request, user, backend='django.contrib.auth.backends.ModelBackend')
+    login(request, user, backend=auth.BACKEND_PATH)
     return JsonResponse({"success": True})
 
 
 # =========================
 # Предложение номинаций
 # =========================
+@rate_limit('suggest_category')
 @login_required
 def suggest_category(request):
-    award_config = AwardConfig.objects.first()
+    award_config = get_award_config()
     if award_config and award_config.current_stage != 'suggest_cat':
         return render(request, "closed.html", {"message": "Этап предложения номинаций закрыт."})
 
@@ -288,26 +318,33 @@ def suggest_category(request):
 # =========================
 # Список категорий
 # =========================
+@conditional_page
+@read_only_view
 def categories_list(request):
-    award = AwardConfig.objects.first()
+    current_stage = get_current_stage()
 
+    # Запросы ленивые — при попадании в кэш страницы не выполняются
     main_categories = Category.objects.filter(is_main=True)
     extra_categories = Category.objects.filter(is_main=False)
 
     return render(request, "categories_list.html", {
         "main_categories": main_categories,
         "extra_categories": extra_categories,
-        "current_stage": award.current_stage if award else None,
+        "current_stage": current_stage,
+        # Отметки пользователя — вне кэшированного фрагмента, из сессии
+        "participation": get_participation(request),
+        **page_cache_context(),
     })
 
 
 # =========================
 # Предложение номинантов
 # =========================
+@rate_limit('suggest_nominee')
 @login_required
 def suggest_nominee(request, category_id):
     category = get_object_or_404(Category, id=category_id)
-    award_config = AwardConfig.objects.first()
+    award_config = get_award_config()
 
     if award_config and award_config.current_stage != 'suggest_nominee':
         return render(request, "closed.html", {"message": "Этап предложения номинантов закрыт."})
@@ -330,6 +367,7 @@ def suggest_nominee(request, category_id):
             nominee.category = category
             nominee.user = request.user
             nominee.save()
+            mark_suggested(request, category.id)
             return redirect('categories_list')
     else:
         form = SuggestedNomineeForm()
@@ -343,14 +381,17 @@ def suggest_nominee(request, category_id):
 # =========================
 # Голосование пользователей
 # =========================
+@rate_limit('vote')
 @login_required
 def vote(request, category_id):
-    # Создаём профиль, если его нет
+    # Профиль уже загружен вместе с пользователем (ProfileModelBackend); создаём, если его нет
     if not hasattr(request.user, 'userprofile'):
         UserProfile.objects.create(user=request.user)
 
     category = get_object_or_404(Category, id=category_id)
-    award_config = AwardConfig.objects.first()
+    if category.is_ranked:
+        return redirect('rank_vote', category_id=category.id)
+    award_config = get_award_config()
 
     # Проверка текущего этапа
     if award_config and award_config.current_stage != 'voting':
@@ -362,22 +403,10 @@ def vote(request, category_id):
     if request.method == 'POST':
         nominee_id = request.POST.get('nominee')
         if nominee_id:
-            nominee = get_object_or_404(Nominee, id=nominee_id)
-
-            # Проверяем, есть ли уже голос пользователя в этой категории
-            existing_vote = Vote.objects.filter(user=request.user, nominee__category=category).first()
-            if existing_vote:
-                # Обновляем существующий голос
-                existing_vote.nominee = nominee
-                existing_vote.jury = request.user.userprofile.is_jury
-                existing_vote.save()
-            else:
-                # Создаём новый голос
-                Vote.objects.create(
-                    user=request.user,
-                    nominee=nominee,
-                    jury=request.user.userprofile.is_jury
-                )
+            nominee = get_object_or_404(Nominee, id=nominee_id, category=category)
+
+            submit_vote(request.user, nominee, request.user.userprofile.is_jury)
+            mark_voted(request, [category.id])
 
         return redirect('categories_list')
 
@@ -385,77 +414,156 @@ def vote(request, category_id):
 
 
 # =========================
-# Подсчёт результатов — админ
+# Ранжированное голосование (категории IRV / Шульце)
 # =========================
-@staff_member_required
-def count(request):
-    award_config = AwardConfig.objects.first()
-    categories = Category.objects.all()
-    results_data = []
+@rate_limit('vote')
+@login_required
+def rank_vote(request, category_id):
+    if not hasattr(request.user, 'userprofile'):
+        UserProfile.objects.create(user=request.user)
+
+    category = get_object_or_404(Category, id=category_id)
+    if not category.is_ranked:
+        return redirect('vote', category_id=category.id)
+
+    # Та же проверка этапа, что и во vote: без AwardConfig голосование открыто
+    award_config = get_award_config()
+    if award_config and award_config.current_stage != 'voting':
+        return render(request, "closed.html", {"message": "Этап голосования закрыт."})
+
+    nominees = list(Nominee.objects.filter(category=category).order_by('id'))
+
+    if request.method == 'POST':
+        # Поля rank_<id номинанта> = место (1, 2, ...); пустые — номинант не ранжирован
+        places = {}
+        nominee_ids = {nominee.id for nominee in nominees}
+        for key, value in request.POST.items():
+            if key.startswith('rank_') and value:
+                try:
+                    nominee_id, place = int(key[len('rank_'):]), int(value)
+                except ValueError:
+                    return HttpResponseBadRequest("Некорректное место")
+                if nominee_id not in nominee_ids or place < 1:
+                    return HttpResponseBadRequest("Номинант не из этой категории")
+                places[nominee_id] = place
+
+        if len(set(places.values())) != len(places):
+            return HttpResponseBadRequest("Одно место указано у нескольких номинантов")
+
+        if places:
+            ranking = sorted(places, key=places.get)
+            submit_ranked_ballot(request.user, category, ranking, request.user.userprofile.is_jury)
+            mark_voted(request, [category.id])
+        return redirect('categories_list')
+
+    # Текущие места пользователя — для повторного голосования
+    ranking = (
+        RankedBallot.objects.filter(user=request.user, category=category)
+        .values_list('ranking', flat=True).first()
+    ) or []
+    current = {nominee_id: place for place, nominee_id in enumerate(ranking, start=1)}
+    for nominee in nominees:
+        nominee.place = current.get(nominee.id)
+
+    return render(request, "rank_vote.html", {"category": category, "nominees": nominees})
 
-    jury_weight = 0.3
-    user_weight = 0.7
 
+# =========================
+# Бюллетень: все категории на одной странице
+# =========================
+@rate_limit('ballot')
+@login_required
+def ballot(request):
+    if not hasattr(request.user, 'userprofile'):
+        UserProfile.objects.create(user=request.user)
+
+    # Та же проверка этапа, что и во vote: без AwardConfig голосование открыто
+    award_config = get_award_config()
+    if award_config and award_config.current_stage != 'voting':
+        return render(request, "closed.html", {"message": "Этап голосования закрыт."})
+
+    if request.method == 'POST':
+        # Поля category_<id> = <id номинанта>; пустые — категория пропущена
+        chosen = {}
+        for key, value in request.POST.items():
+            if key.startswith('category_') and value:
+                try:
+                    chosen[int(key[len('category_'):])] = int(value)
+                except ValueError:
+                    return HttpResponseBadRequest("Некорректный выбор")
+
+        # Номинант должен быть из своей категории — проверка одним запросом
+        categories_of = {
+            nominee_id: (category_id, voting_mode)
+            for nominee_id, category_id, voting_mode in Nominee.objects.filter(id__in=chosen.values())
+            .values_list('id', 'category_id', 'category__voting_mode')
+        }
+        if any(categories_of.get(nominee_id, (None,))[0] != category_id for category_id, nominee_id in chosen.items()):
+            return HttpResponseBadRequest("Номинант не из этой категории")
+        # Ранжированные категории голосуются на своей странице — форма бюллетеня их не отправляет
+        if any(categories_of[nominee_id][1] != 'plurality' for nominee_id in chosen.values()):
+            return HttpResponseBadRequest("В категории с ранжированием голосуют на странице ранжирования")
+
+        submit_ballot(request.user, chosen, request.user.userprofile.is_jury)
+        mark_voted(request, chosen)
+        return redirect('categories_list')
+
+    # Категории и номинанты — два запроса, текущий выбор пользователя — третий
+    categories = (
+        Category.objects
+        .order_by('-is_main', 'id')
+        .prefetch_related(Prefetch('nominee_set', queryset=Nominee.objects.order_by('id')))
+    )
+    current = dict(Vote.objects.filter(user=request.user).values_list('category_id', 'nominee_id'))
+    categories = list(categories)
     for category in categories:
-        nominees = Nominee.objects.filter(category=category)
-        category_results = []
-
-        # Calculate total votes in this category for normalization
-        total_jury_votes_in_category = Vote.objects.filter(
-            nominee__category=category, 
-            jury=True
-        ).count()
-        total_user_votes_in_category = Vote.objects.filter(
-            nominee__category=category, 
-            jury=False
-        ).count()
-
-        for nominee in nominees:
-            jury_votes = nominee.vote_set.filter(jury=True).count()
-            user_votes = nominee.vote_set.filter(jury=False).count()
-            
-            # Calculate weighted score:
-            # - Jury votes contribute 30% of total weight (distributed proportionally)
-            # - User votes contribute 70% of total weight (distributed proportionally)
-            jury_contribution = 0.0
-            user_contribution = 0.0
-            
-            if total_jury_votes_in_category > 0:
-                # This nominee's share of jury votes * 30% weight
-                jury_contribution = (jury_votes / total_jury_votes_in_category) * jury_weight
-            
-            if total_user_votes_in_category > 0:
-                # This nominee's share of user votes * 70% weight
-                user_contribution = (user_votes / total_user_votes_in_category) * user_weight
-            
-            total_score = jury_contribution + user_contribution
+        category.chosen_id = current.get(category.id)
+
+    return render(request, "ballot.html", {"categories": categories})
 
-            category_results.append({
-                'nominee': nominee,
-                'jury_votes': jury_votes,
-                'user_votes': user_votes,
-                'total_score': total_score,
-            })
 
-        category_results.sort(key=lambda x: x['total_score'], reverse=True)
-        results_data.append({'category': category, 'results': category_results})
+# =========================
+# Подсчёт результатов — админ
+# =========================
+@staff_member_required
+def count(request):
+    award_config = get_award_config()
+    # Веса и нормировка — из AwardConfig: поменять их можно в админке, без правки кода
+    scoring = award_scoring(award_config)
+    # Голоса, ещё ждущие в очереди (режим queued или остаток после смены режима),
+    # должны попасть в подсчёт — иначе сохранится неполный результат
+    flush_queued_votes(wait=True)
+    results_data = compute_results(scoring)
 
     if request.method == 'POST':
-        for cat_data in results_data:
-            category = cat_data['category']
-            for r in cat_data['results']:
-                FinalResult.objects.update_or_create(
-                    category=category,
-                    nominee=r['nominee'],
-                    defaults={
-                        'jury_votes': r['jury_votes'],
-                        'user_votes': r['user_votes'],
-                        'total_score': r['total_score'],
-                    }
-                )
+        save_results(results_data, user=request.user, scoring=scoring)
         return redirect('results_public')
 
-    return render(request, "count.html", {"results_data": results_data, "award_config": award_config})
+    return render(request, "count.html", {
+        "results_data": results_data,
+        "award_config": award_config,
+        "scoring": scoring,
+        "last_run": ResultRun.objects.select_related('created_by').first(),
+    })
+
+
+# =========================
+# Живая панель голосования — админ
+# =========================
+@staff_member_required
+def live_dashboard(request):
+    return render(request, "live.html", {"poll_interval": settings.LIVE_POLL_INTERVAL})
+
+
+@staff_member_required
+@require_GET
+@read_only_view
+def live_tally_feed(request):
+    try:
+        since = int(request.GET.get("since", 0))
+    except ValueError:
+        return HttpResponseBadRequest("since должен быть числом")
+    return JsonResponse(live_tally(since), json_dumps_params={"separators": (",", ":"), "ensure_ascii": False})
 
 
 # =========================
@@ -514,14 +622,24 @@ def stage_finished(request):
 # =========================
 # Публичные результаты
 # =========================
+@conditional_page
+@read_only_view
 def results_public(request):
+    # До этапа «Результаты» сохранённые подсчёты не показываем — то же правило, что и в API
     results_data = []
-    categories = Category.objects.all()
-    for category in categories:
-        winner = FinalResult.objects.filter(category=category).order_by('-total_score').first()
-        if winner:
-            results_data.append({'category': category, 'winner': winner.nominee})
-    return render(request, "results_public.html", {"results_data": results_data})
+    if results_published():
+        # Победитель каждой категории одним запросом (подзапрос вместо запроса на категорию)
+        winners = FinalResult.objects.filter(category=OuterRef('pk')).order_by('-total_score')
+        results_data = (
+            Category.objects
+            .annotate(winner_name=Subquery(winners.values('nominee__name')[:1]))
+            .filter(winner_name__isnull=False)
+        )
+    return render(request, "results_public.html", {
+        "results_data": results_data,
+        "current_stage": get_current_stage(),
+        **page_cache_context(),
+    })
 
 
 # =========================
@@ -533,7 +651,11 @@ def generate_jury_token(request):
     if request.method == "POST":
         token_obj = JuryToken.objects.create()
         link = request.build_absolute_uri(f"/jury-login/{token_obj.token}/")
-    return render(request, "generate_token.html", {"link": link})
+    return render(request, "generate_token.html", {
+        "link": link,
+        "max_batch": settings.JURY_TOKEN_MAX_BATCH,
+        "default_hours": settings.JURY_TOKEN_TTL_HOURS,
+    })
 
 
 @staff_member_required
@@ -544,3 +666,70 @@ def generate_jury_token_ajax(request):
         link = request.build_absolute_uri(f"/jury-login/{token_obj.token}/")
         return JsonResponse({"link": link})
     return JsonResponse({"error": "Invalid method"}, status=400)
+
+
+@staff_member_required
+@require_POST
+def generate_jury_tokens_csv(request):
+    """Пачка ссылок для жюри одним bulk_create; отдаётся потоковым CSV."""
+    try:
+        count = int(request.POST.get("count", ""))
+        hours = int(request.POST.get("hours") or settings.JURY_TOKEN_TTL_HOURS)
+    except ValueError:
+        return HttpResponseBadRequest("count и hours должны быть числами")
+    if not 0 < count <= settings.JURY_TOKEN_MAX_BATCH or hours <= 0:
+        return HttpResponseBadRequest(f"count: от 1 до {settings.JURY_TOKEN_MAX_BATCH}, hours > 0")
+
+    tokens = issue_tokens(count, hours)
+    logger.info(f"Jury tokens: {request.user.username} issued {count} tokens for {hours}h")
+
+    response = StreamingHttpResponse(
+        csv_rows(tokens, request.build_absolute_uri),
+        content_type="text/csv; charset=utf-8",
+    )
+    response["Content-Disposition"] = f'attachment; filename="jury_tokens_{count}.csv"'
+    return response
+
+
+# =========================
+# Похожие предложения — админ
+# =========================
+@staff_member_required
+@read_only_view
+def suggestion_clusters(request):
+    try:
+        threshold = float(request.GET.get("threshold") or settings.SUGGESTION_SIMILARITY)
+    except ValueError:
+        return HttpResponseBadRequest("threshold должен быть числом")
+    if not 0 < threshold <= 1:
+        return HttpResponseBadRequest("threshold: от 0 до 1")
+
+    return render(request, "suggestion_clusters.html", {
+        "threshold": threshold,
+        "category_clusters": category_clusters(threshold),
+        "nominee_clusters": nominee_clusters(threshold),
+    })
+
+
+# =========================
+# Выгрузка голосов для аудита — админ
+# =========================
+@staff_member_required
+@require_GET
+def export_votes(request, fmt):
+    content_type, render_lines = EXPORT_FORMATS[fmt]
+    logger.info(f"Export: {request.user.username} exported votes as {fmt}")
+    response = StreamingHttpResponse(render_lines(vote_rows()), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="votes.{fmt}"'
+    return response
+
+
+# =========================
+# Метрики запросов (Prometheus) — админ
+# =========================
+@staff_member_required
+def metrics(request):
+    return HttpResponse(
+        render_prometheus(collected()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,104 @@
+import logging
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+logger = logging.getLogger(__name__)
+
+VK_API_VERSION = '5.131'
+
+
+class VKError(Exception):
+    """VK ответил ошибкой в теле ответа (неверный код, отозванный токен и т.п.)."""
+
+
+# =========================
+# Общая сессия с keep-alive
+# =========================
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    retry = Retry(
+        total=settings.VK_MAX_RETRIES,
+        connect=settings.VK_MAX_RETRIES,
+        # Таймаут чтения не повторяем: код авторизации одноразовый,
+        # VK мог его уже принять
+        read=0,
+        status=settings.VK_MAX_RETRIES,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({'GET'}),
+        backoff_factor=settings.VK_RETRY_BACKOFF,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=2, pool_maxsize=settings.VK_POOL_SIZE)
+    # Обмен кода не повторяем вовсе: код одноразовый, и 5xx мог прийти уже после того,
+    # как VK его принял, — повтор дал бы невнятный invalid_grant вместо настоящей ошибки.
+    # requests выбирает адаптер по самому длинному префиксу URL
+    exchange_adapter = HTTPAdapter(max_retries=Retry(total=0, raise_on_status=False),
+                                   pool_connections=1, pool_maxsize=settings.VK_POOL_SIZE)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.mount(f"{settings.VK_OAUTH_URL}/access_token", exchange_adapter)
+    return session
+
+
+def get_session():
+    """Одна сессия на процесс: TCP/TLS-соединения с VK переиспользуются между запросами."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def _get(url, params):
+    response = get_session().get(
+        url,
+        params=params,
+        timeout=(settings.VK_CONNECT_TIMEOUT, settings.VK_READ_TIMEOUT),
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+# =========================
+# Методы VK
+# =========================
+def exchange_code(code, redirect_uri=None):
+    """Обменивает код авторизации на access token."""
+    token_data = _get(f"{settings.VK_OAUTH_URL}/access_token", {
+        'client_id': settings.VK_CLIENT_ID,
+        'client_secret': settings.VK_APP_SECRET,
+        'redirect_uri': redirect_uri or settings.VK_REDIRECT_URI,
+        'code': code,
+    })
+    if 'error' in token_data:
+        logger.error(f"VK Auth: Error exchanging code: {token_data.get('error_description', 'Unknown error')}")
+        raise VKError(token_data.get('error_description', 'Ошибка при обмене кода авторизации'))
+    return token_data
+
+
+def get_user(access_token):
+    """Имя и id пользователя VK по access token."""
+    user_data = _get(f"{settings.VK_API_URL}/method/users.get", {
+        'access_token': access_token,
+        'fields': 'first_name,last_name',
+        'v': VK_API_VERSION,
+    })
+    if 'error' in user_data or not user_data.get('response'):
+        logger.error(f"VK Auth: Error getting user info: {user_data.get('error', {}).get('error_msg', 'Unknown error')}")
+        raise VKError("Не удалось получить данные пользователя из VK")
+    return user_data['response'][0]
+
+
+def fetch_user_by_code(code, redirect_uri=None):
+    token_data = exchange_code(code, redirect_uri)
+    return get_user(token_data['access_token'])
@@ -0,0 +1,218 @@
+import fcntl
+import logging
+import os
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import QueuedVote, RankedBallot, Vote
+from .tally import record_vote_change, record_vote_changes
+
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# Прямая запись голоса
+# =========================
+def _upsert_votes(votes):
+    """
+    Один INSERT ... ON CONFLICT (user, category) DO UPDATE на всю пачку:
+    новый голос вставляется, существующий в категории — переписывается.
+    """
+    Vote.objects.bulk_create(
+        votes,
+        update_conflicts=True,
+        unique_fields=['user', 'category'],
+        update_fields=['nominee', 'jury'],
+    )
+
+
+def cast_vote(user, nominee, is_jury):
+    """Сохраняет голос пользователя в категории номинанта и обновляет счётчики."""
+    # Голос и счётчики меняются в одной транзакции
+    with transaction.atomic():
+        # Прежний голос нужен только счётчикам; поиск по уникальному индексу, без JOIN
+        previous = (
+            Vote.objects.filter(user=user, category_id=nominee.category_id)
+            .values_list('nominee_id', 'jury').first()
+        )
+        _upsert_votes([Vote(user=user, category_id=nominee.category_id, nominee=nominee, jury=is_jury)])
+        old = (previous[0], nominee.category_id, previous[1]) if previous else None
+        record_vote_change(old, (nominee.id, nominee.category_id, is_jury))
+
+
+def save_vote(vote):
+    """
+    Сохраняет новый или изменённый голос вне потока голосования (админка) и переносит
+    счётчики со старого номинанта на новый. Удаление голосов счётчики учитывают сами
+    (сигнал в awards.tally — он же ловит каскадные удаления пользователей и номинантов).
+    """
+    with transaction.atomic():
+        previous = None
+        if vote.pk is not None:
+            previous = Vote.objects.filter(pk=vote.pk).values_list('nominee_id', 'category_id', 'jury').first()
+        vote.save()
+        record_vote_change(previous, (vote.nominee_id, vote.category_id, vote.jury))
+
+
+def apply_votes(entries):
+    """
+    Применяет пачку голосов одной транзакцией.
+    entries — кортежи (user_id, category_id, nominee_id, jury), не более одного
+    на пару (пользователь, категория). Возвращает число изменённых голосов.
+    """
+    if not entries:
+        return 0
+
+    with transaction.atomic():
+        existing = {
+            (user_id, category_id): (nominee_id, jury)
+            for user_id, category_id, nominee_id, jury in Vote.objects.filter(
+                user_id__in={e[0] for e in entries},
+                category_id__in={e[1] for e in entries},
+            ).values_list('user_id', 'category_id', 'nominee_id', 'jury')
+        }
+
+        votes, changes = [], []
+        for user_id, category_id, nominee_id, jury in entries:
+            previous = existing.get((user_id, category_id))
+            if previous == (nominee_id, jury):
+                continue
+            votes.append(Vote(user_id=user_id, category_id=category_id, nominee_id=nominee_id, jury=jury))
+            old = (previous[0], category_id, previous[1]) if previous else None
+            changes.append((old, (nominee_id, category_id, jury)))
+
+        if votes:
+            _upsert_votes(votes)
+        record_vote_changes(changes)
+
+    return len(changes)
+
+
+# =========================
+# Отложенная запись через очередь
+# =========================
+def enqueue_vote(user, nominee, is_jury):
+    """Принимает голос в очередь: одна вставка без чтения и без пересчёта счётчиков."""
+    QueuedVote.objects.create(user=user, category_id=nominee.category_id, nominee=nominee, jury=is_jury)
+
+
+@contextmanager
+def _flush_lock(wait=False):
+    """
+    Межпроцессная блокировка сброса очереди: одновременно очередь разбирает
+    только один процесс, остальные сразу получают False (с wait=True — ждут своей очереди).
+    """
+    os.makedirs(os.path.dirname(settings.VOTE_QUEUE_LOCK_FILE), exist_ok=True)
+    with open(settings.VOTE_QUEUE_LOCK_FILE, 'w') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def flush_queued_votes(batch_size=None, wait=False):
+    """
+    Переносит голоса из очереди в Vote пачками; для каждой пары
+    (пользователь, категория) побеждает последний голос.
+    wait=True — дождаться блокировки, если очередь сейчас разбирает другой процесс:
+    после возврата в очереди нет голосов, принятых до вызова (нужно перед подсчётом).
+    Возвращает число разобранных записей очереди.
+    """
+    batch_size = batch_size or settings.VOTE_QUEUE_BATCH_SIZE
+    processed = 0
+
+    with _flush_lock(wait) as acquired:
+        if not acquired:
+            return 0
+
+        while True:
+            batch = list(
+                QueuedVote.objects.order_by('id')
+                .values_list('id', 'user_id', 'category_id', 'nominee_id', 'jury')[:batch_size]
+            )
+            if not batch:
+                break
+
+            # Записи идут по возрастанию id, поэтому более поздний голос перезаписывает ранний
+            latest = {}
+            for _, user_id, category_id, nominee_id, jury in batch:
+                latest[(user_id, category_id)] = (user_id, category_id, nominee_id, jury)
+
+            with transaction.atomic():
+                # Транзакция начинается с записи: SQLite сразу берёт блокировку писателя,
+                # и её не приходится повышать с чтения посреди транзакции.
+                # Очередь разбирает только владелец блокировки, так что пачка на месте.
+                QueuedVote.objects.filter(id__lte=batch[-1][0]).delete()
+                apply_votes(list(latest.values()))
+
+            processed += len(batch)
+            if len(batch) < batch_size:
+                break
+
+    if processed:
+        logger.info(f"Vote queue: applied {processed} queued votes")
+    return processed
+
+
+def flush_if_due():
+    """Сбрасывает очередь, если самый старый голос ждёт дольше VOTE_QUEUE_MAX_DELAY секунд."""
+    oldest = QueuedVote.objects.order_by('id').values_list('created', flat=True).first()
+    if oldest and oldest <= timezone.now() - timedelta(seconds=settings.VOTE_QUEUE_MAX_DELAY):
+        return flush_queued_votes()
+    return 0
+
+
+def submit_ballot(user, choices, is_jury):
+    """
+    Весь бюллетень разом. choices — {category_id: nominee_id}, уже проверенные:
+    номинант принадлежит своей категории, одна категория — один выбор.
+    В режиме direct — одна транзакция с одним upsert, в режиме queued — одна вставка в очередь.
+    Возвращает число принятых голосов.
+    """
+    if not choices:
+        return 0
+    if settings.VOTE_INGEST_MODE == 'queued':
+        QueuedVote.objects.bulk_create([
+            QueuedVote(user=user, category_id=category_id, nominee_id=nominee_id, jury=is_jury)
+            for category_id, nominee_id in choices.items()
+        ])
+        flush_if_due()
+    else:
+        apply_votes([
+            (user.id, category_id, nominee_id, is_jury)
+            for category_id, nominee_id in choices.items()
+        ])
+    return len(choices)
+
+
+def submit_vote(user, nominee, is_jury):
+    """Точка входа для представлений: режим записи выбирается настройкой VOTE_INGEST_MODE."""
+    if settings.VOTE_INGEST_MODE == 'queued':
+        enqueue_vote(user, nominee, is_jury)
+        flush_if_due()
+    else:
+        cast_vote(user, nominee, is_jury)
+
+
+def submit_ranked_ballot(user, category, ranking, is_jury):
+    """
+    Ранжированный бюллетень категории: один INSERT ... ON CONFLICT (user, category) DO UPDATE.
+    ranking — id номинантов категории от первого места, уже проверенные.
+    Счётчики не трогаются: такие категории считаются по бюллетеням (awards.ranked).
+    """
+    RankedBallot.objects.bulk_create(
+        [RankedBallot(user=user, category=category, ranking=ranking, jury=is_jury)],
+        update_conflicts=True,
+        unique_fields=['user', 'category'],
+        update_fields=['ranking', 'jury', 'created'],
+    )
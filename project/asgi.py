@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+# Под ASGI вход через VK обрабатывается асинхронно
+os.environ.setdefault('VK_LOGIN_ASYNC', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,78 @@
+"""
+Настройка SQLite для проекта.
+
+Профиль задаёт PRAGMA, которые выставляются на каждом новом соединении
+(через сигнал connection_created). Кроме основного соединения настраивается
+отдельное соединение только для чтения — на него роутер awards.routers.ReadOnlyRouter
+отправляет запросы публичных страниц.
+"""
+from django.db.backends.signals import connection_created
+
+
+READONLY_ALIAS = 'readonly'
+
+PROFILES = {
+    # Настройки SQLite по умолчанию — для разработки
+    'default': {
+        'pragmas': {},
+        'options': {},
+    },
+    # Продакшен: WAL (читатели не ждут писателя), ожидание блокировки вместо
+    # мгновенного "database is locked", кэш страниц и mmap побольше.
+    'production': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'busy_timeout': 5000,
+            'synchronous': 'NORMAL',
+            'cache_size': -32000,
+            'mmap_size': 256 * 1024 * 1024,
+            'temp_store': 'MEMORY',
+        },
+        # Транзакции сразу берут блокировку писателя — без взаимоблокировок
+        # при повышении блокировки с чтения до записи
+        'options': {'transaction_mode': 'IMMEDIATE'},
+    },
+}
+
+# Эти PRAGMA меняют файл базы и недоступны соединению только для чтения
+WRITE_ONLY_PRAGMAS = ('journal_mode', 'synchronous')
+
+
+def sqlite_databases(path, profile='default'):
+    """Словарь DATABASES с основным соединением и соединением только для чтения."""
+    config = PROFILES[profile]
+    pragmas = config['pragmas']
+    readonly_pragmas = {name: value for name, value in pragmas.items() if name not in WRITE_ONLY_PRAGMAS}
+
+    return {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': str(path),
+            'OPTIONS': dict(config['options']),
+            'PRAGMAS': pragmas,
+        },
+        READONLY_ALIAS: {
+            'ENGINE': 'django.db.backends.sqlite3',
+            # Django открывает SQLite с uri=True, так что mode=ro работает
+            'NAME': f'file:{path}?mode=ro',
+            'PRAGMAS': readonly_pragmas,
+            'TEST': {'MIRROR': 'default'},
+        },
+    }
+
+
+def apply_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = connection.settings_dict.get('PRAGMAS')
+    if pragmas:
+        with connection.cursor() as cursor:
+            apply_pragmas(cursor, pragmas)
+
+
+connection_created.connect(configure_sqlite, dispatch_uid='project.database.configure_sqlite')
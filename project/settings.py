@@ -14,6 +14,8 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 
+from project.database import READONLY_ALIAS, sqlite_databases
+
 # Загружаем переменные окружения из .env
 load_dotenv()
 
@@ -53,11 +55,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'awards.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'awards.auth.SessionIdentityMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -74,6 +78,7 @@ TEMPLATES = [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
+                'awards.auth.identity',
                 'django.contrib.messages.context_processors.messages',
                 'social_django.context_processors.backends',
                 'social_django.context_processors.login_redirect',
@@ -88,13 +93,105 @@ WSGI_APPLICATION = 'project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
+# Профиль SQLite: default — для разработки, production — WAL и PRAGMA для нагрузки
+# (см. project/database.py)
+DB_PROFILE = os.getenv("DB_PROFILE", "default")
+
+DATABASES = sqlite_databases(os.path.join(BASE_DIR / 'db', 'db.sqlite3'), DB_PROFILE)
+
+# Публичные страницы читают через отдельное соединение только для чтения
+READONLY_DATABASE = READONLY_ALIAS
+DATABASE_ROUTERS = ['awards.routers.ReadOnlyRouter']
+
+
+# Cache
+# Файловый кэш общий для всех воркеров gunicorn (каталог db монтируется как том)
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR / 'db', 'db.sqlite3'),
-    }
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR / 'db', 'cache'),
+    },
+    # Готовые фрагменты публичных страниц — в памяти процесса;
+    # ключ содержит версию контента из общего кэша, поэтому устаревшие фрагменты не отдаются
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'awards-pages',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
 }
 
+# Сколько секунд конфигурация премии живёт в памяти процесса и в общем кэше
+AWARD_CONFIG_LOCAL_TTL = int(os.getenv("AWARD_CONFIG_LOCAL_TTL", 5))
+AWARD_CONFIG_CACHE_TIMEOUT = int(os.getenv("AWARD_CONFIG_CACHE_TIMEOUT", 3600))
+AWARD_PAGE_CACHE_TIMEOUT = int(os.getenv("AWARD_PAGE_CACHE_TIMEOUT", 600))
+
+
+# Приём голосов
+# direct — голос пишется сразу; queued — голос ставится в очередь и применяется пачками
+# не позже чем через VOTE_QUEUE_MAX_DELAY секунд (см. команду flush_votes).
+# Очередь разбирает фоновый flush_votes --loop (в Dockerfile перезапускается при падении).
+# Без него голоса не теряются, но применяются только со следующим голосом после VOTE_QUEUE_MAX_DELAY
+# и перед подсчётом в /count/: до этого счётчики и живая лента отстают.
+
+VOTE_INGEST_MODE = os.getenv("VOTE_INGEST_MODE", "direct")
+VOTE_QUEUE_MAX_DELAY = float(os.getenv("VOTE_QUEUE_MAX_DELAY", 5))
+VOTE_QUEUE_BATCH_SIZE = int(os.getenv("VOTE_QUEUE_BATCH_SIZE", 500))
+VOTE_QUEUE_LOCK_FILE = os.path.join(BASE_DIR / 'db', 'vote_queue.lock')
+
+
+# JSON API: размер страницы номинантов по умолчанию и максимальный
+
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", 50))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", 200))
+
+
+# Токены жюри: срок жизни по умолчанию (часы), максимум ссылок за один запрос,
+# адрес сайта для ссылок, которые выпускает команда issue_jury_tokens
+
+JURY_TOKEN_TTL_HOURS = int(os.getenv("JURY_TOKEN_TTL_HOURS", 24))
+JURY_TOKEN_MAX_BATCH = int(os.getenv("JURY_TOKEN_MAX_BATCH", 1000))
+SITE_URL = os.getenv("SITE_URL", "https://herzenboardstars.lol")
+
+
+# Похожие предложения: минимальное сходство Жаккара по словам названия (0..1)
+
+SUGGESTION_SIMILARITY = float(os.getenv("SUGGESTION_SIMILARITY", 0.6))
+
+
+# Живая лента счётчиков: как часто панель опрашивает сервер и сколько держать ответ в кэше, секунды
+
+LIVE_POLL_INTERVAL = float(os.getenv("LIVE_POLL_INTERVAL", 3))
+LIVE_TALLY_CACHE_TIMEOUT = int(os.getenv("LIVE_TALLY_CACHE_TIMEOUT", 60))
+
+
+# Выгрузка голосов: сколько строк читать из курсора за раз
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+
+
+# Ограничение частоты POST-запросов: (жетонов, за секунд) по IP и по сессии (хэш её cookie,
+# без чтения сессии из базы). Лимит по сессии, а не по учётной записи: вход с другого устройства
+# даёт новое ведро, но все сессии с одного адреса всё равно упираются в лимит по IP.
+# Состояние — SQLite в LOCAL_STATE_DIR, общее для всех воркеров.
+# RATE_LIMIT_IP_HEADER — заголовок с адресом клиента за прокси (например HTTP_X_FORWARDED_FOR)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+RATE_LIMIT_IP_HEADER = os.getenv("RATE_LIMIT_IP_HEADER") or None
+RATE_LIMITS = {
+    'vote': {'ip': (120, 60), 'session': (30, 60)},
+    'ballot': {'ip': (30, 60), 'session': (5, 60)},
+    'suggest_category': {'ip': (30, 60), 'session': (5, 60)},
+    'suggest_nominee': {'ip': (60, 60), 'session': (10, 60)},
+}
+
+
+# Служебное состояние, общее для воркеров (метрики и т.п.): отдельные файлы SQLite
+
+LOCAL_STATE_DIR = os.path.join(BASE_DIR / 'db', 'state')
+# Как часто процесс сбрасывает накопленные метрики в общее хранилище, секунды
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 5))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -147,14 +244,30 @@ STATICFILES_DIRS = [
 ]
 
 AUTHENTICATION_BACKENDS = (
+    # ModelBackend + select_related('userprofile'): пользователь и профиль одним запросом
+    'awards.auth.ProfileModelBackend',
     'social_core.backends.vk.VKOAuth2',
-    'django.contrib.auth.backends.ModelBackend',
 )
 
 VK_CLIENT_ID = os.getenv("VK_APP_ID")
 VK_REDIRECT_URI = os.getenv("VK_REDIRECT_URI")
 VK_APP_SECRET = os.getenv("VK_APP_SECRET")
 
+# HTTP-клиент VK (awards/vk.py); адреса можно подменить локальным сервером-заглушкой
+VK_OAUTH_URL = os.getenv("VK_OAUTH_URL", "https://oauth.vk.com")
+VK_API_URL = os.getenv("VK_API_URL", "https://api.vk.com")
+VK_CONNECT_TIMEOUT = float(os.getenv("VK_CONNECT_TIMEOUT", 3))
+VK_READ_TIMEOUT = float(os.getenv("VK_READ_TIMEOUT", 5))
+VK_MAX_RETRIES = int(os.getenv("VK_MAX_RETRIES", 2))
+VK_RETRY_BACKOFF = float(os.getenv("VK_RETRY_BACKOFF", 0.3))
+VK_POOL_SIZE = int(os.getenv("VK_POOL_SIZE", 10))
+# Асинхронный обработчик входа; project/asgi.py включает его сам
+VK_LOGIN_ASYNC = os.getenv("VK_LOGIN_ASYNC") == "1"
+
+# Сколько секунд страницы доверяют имени пользователя из сессии, прежде чем перепроверить
+# пользователя в базе (смена пароля, отключение учётной записи)
+AUTH_IDENTITY_MAX_AGE = int(os.getenv("AUTH_IDENTITY_MAX_AGE", 300))
+
 LOGIN_URL = '/auth/login/'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'